@@ -0,0 +1,49 @@
+"""Helpers shared by the benchmark suites."""
+
+import json
+import os
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child_env(data_dir) -> dict:
+    """Environment for a measured interpreter: headless, with its own data."""
+    env = dict(os.environ)
+    env.update(
+        {
+            "QT_QPA_PLATFORM": "offscreen",
+            "HOME": data_dir,
+            "XDG_DATA_HOME": data_dir,
+            "LOCALAPPDATA": data_dir,
+        }
+    )
+    return env
+
+
+def git_revision() -> str:
+    """Short hash of the checked out commit, or "unknown" outside git."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def load_results(path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(path, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
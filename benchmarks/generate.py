@@ -0,0 +1,227 @@
+"""
+Generate synthetic collections for benchmarking.
+
+Usage:
+    python -m benchmarks.generate OUTPUT --cards N [--decks D]
+        [--reviews-per-card R] [--history-days DAYS] [--seed S] [--force]
+
+Writes a decks.db with the application's schema, filled with decks of
+uneven sizes, cards spread over the scheduling states and a review log:
+
+    deck sizes    Zipf-like: the first deck is the largest
+    states        30% new, 5% learning, 60% review, 5% relearning
+    review cards  log-normal intervals around 12 days, part of them overdue
+    review log    1 + Poisson(R - 1) reviews per seen card, rated
+                  10% Again, 15% Hard, 65% Good, 10% Easy
+
+The same arguments and seed always produce the same collection, relative to
+the time it is generated. Rows are inserted with plain sqlite3, so a million
+cards take seconds rather than the hours the ORM would.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import create_engine
+
+from database.models import Base
+
+# Bump when the generated distributions change, so cached collections are rebuilt
+GENERATOR_VERSION = 1
+
+# Probabilities of the states 0=New, 1=Learning, 2=Review, 3=Relearning
+STATE_WEIGHTS = (0.30, 0.05, 0.60, 0.05)
+
+# Probabilities of the ratings 0=Again, 1=Hard, 2=Good, 3=Easy
+RATING_WEIGHTS = (0.10, 0.15, 0.65, 0.10)
+
+# Rows per executemany batch
+BATCH_SIZE = 50_000
+
+DAY_US = 86_400 * 10**6
+
+
+def format_datetimes(values):
+    """Store microsecond timestamps the way SQLAlchemy writes SQLite DateTimes."""
+    text = np.datetime_as_string(values.astype("datetime64[us]"), unit="us")
+    return np.char.replace(text, "T", " ").tolist()
+
+
+def insert_rows(conn, sql, columns):
+    """Insert column lists as rows, in batches."""
+    rows = list(zip(*columns))
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.executemany(sql, rows[start : start + BATCH_SIZE])
+
+
+def generate_collection(
+    path, cards, decks=10, reviews_per_card=4.0, history_days=365, seed=0
+) -> dict:
+    """
+    Write a synthetic collection database.
+
+    Args:
+        path: Database file to create (must not exist)
+        cards: Number of cards
+        decks: Number of decks the cards are spread over
+        reviews_per_card: Mean number of reviews of every card that is not new
+        history_days: How far back cards were added
+        seed: Random seed
+
+    Returns:
+        Dictionary with the number of decks, cards and reviews written
+    """
+    rng = np.random.default_rng(seed)
+    now = np.datetime64(datetime.utcnow().replace(microsecond=0), "us").astype(np.int64)
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-262144")
+
+    deck_ids = np.arange(1, decks + 1)
+    deck_weights = 1.0 / deck_ids
+    insert_rows(
+        conn,
+        "INSERT INTO decks (id, name, created_at, request_retention, "
+        "maximum_interval, enable_fuzz, new_per_day, reviews_per_day) "
+        "VALUES (?, ?, ?, 0.9, 36500, 1, 20, 200)",
+        (
+            deck_ids.tolist(),
+            [f"Deck {i}" for i in deck_ids],
+            format_datetimes(np.full(decks, now - history_days * DAY_US)),
+        ),
+    )
+
+    card_ids = np.arange(1, cards + 1)
+    card_decks = rng.choice(deck_ids, size=cards, p=deck_weights / deck_weights.sum())
+    created = np.sort(
+        now - (rng.random(cards) * history_days * DAY_US).astype(np.int64)
+    )
+    state = rng.choice(4, size=cards, p=STATE_WEIGHTS)
+
+    new = state == 0
+    learning = (state == 1) | (state == 3)
+    review = state == 2
+
+    scheduled = np.zeros(cards, dtype=np.int64)
+    elapsed = np.zeros(cards, dtype=np.int64)
+    scheduled[review] = np.clip(rng.lognormal(2.5, 1.2, review.sum()), 1, 36500).astype(
+        np.int64
+    )
+    # Reviewed up to 30% past the interval, so some cards are overdue
+    elapsed[review] = (rng.random(review.sum()) * 1.3 * scheduled[review]).astype(
+        np.int64
+    )
+    elapsed = np.minimum(elapsed, ((now - created) // DAY_US))
+
+    due = created.copy()
+    due[review] = now + (scheduled[review] - elapsed[review]) * DAY_US
+    # Learning steps are minutes to hours away, or just missed
+    due[learning] = now + rng.integers(-DAY_US, DAY_US // 2, learning.sum())
+
+    stability = np.zeros(cards)
+    difficulty = np.zeros(cards)
+    stability[~new] = np.maximum(scheduled[~new], 0.1) * rng.uniform(
+        0.8, 1.2, (~new).sum()
+    )
+    difficulty[~new] = rng.uniform(1.0, 10.0, (~new).sum())
+
+    insert_rows(
+        conn,
+        "INSERT INTO cards (id, deck_id, created_at, due, path, fs_dev, fs_inode, "
+        "is_external, stability, difficulty, elapsed_days, scheduled_days, state, "
+        "anki_difficulty) VALUES (?, ?, ?, ?, ?, '0', ?, 0, ?, ?, ?, ?, ?, 2.5)",
+        (
+            card_ids.tolist(),
+            card_decks.tolist(),
+            format_datetimes(created),
+            format_datetimes(due),
+            [f"synthetic/card-{i}.md" for i in card_ids],
+            card_ids.astype(str).tolist(),
+            stability.tolist(),
+            difficulty.tolist(),
+            elapsed.tolist(),
+            scheduled.tolist(),
+            state.tolist(),
+        ),
+    )
+
+    # Review log: seen cards only, reviewed between being added and the last review
+    seen = np.flatnonzero(~new)
+    counts = 1 + rng.poisson(max(reviews_per_card - 1, 0), seen.size)
+    review_cards = np.repeat(seen, counts)
+    last_review = now - elapsed[review_cards] * DAY_US
+    first = created[review_cards]
+    reviewed_at = first + (
+        rng.random(review_cards.size) * (last_review - first)
+    ).astype(np.int64)
+    insert_rows(
+        conn,
+        "INSERT INTO reviews (card_id, reviewed_at, rating, response_ms, algorithm) "
+        "VALUES (?, ?, ?, ?, 'fsrs')",
+        (
+            card_ids[review_cards].tolist(),
+            format_datetimes(reviewed_at),
+            rng.choice(4, size=review_cards.size, p=RATING_WEIGHTS).tolist(),
+            rng.integers(1_000, 30_000, review_cards.size).tolist(),
+        ),
+    )
+
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    return {"decks": decks, "cards": cards, "reviews": int(review_cards.size)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.generate",
+        description="Generate a synthetic collection database.",
+    )
+    parser.add_argument("output", help="Database file to write")
+    parser.add_argument("--cards", type=int, required=True)
+    parser.add_argument("--decks", type=int, default=10)
+    parser.add_argument("--reviews-per-card", type=float, default=4.0)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--force", action="store_true", help="Overwrite an existing file"
+    )
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.output):
+        if not args.force:
+            print(f"{args.output} already exists, use --force to overwrite")
+            return 1
+        os.remove(args.output)
+
+    started = time.perf_counter()
+    summary = generate_collection(
+        args.output,
+        args.cards,
+        decks=args.decks,
+        reviews_per_card=args.reviews_per_card,
+        history_days=args.history_days,
+        seed=args.seed,
+    )
+    print(
+        f"Wrote {summary['decks']} decks, {summary['cards']} cards and "
+        f"{summary['reviews']} reviews to {args.output} "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""
+Services-layer benchmarks on synthetic collections.
+
+Usage:
+    python -m benchmarks.services run [--sizes 1000,100000,1000000]
+        [--repeat N] [--label NAME] [--history FILE] [--output FILE]
+    python -m benchmarks.services report [--history FILE] [--last N]
+        [--markdown]
+
+For every size a collection is generated with benchmarks.generate (cached
+between runs in the temp directory), copied into a throwaway data directory
+and measured in a fresh interpreter:
+
+    db.init                  opening and upgrading the database
+    get_all_deck_stats       counts of every deck
+    get_cards_due_today      due cards of the largest deck
+    get_new_cards            new cards of the largest deck
+    get_new_cards.limit      the same, limited to a day's 20 new cards
+    create_card              adding one card from a file
+    get_card_from_deck.cold  first card of the largest deck, loading its queue
+    get_card_from_deck       next card once the queue is loaded
+    card.reps                Card.reps of one reviewed card
+    card.lapses              Card.lapses of one reviewed card
+
+Each timing is the median over the repeats, in seconds. `run` appends the
+results to a JSON Lines history; `report` prints every metric across the
+last runs in the history, so releases can be compared with each other.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .common import ROOT, child_env, git_revision, save_results
+from .generate import GENERATOR_VERSION, generate_collection
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+DEFAULT_HISTORY = os.path.join("benchmarks", "history", "services.jsonl")
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "quint-benchmarks")
+
+DECKS = 10
+SEED = 0
+
+# Reviewed cards sampled for the reps and lapses properties
+PROPERTY_SAMPLE = 200
+
+RESULTS_VERSION = 1
+
+
+def cached_collection(cards) -> str:
+    """Path of a generated collection with the given size, generated if missing."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(
+        CACHE_DIR, f"collection-v{GENERATOR_VERSION}-{cards}-{DECKS}-{SEED}.db"
+    )
+    if not os.path.exists(path):
+        print(f"Generating a collection of {cards} cards...")
+        tmp_path = path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        generate_collection(tmp_path, cards, decks=DECKS, seed=SEED)
+        os.replace(tmp_path, path)
+    return path
+
+
+def measure(source, repeat) -> dict:
+    """
+    Time the services against a copy of a collection.
+
+    Must run in a fresh interpreter whose data directory is disposable: the
+    collection is copied over its database before anything opens it.
+    """
+    from database.database import DB_DIR, DB_PATH
+
+    os.makedirs(DB_DIR, exist_ok=True)
+    shutil.copyfile(source, DB_PATH)
+
+    from sqlalchemy import func
+
+    from database import services
+    from database.database import db
+    from database.due_queue import due_queue
+    from database.models import Card
+    from flows.chat import get_card_from_deck
+
+    timings = {}
+
+    def timed(name, function, times=repeat):
+        samples = []
+        for _ in range(times):
+            db.session.expire_all()
+            started = time.perf_counter()
+            function()
+            samples.append(time.perf_counter() - started)
+        timings[name] = statistics.median(samples)
+
+    db.session
+    timings["db.init"] = db.init_seconds
+
+    deck_id = (
+        db.session.query(Card.deck_id)
+        .group_by(Card.deck_id)
+        .order_by(func.count(Card.id).desc())
+        .limit(1)
+        .scalar()
+    )
+
+    timed("get_all_deck_stats", services.get_all_deck_stats)
+    timed("get_cards_due_today", lambda: services.get_cards_due_today(deck_id))
+    timed("get_new_cards", lambda: services.get_new_cards(deck_id))
+    timed("get_new_cards.limit", lambda: services.get_new_cards(deck_id, limit=20))
+
+    source_file = os.path.join(DB_DIR, "benchmark-card.md")
+    with open(source_file, "w", encoding="utf-8") as f:
+        f.write("# Benchmark card\n\nSynthetic content.\n")
+    timed("create_card", lambda: services.create_card(source_file, deck_id))
+
+    def cold_next_card():
+        due_queue.invalidate(deck_id)
+        get_card_from_deck(deck_id)
+
+    timed("get_card_from_deck.cold", cold_next_card)
+    timed("get_card_from_deck", lambda: get_card_from_deck(deck_id))
+
+    cards = (
+        db.session.query(Card)
+        .filter(Card.state != 0)
+        .order_by(func.random())
+        .limit(PROPERTY_SAMPLE)
+        .all()
+    )
+    for prop in ("reps", "lapses"):
+        timed(
+            f"card.{prop}",
+            lambda: [getattr(card, prop) for card in cards],
+        )
+        timings[f"card.{prop}"] /= len(cards)
+
+    return timings
+
+
+def measure_size(cards, repeat) -> dict:
+    source = cached_collection(cards)
+    with tempfile.TemporaryDirectory(prefix="quint-bench-") as data_dir:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.services",
+                "measure",
+                source,
+                "--repeat",
+                str(repeat),
+            ],
+            cwd=ROOT,
+            env=child_env(data_dir),
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"Measuring {cards} cards failed:\n{result.stderr}")
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"Measuring {cards} cards reported nothing")
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=5, label=None) -> dict:
+    """
+    Measure every size.
+
+    Returns:
+        Results with the median seconds of each metric per size under "sizes"
+    """
+    revision = git_revision()
+    results = {
+        "version": RESULTS_VERSION,
+        "label": label or revision,
+        "revision": revision,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "sizes": {},
+    }
+    for cards in sizes:
+        started = time.perf_counter()
+        results["sizes"][str(cards)] = measure_size(cards, repeat)
+        print(f"{cards} cards measured in {time.perf_counter() - started:.1f}s")
+    return results
+
+
+def load_history(path) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(results) + "\n")
+
+
+def format_seconds(seconds) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def trend_report(history, markdown=False) -> str:
+    """
+    Table of every metric per size across runs, oldest run first.
+
+    The last column is the change of the newest run against the one before.
+    """
+    if not history:
+        return "No benchmark runs recorded"
+
+    labels = [run["label"] for run in history]
+    header = ["size", "metric"] + labels + ["change"]
+    rows = []
+    sizes = sorted({size for run in history for size in run["sizes"]}, key=int)
+    for size in sizes:
+        metrics = []
+        for run in history:
+            for name in run["sizes"].get(size, {}):
+                if name not in metrics:
+                    metrics.append(name)
+        for name in metrics:
+            values = [run["sizes"].get(size, {}).get(name) for run in history]
+            change = ""
+            if len(values) > 1 and values[-1] is not None and values[-2]:
+                change = f"{(values[-1] - values[-2]) / values[-2] * 100:+.1f}%"
+            rows.append([size, name] + [format_seconds(v) for v in values] + [change])
+
+    if markdown:
+        lines = [
+            "| " + " | ".join(header) + " |",
+            "|" + "|".join("---" for _ in header) + "|",
+        ]
+        lines += ["| " + " | ".join(row) + " |" for row in rows]
+        return "\n".join(lines)
+
+    widths = [
+        max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))
+    ]
+    return "\n".join(
+        "  ".join(
+            str(cell).ljust(width) if i < 2 else str(cell).rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in [header] + rows
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.services",
+        description="Benchmark the services layer on synthetic collections.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measure and record a run")
+    run_parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated collection sizes in cards",
+    )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument(
+        "--label", help="Name of the run in reports (default: git revision)"
+    )
+    run_parser.add_argument(
+        "--history",
+        default=DEFAULT_HISTORY,
+        help=f"History file the run is appended to (default: {DEFAULT_HISTORY})",
+    )
+    run_parser.add_argument("--output", help="Also write the run to this file")
+
+    report_parser = commands.add_parser("report", help="Print the trend of runs")
+    report_parser.add_argument("--history", default=DEFAULT_HISTORY)
+    report_parser.add_argument(
+        "--last", type=int, default=5, help="Number of runs to show (default 5)"
+    )
+    report_parser.add_argument(
+        "--markdown", action="store_true", help="Print a Markdown table"
+    )
+
+    # Internal: the measured child process
+    measure_parser = commands.add_parser("measure")
+    measure_parser.add_argument("source")
+    measure_parser.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "measure":
+        print(json.dumps(measure(args.source, args.repeat)))
+        return 0
+
+    if args.command == "report":
+        history = load_history(args.history)
+        print(trend_report(history[-args.last :], markdown=args.markdown))
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run_benchmarks(sizes, args.repeat, args.label)
+    append_history(args.history, results)
+    if args.output:
+        save_results(args.output, results)
+    print(trend_report(load_history(args.history)[-2:]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
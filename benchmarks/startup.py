@@ -0,0 +1,269 @@
+"""
+Startup and import-time benchmarks.
+
+Usage:
+    python -m benchmarks.startup run [--runs N] [--output FILE]
+    python -m benchmarks.startup compare BASELINE [--current FILE]
+        [--threshold 0.2] [--min-delta-ms 5]
+
+Every measurement runs in a fresh interpreter with Qt on the offscreen
+platform and a throwaway data directory:
+
+    import.<package>     cumulative `python -X importtime` cost of importing
+                         ui, database, flows and settings on their own
+    startup.show         process start to MainApp.show() returning
+    startup.first_paint  process start to the first frame being painted
+
+The median of the runs is kept. `run` writes the results as JSON, to be
+kept as a baseline; `compare` measures again (or reads --current) and exits
+with status 1 if any metric got slower than the baseline by more than the
+threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .common import ROOT, child_env, load_results, save_results
+
+PACKAGES = ("ui", "database", "flows", "settings")
+
+RESULTS_VERSION = 1
+
+
+def parse_importtime(stderr, package) -> float:
+    """
+    Cumulative seconds of a top-level import in `-X importtime` output.
+
+    Lines look like "import time:  self [us] | cumulative | name", with
+    nested imports indented under the module that triggered them.
+    """
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) == 3 and fields[2].strip() == package:
+            try:
+                return int(fields[1]) / 1e6
+            except ValueError:
+                continue
+    raise ValueError(f"No import time reported for {package}")
+
+
+def measure_import(package, env) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {package}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr, package)
+
+
+def measure_startup(env) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "probe"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    )
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise ValueError(f"Startup probe reported nothing:\n{result.stderr}")
+
+
+def probe():
+    """Start the app as main.py does and print when it shows and paints."""
+    started = time.perf_counter()
+
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    import main
+    from ui import theme
+    from ui.components import prewarm_icons
+    from ui.pages.main_window import MainApp
+
+    timings = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if (
+                "first_paint" not in timings
+                and event.type() == QEvent.Paint
+                and obj.isWindow()
+            ):
+                # Stamped once the paint event has been handled
+                QTimer.singleShot(0, finish)
+                timings["first_paint"] = None
+            return False
+
+    def finish():
+        timings["first_paint"] = time.perf_counter() - started
+        app.quit()
+
+    app = QApplication(sys.argv[:1])
+    theme.FONT_FAMILY = main.load_fonts()
+    prewarm_icons()
+
+    window = MainApp()
+    window.show()
+    timings["show"] = time.perf_counter() - started
+
+    paint_filter = FirstPaint()
+    app.installEventFilter(paint_filter)
+    QTimer.singleShot(30000, app.quit)  # Never hang a benchmark run
+    app.exec_()
+
+    print(json.dumps(timings))
+    return 0
+
+
+def run_benchmarks(runs=5) -> dict:
+    """
+    Measure every metric in fresh interpreters.
+
+    Returns:
+        Results with the median seconds of each metric under "metrics"
+    """
+    samples = {}
+    for run in range(runs):
+        with tempfile.TemporaryDirectory(prefix="quint-bench-") as data_dir:
+            env = child_env(data_dir)
+            for package in PACKAGES:
+                samples.setdefault(f"import.{package}", []).append(
+                    measure_import(package, env)
+                )
+            startup = measure_startup(env)
+            samples.setdefault("startup.show", []).append(startup["show"])
+            samples.setdefault("startup.first_paint", []).append(startup["first_paint"])
+        print(f"[{run + 1}/{runs}] runs done")
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "metrics": {
+            name: statistics.median(values) for name, values in samples.items()
+        },
+    }
+
+
+def compare_results(baseline, current, threshold=0.2, min_delta=0.005) -> list:
+    """
+    Find metrics that got slower than the baseline.
+
+    A metric regresses when it is more than `threshold` (a fraction) slower
+    and the difference exceeds `min_delta` seconds, which keeps timer noise
+    on very fast metrics from failing the comparison.
+
+    Returns:
+        List of (metric, baseline seconds, current seconds) that regressed
+    """
+    regressions = []
+    for name, before in baseline["metrics"].items():
+        after = current["metrics"].get(name)
+        if after is None:
+            continue
+        if after > before * (1 + threshold) and after - before > min_delta:
+            regressions.append((name, before, after))
+    return regressions
+
+
+def print_table(baseline, current):
+    print(f"{'metric':<22}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, before in sorted(baseline["metrics"].items()):
+        after = current["metrics"].get(name)
+        if after is None:
+            print(f"{name:<22}{before * 1000:>10.1f}ms{'missing':>12}")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        print(
+            f"{name:<22}{before * 1000:>10.1f}ms{after * 1000:>10.1f}ms"
+            f"{change:>+9.1f}%"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Measure startup and import time.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measure and write results")
+    run_parser.add_argument("--runs", type=int, default=5)
+    run_parser.add_argument(
+        "--output",
+        default=os.path.join("benchmarks", "baselines", "startup.json"),
+        help="Results file (default: benchmarks/baselines/startup.json)",
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="Fail if startup regressed against a baseline"
+    )
+    compare_parser.add_argument("baseline", help="Baseline results file")
+    compare_parser.add_argument(
+        "--current", help="Results to compare (default: measure now)"
+    )
+    compare_parser.add_argument("--runs", type=int, default=5)
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown as a fraction (default 0.2)",
+    )
+    compare_parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=5.0,
+        help="Ignore slowdowns smaller than this (default 5)",
+    )
+
+    # Internal: the measured child process
+    commands.add_parser("probe")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "probe":
+        return probe()
+
+    if args.command == "run":
+        results = run_benchmarks(args.runs)
+        for name, seconds in sorted(results["metrics"].items()):
+            print(f"{name:<22}{seconds * 1000:>10.1f}ms")
+        save_results(args.output, results)
+        print(f"Results written to {args.output}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current) if args.current else run_benchmarks(args.runs)
+    print_table(baseline, current)
+
+    regressions = compare_results(
+        baseline, current, args.threshold, args.min_delta_ms / 1000
+    )
+    for name, before, after in regressions:
+        print(
+            f"REGRESSION {name}: {before * 1000:.1f}ms -> {after * 1000:.1f}ms "
+            f"(more than {args.threshold:.0%} slower)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
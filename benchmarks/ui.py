@@ -0,0 +1,333 @@
+"""
+Headless UI performance harness.
+
+Usage:
+    python -m benchmarks.ui [--cards N] [--json FILE] [pytest arguments]
+    python -m pytest benchmarks/ui.py
+
+Runs the scenarios below as pytest tests on the offscreen Qt platform,
+against a copy of a synthetic collection (benchmarks.generate, 100,000 cards
+unless QUINT_BENCH_CARDS says otherwise) in a throwaway data directory:
+
+    decks_page           constructing and showing the DecksPage
+    update_deck_counts   refreshing the counts of the largest deck's row
+    refresh_deck_list    reloading every deck into the table
+    manage_cards         opening the ManageCardsDialog on the largest deck
+    chat_messages        appending 1,000 messages to the chat transcript
+
+Each scenario runs inside the Qt event loop twice: once timed, and once under
+tracemalloc for the memory it leaves allocated and its peak. A 1 ms heartbeat
+timer records the longest the event loop went without running, which is what
+the user feels as a freeze. Results are printed after the run and, with
+--json or QUINT_BENCH_JSON, written to a file.
+
+The file is not named test_*.py so the harness only runs when asked for.
+"""
+
+import os
+import sys
+import tempfile
+
+# The data directory and Qt platform must be set before any application
+# module resolves them on import
+if "QUINT_BENCH_DATA" not in os.environ:
+    os.environ["QUINT_BENCH_DATA"] = tempfile.mkdtemp(prefix="quint-ui-bench-")
+    os.environ.update(
+        {
+            "QT_QPA_PLATFORM": "offscreen",
+            "HOME": os.environ["QUINT_BENCH_DATA"],
+            "XDG_DATA_HOME": os.environ["QUINT_BENCH_DATA"],
+            "LOCALAPPDATA": os.environ["QUINT_BENCH_DATA"],
+        }
+    )
+
+import argparse
+import gc
+import shutil
+import time
+import tracemalloc
+
+import pytest
+from PyQt5.QtCore import QEventLoop, QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from .common import save_results
+from .services import cached_collection
+
+DEFAULT_CARDS = 100_000
+
+CHAT_MESSAGES = 1_000
+
+# Event loop time given to layouts and painting after each action
+SETTLE_MS = 200
+
+
+class StallMonitor(QObject):
+    """Records the longest gap between runs of a 1 ms heartbeat timer."""
+
+    INTERVAL_MS = 1
+
+    def __init__(self):
+        super().__init__()
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.INTERVAL_MS)
+        self.timer.timeout.connect(self._beat)
+        self.longest = 0.0
+        self._last = None
+
+    def start(self):
+        self.longest = 0.0
+        self._last = time.perf_counter()
+        self.timer.start()
+
+    def stop(self) -> float:
+        """Stop and return the longest stall in seconds."""
+        self._beat()
+        self.timer.stop()
+        return max(self.longest - self.INTERVAL_MS / 1000, 0.0)
+
+    def _beat(self):
+        now = time.perf_counter()
+        self.longest = max(self.longest, now - self._last)
+        self._last = now
+
+
+def run_in_loop(action, state) -> float:
+    """Run action(state) from the event loop and let it settle."""
+    loop = QEventLoop()
+    elapsed = []
+
+    def run():
+        started = time.perf_counter()
+        action(state)
+        elapsed.append(time.perf_counter() - started)
+        QTimer.singleShot(SETTLE_MS, loop.quit)
+
+    QTimer.singleShot(0, run)
+    loop.exec_()
+    return elapsed[0]
+
+
+def measure(action, setup=None, teardown=None) -> dict:
+    """
+    Time a scenario, then run it again to measure its memory.
+
+    Args:
+        action: Callable run in the event loop with the setup's result
+        setup: Optional callable preparing fresh state for each run
+        teardown: Optional callable disposing of that state
+
+    Returns:
+        Dictionary with the seconds the action took, the longest event loop
+        stall in seconds, and the bytes it left allocated and at its peak
+    """
+    monitor = StallMonitor()
+    result = {}
+
+    for traced in (False, True):
+        state = setup() if setup else None
+        gc.collect()
+        if traced:
+            tracemalloc.start()
+            before, _ = tracemalloc.get_traced_memory()
+        else:
+            monitor.start()
+
+        seconds = run_in_loop(action, state)
+
+        if traced:
+            after, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["memory_bytes"] = after - before
+            result["peak_bytes"] = peak - before
+        else:
+            result["stall_seconds"] = monitor.stop()
+            result["seconds"] = seconds
+
+        if teardown:
+            teardown(state)
+        process_events()
+
+    return result
+
+
+def process_events():
+    app = QApplication.instance()
+    app.processEvents()
+    app.sendPostedEvents(None, 0)  # Includes DeferredDelete
+
+
+@pytest.fixture(scope="session")
+def app():
+    from database.database import DB_DIR, DB_PATH
+
+    os.makedirs(DB_DIR, exist_ok=True)
+    shutil.copyfile(
+        cached_collection(int(os.environ.get("QUINT_BENCH_CARDS", DEFAULT_CARDS))),
+        DB_PATH,
+    )
+
+    application = QApplication.instance() or QApplication(sys.argv[:1])
+    yield application
+    shutil.rmtree(os.environ["QUINT_BENCH_DATA"], ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def results(request):
+    collected = {}
+    yield collected
+
+    # Printed past pytest's output capturing, which is still on at teardown
+    capture = request.config.pluginmanager.getplugin("capturemanager")
+    with capture.global_and_fixture_disabled():
+        print(f"\n{'scenario':<20}{'time':>10}{'stall':>10}{'memory':>12}{'peak':>12}")
+        for name, result in collected.items():
+            print(
+                f"{name:<20}{result['seconds'] * 1000:>8.1f}ms"
+                f"{result['stall_seconds'] * 1000:>8.1f}ms"
+                f"{result['memory_bytes'] / 2**20:>10.2f}MB"
+                f"{result['peak_bytes'] / 2**20:>10.2f}MB"
+            )
+
+    output = os.environ.get("QUINT_BENCH_JSON")
+    if output:
+        save_results(
+            output,
+            {
+                "cards": int(os.environ.get("QUINT_BENCH_CARDS", DEFAULT_CARDS)),
+                "scenarios": collected,
+            },
+        )
+
+
+@pytest.fixture(scope="session")
+def largest_deck(app):
+    from sqlalchemy import func
+
+    from database.database import db
+    from database.models import Card
+
+    return (
+        db.session.query(Card.deck_id)
+        .group_by(Card.deck_id)
+        .order_by(func.count(Card.id).desc())
+        .limit(1)
+        .scalar()
+    )
+
+
+def close_widget(widget):
+    widget.close()
+    widget.deleteLater()
+
+
+def shown_decks_page():
+    from ui.pages.decks import DecksPage
+
+    page = DecksPage()
+    page.resize(1600, 1200)
+    page.show()
+    process_events()
+    return page
+
+
+def test_decks_page(app, results):
+    from ui.pages.decks import DecksPage
+
+    pages = []
+
+    def construct(_):
+        page = DecksPage()
+        page.resize(1600, 1200)
+        page.show()
+        pages.append(page)
+
+    results["decks_page"] = measure(
+        construct, teardown=lambda _: close_widget(pages.pop())
+    )
+
+
+def test_update_deck_counts(app, results, largest_deck):
+    results["update_deck_counts"] = measure(
+        lambda page: page.update_deck_counts(largest_deck),
+        setup=shown_decks_page,
+        teardown=close_widget,
+    )
+
+
+def test_refresh_deck_list(app, results):
+    def refresh(page):
+        page._refresh_deck_list()
+        assert page.model.rowCount() > 0
+
+    results["refresh_deck_list"] = measure(
+        refresh, setup=shown_decks_page, teardown=close_widget
+    )
+
+
+def test_manage_cards(app, results, largest_deck):
+    from ui.pages.chat import ManageCardsDialog
+
+    dialogs = []
+
+    def open_dialog(_):
+        dialog = ManageCardsDialog(largest_deck)
+        dialog.show()
+        dialogs.append(dialog)
+
+    def check_and_close(_):
+        dialog = dialogs.pop()
+        assert dialog.model.rowCount() > 0
+        close_widget(dialog)
+
+    results["manage_cards"] = measure(open_dialog, teardown=check_and_close)
+
+
+def test_chat_messages(app, results):
+    from ui.pages.chat import ChatPage
+
+    def shown_chat_page():
+        page = ChatPage()
+        page.resize(1600, 1200)
+        page.show()
+        process_events()
+        return page
+
+    def append_messages(page):
+        for i in range(CHAT_MESSAGES):
+            page.add_message(
+                f"Message {i}: " + "lorem ipsum dolor sit amet " * (i % 7 + 1),
+                is_user=i % 2 == 0,
+            )
+        page.scroll_to_bottom()
+        assert page.chat_model.rowCount() == CHAT_MESSAGES
+
+    results["chat_messages"] = measure(
+        append_messages, setup=shown_chat_page, teardown=close_widget
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.ui",
+        description="Measure UI scenarios on the offscreen Qt platform.",
+    )
+    parser.add_argument(
+        "--cards",
+        type=int,
+        default=DEFAULT_CARDS,
+        help=f"Cards in the synthetic collection (default {DEFAULT_CARDS})",
+    )
+    parser.add_argument("--json", help="Write the results to this file")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    os.environ["QUINT_BENCH_CARDS"] = str(args.cards)
+    if args.json:
+        os.environ["QUINT_BENCH_JSON"] = os.path.abspath(args.json)
+    return pytest.main(
+        [os.path.abspath(__file__), "-q", "-p", "no:cacheprovider"] + pytest_args
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,17 @@
 from . import services
 from .database import db
-from .models import Base, Card, Deck, Message
+from .due_queue import due_queue
+from .models import Base, Card, CardSection, Deck, KeyIdea, Message
 
-__all__ = ["db", "Deck", "Card", "Message", "Base", "services"]
+__all__ = [
+    "db",
+    "due_queue",
+    "Deck",
+    "Card",
+    "CardSection",
+    "KeyIdea",
+    "Message",
+    "Base",
+    "services",
+]
 
@@ -0,0 +1,294 @@
+"""
+Online backups of the collection database.
+
+Usage:
+    python -m database.backup [--compress] [--keep N]
+
+Snapshots are taken with SQLite's online backup API, a few pages per step,
+so the app and the write queue keep reading and committing while a backup
+runs. Each snapshot is paired with a manifest of the content files its cards
+reference, and the oldest snapshots are rotated out.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from settings.settings import settings
+
+from .database import DB_PATH
+from .utilities import DATA_DIR
+
+BACKUP_DIR = DATA_DIR + "/backups"
+
+# Pages copied per backup step, and the pause between steps in seconds
+PAGES_PER_STEP = 256
+STEP_SLEEP = 0.005
+
+SNAPSHOT_PREFIX = "decks-"
+
+# Files making up a snapshot; anything else in the directory is left alone
+SNAPSHOT_SUFFIXES = (".db", ".zip", ".manifest.json")
+
+# Microseconds keep snapshots taken within the same second apart. Older
+# snapshots were named to the second.
+SNAPSHOT_FORMATS = ("%Y%m%d-%H%M%S-%f", "%Y%m%d-%H%M%S")
+
+# Seconds after which a leftover .tmp of an interrupted backup is deleted
+STALE_TMP_SECONDS = 3600
+
+
+def snapshot_name(now=None) -> str:
+    """File stem of a snapshot taken at the given local time."""
+    return SNAPSHOT_PREFIX + (now or datetime.now()).strftime(SNAPSHOT_FORMATS[0])
+
+
+def snapshot_time(stem):
+    """Local time a snapshot was taken, or None if the stem is not a snapshot's."""
+    for fmt in SNAPSHOT_FORMATS:
+        try:
+            return datetime.strptime(stem[len(SNAPSHOT_PREFIX) :], fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def list_snapshots(backup_dir=BACKUP_DIR) -> list:
+    """
+    List the complete snapshots in a backup directory, oldest first.
+
+    Returns:
+        List of (stem, [paths]) with every file belonging to a snapshot
+    """
+    snapshots = {}
+    for path in Path(backup_dir).glob(SNAPSHOT_PREFIX + "*"):
+        suffix = next((s for s in SNAPSHOT_SUFFIXES if path.name.endswith(s)), None)
+        if suffix is None:
+            continue
+        stem = path.name[: -len(suffix)]
+        taken = snapshot_time(stem)
+        if taken is not None:
+            snapshots.setdefault((taken, stem), []).append(path)
+    return [(stem, paths) for (_, stem), paths in sorted(snapshots.items())]
+
+
+def remove_stale_files(backup_dir=BACKUP_DIR):
+    """Delete the partial copies left behind by interrupted backups."""
+    cutoff = time.time() - STALE_TMP_SECONDS
+    for path in Path(backup_dir).glob(SNAPSHOT_PREFIX + "*.tmp"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError as e:
+            print(f"Could not remove stale backup file {path}: {e}")
+
+
+def build_manifest(conn) -> dict:
+    """
+    Describe the content files referenced by the cards of a database.
+
+    Args:
+        conn: sqlite3 connection to the snapshot
+
+    Returns:
+        Dictionary with one entry per referenced path, including its size
+        and modification time, or missing=True if it no longer exists
+    """
+    files = []
+    rows = conn.execute(
+        "SELECT path, MAX(is_external), COUNT(*) FROM cards GROUP BY path ORDER BY path"
+    )
+    for path, is_external, cards in rows:
+        entry = {"path": path, "external": bool(is_external), "cards": cards}
+        try:
+            stat = os.stat(path)
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+        except OSError:
+            entry["missing"] = True
+        files.append(entry)
+    return {"files": files}
+
+
+def create_backup(
+    backup_dir=BACKUP_DIR,
+    compress=None,
+    keep=None,
+    pages=PAGES_PER_STEP,
+    progress=None,
+) -> Path:
+    """
+    Take an online snapshot of the database and rotate old ones.
+
+    Args:
+        backup_dir: Directory holding the snapshots
+        compress: Store the snapshot and manifest as one zip archive
+            (defaults to settings.backup_compress)
+        keep: Number of snapshots to keep (defaults to settings.backup_keep)
+        pages: Pages copied per backup step
+        progress: Optional callback(remaining, total) run after each step
+
+    Returns:
+        Path of the snapshot (the archive when compressed)
+    """
+    if compress is None:
+        compress = settings.backup_compress
+    if keep is None:
+        keep = settings.backup_keep
+
+    if not os.path.exists(DB_PATH):
+        raise FileNotFoundError(f"No database to back up at {DB_PATH}")
+
+    started = time.perf_counter()
+    backup_dir = Path(backup_dir)
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    stem = snapshot_name()
+    db_path = backup_dir / f"{stem}.db"
+    manifest_path = backup_dir / f"{stem}.manifest.json"
+    tmp_path = backup_dir / f"{stem}.db.tmp"
+
+    source = sqlite3.connect(DB_PATH)
+    target = sqlite3.connect(tmp_path)
+    try:
+        source.backup(
+            target,
+            pages=pages,
+            sleep=STEP_SLEEP,
+            progress=lambda status, remaining, total: (
+                progress(remaining, total) if progress else None
+            ),
+        )
+        # A standalone copy: fold the journal back into a single file
+        target.execute("PRAGMA journal_mode=DELETE")
+
+        check = target.execute("PRAGMA quick_check").fetchone()[0]
+        if check != "ok":
+            raise sqlite3.DatabaseError(f"Backup failed its integrity check: {check}")
+
+        manifest = build_manifest(target)
+        page_count = target.execute("PRAGMA page_count").fetchone()[0]
+    except Exception:
+        target.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        target.close()
+        source.close()
+
+    os.replace(tmp_path, db_path)
+    manifest.update(
+        {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "database": db_path.name,
+            "pages": page_count,
+        }
+    )
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    snapshot = db_path
+    if compress:
+        snapshot = backup_dir / f"{stem}.zip"
+        with zipfile.ZipFile(snapshot, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.write(db_path, db_path.name)
+            archive.write(manifest_path, manifest_path.name)
+        db_path.unlink()
+        manifest_path.unlink()
+
+    rotate_backups(backup_dir, keep)
+    print(
+        f"Backup written to {snapshot} ({page_count} pages, "
+        f"{len(manifest['files'])} files) in {time.perf_counter() - started:.1f}s"
+    )
+    return snapshot
+
+
+def rotate_backups(backup_dir=BACKUP_DIR, keep=None):
+    """Delete all but the newest `keep` snapshots, and stale partial copies."""
+    if keep is None:
+        keep = settings.backup_keep
+    remove_stale_files(backup_dir)
+    snapshots = list_snapshots(backup_dir)
+    for _, paths in snapshots[: max(len(snapshots) - keep, 0)]:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+
+class BackupService:
+    """Runs backups on a background thread, one at a time."""
+
+    def __init__(self, backup_dir=BACKUP_DIR):
+        self.backup_dir = backup_dir
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self, compress=None, keep=None) -> bool:
+        """
+        Start a backup unless one is already running.
+
+        Returns:
+            True if a backup was started
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(
+                target=self._run, args=(compress, keep), name="backup", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def backup_if_due(self) -> bool:
+        """Start a backup if the newest snapshot is older than the interval."""
+        interval = settings.backup_interval_hours
+        if interval <= 0 or not os.path.exists(DB_PATH):
+            return False
+
+        snapshots = list_snapshots(self.backup_dir)
+        if snapshots:
+            latest = snapshot_time(snapshots[-1][0])
+            if datetime.now() - latest < timedelta(hours=interval):
+                return False
+        return self.start()
+
+    def wait(self, timeout=None):
+        """Block until the running backup, if any, has finished."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, compress, keep):
+        try:
+            create_backup(self.backup_dir, compress=compress, keep=keep)
+        except Exception as e:
+            print(f"Backup failed: {e}")
+
+
+# Global backup service
+backup_service = BackupService()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m database.backup",
+        description="Take an online snapshot of the collection database.",
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="Store the snapshot as a zip archive"
+    )
+    parser.add_argument("--keep", type=int, help="Number of snapshots to keep")
+    parser.add_argument("--dir", default=BACKUP_DIR, help="Backup directory")
+    args = parser.parse_args(argv)
+
+    create_backup(args.dir, compress=args.compress or None, keep=args.keep)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,105 @@
 import os
+import threading
+import time
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
 
 from .models import Base
+from .profiler import sql_profiler
 from .utilities import DATA_DIR
 
 DB_DIR = DATA_DIR + "/data"
+DB_PATH = os.path.join(DB_DIR, "decks.db")
 
 
 class Database:
+    """
+    Engine and session of the collection database.
+
+    The database is opened, created and upgraded on first use of the engine
+    or session rather than at import, so code paths that never touch it
+    (such as showing the menu) do not pay for it.
+    """
+
     _instance = None
     _engine = None
     _session = None
+    _lock = threading.Lock()
+
+    # Seconds spent opening and upgrading the database, once initialized
+    init_seconds = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
-            cls._instance._initialize()
         return cls._instance
 
+    def _ensure_initialized(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    started = time.perf_counter()
+                    self._initialize()
+                    self.init_seconds = time.perf_counter() - started
+
     def _initialize(self):
         # Make sure dir exists
         if not os.path.exists(DB_DIR):
             os.makedirs(DB_DIR, exist_ok=True)
-        db_path = os.path.join(DB_DIR, "decks.db")
 
         # Create engine and tables
-        self._engine = create_engine(f"sqlite:///{db_path}")
+        self._engine = create_engine(f"sqlite:///{DB_PATH}")
+        event.listen(self._engine, "connect", _configure_connection)
+        if sql_profiler.enabled:
+            sql_profiler.install(self._engine)
         Base.metadata.create_all(self._engine)
+        self._upgrade_schema()
 
         # Create session
         Session = sessionmaker(bind=self._engine)
         self._session = Session()
 
+    def _upgrade_schema(self):
+        """Bring tables created by older versions up to date with the models."""
+        inspector = inspect(self._engine)
+
+        with self._engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {
+                    column["name"]: column
+                    for column in inspector.get_columns(table.name)
+                }
+
+                # SQLite cannot relax NOT NULL in place, so rebuild the table
+                if any(
+                    column.name in existing
+                    and column.nullable
+                    and not existing[column.name]["nullable"]
+                    for column in table.columns
+                ):
+                    _rebuild_table(conn, inspector, table, existing)
+                    continue
+
+                for column in table.columns:
+                    if column.name not in existing:
+                        _add_column(conn, table, column)
+
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+    @property
+    def initialized(self) -> bool:
+        return self._session is not None
+
+    @property
+    def engine(self):
+        self._ensure_initialized()
+        return self._engine
+
     @property
     def session(self):
+        self._ensure_initialized()
         return self._session
 
     def close(self):
@@ -43,5 +107,41 @@ class Database:
             self._session.close()
 
 
+def _configure_connection(dbapi_connection, connection_record):
+    # WAL lets the background writers commit without blocking readers
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _add_column(conn, table, column):
+    column_type = column.type.compile(dialect=conn.dialect)
+    ddl = f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+
+    default = column.default
+    if default is not None and default.is_scalar:
+        ddl += f" DEFAULT {default.arg!r}"
+
+    conn.execute(text(ddl))
+
+
+def _rebuild_table(conn, inspector, table, existing):
+    old_name = f"_old_{table.name}"
+    for index in inspector.get_indexes(table.name):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    conn.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"'))
+
+    table.create(conn)
+
+    columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name in existing)
+    conn.execute(
+        text(
+            f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{old_name}"'
+        )
+    )
+    conn.execute(text(f'DROP TABLE "{old_name}"'))
+
+
 # Global database instance
 db = Database()
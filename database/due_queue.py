@@ -0,0 +1,218 @@
+import heapq
+import sqlite3
+import threading
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .database import DB_PATH
+from .models import Card
+from .write_queue import write_queue
+
+# Format SQLAlchemy stores DateTime columns in; these strings sort by time
+DUE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def due_key(value) -> str:
+    """Heap key for a naive UTC due timestamp."""
+    return value.strftime(DUE_FORMAT) if value is not None else ""
+
+
+class DueQueue:
+    """
+    Per-deck min-heaps of (due, card_id) for picking the next card to study.
+
+    A deck's heap is built on first use from an index scan and then kept
+    current by review writes and card inserts/deletes. Moved and deleted
+    cards leave stale heap entries behind, skipped when they surface.
+    Writes made outside this process are detected with PRAGMA data_version
+    and cause loaded decks to be rebuilt.
+    """
+
+    def __init__(self):
+        self._heaps = {}  # deck_id -> [(due, card_id)]
+        self._cards = {}  # card_id -> (deck_id, due) of the live entry
+        self._sizes = {}  # deck_id -> number of live entries
+        self._lock = threading.RLock()
+        self._conn = None
+        self._data_version = None
+
+    def next_card(self, deck_id, before=None):
+        """
+        Get the card with the earliest due time in a deck.
+
+        Args:
+            deck_id: The ID of the deck
+            before: Only return a card due at or before this naive UTC time
+
+        Returns:
+            Card ID, or None if no card qualifies
+        """
+        entry = self.peek(deck_id)
+        if entry is None or (before is not None and entry[0] > due_key(before)):
+            return None
+        return entry[1]
+
+    def peek(self, deck_id):
+        """Get the (due, card_id) entry with the earliest due time in a deck."""
+        with self._lock:
+            self._check_version()
+            heap = self._load(deck_id)
+            while heap:
+                due, card_id = heap[0]
+                if self._cards.get(card_id) == (deck_id, due):
+                    return due, card_id
+                heapq.heappop(heap)
+            return None
+
+    def update(self, card_id, due, deck_id=None):
+        """
+        Record a card's new due time.
+
+        Args:
+            card_id: The ID of the card
+            due: New naive UTC due time
+            deck_id: The card's deck, needed for cards not yet tracked
+        """
+        with self._lock:
+            current = self._cards.get(card_id)
+            if current is not None:
+                deck_id = current[0]
+            if deck_id not in self._heaps:
+                return
+
+            key = due_key(due)
+            if current is None:
+                self._sizes[deck_id] += 1
+            elif current[1] == key:
+                return
+
+            self._cards[card_id] = (deck_id, key)
+            heapq.heappush(self._heaps[deck_id], (key, card_id))
+            self._compact(deck_id)
+
+    def remove(self, card_id):
+        """Stop tracking a deleted card."""
+        with self._lock:
+            current = self._cards.pop(card_id, None)
+            if current is not None:
+                self._sizes[current[0]] -= 1
+                self._compact(current[0])
+
+    def invalidate(self, deck_id=None):
+        """Drop a deck's heap (default all) so it is rebuilt on next use."""
+        with self._lock:
+            deck_ids = list(self._heaps) if deck_id is None else [deck_id]
+            for dropped in deck_ids:
+                self._heaps.pop(dropped, None)
+                self._sizes.pop(dropped, None)
+            self._cards = {
+                card_id: entry
+                for card_id, entry in self._cards.items()
+                if entry[0] in self._heaps
+            }
+
+    def mark_synced(self):
+        """Accept the database's current state after an in-process commit."""
+        with self._lock:
+            self._data_version = self._read_version()
+
+    def check_external_writes(self):
+        """Rebuild loaded decks if another writer changed the database."""
+        with self._lock:
+            self._check_version()
+
+    def _check_version(self):
+        version = self._read_version()
+        if self._data_version is not None and version != self._data_version:
+            self.invalidate()
+        self._data_version = version
+
+    def _read_version(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _load(self, deck_id):
+        heap = self._heaps.get(deck_id)
+        if heap is not None:
+            return heap
+
+        # Served by the (deck_id, due) index already in due order, which is
+        # a valid heap without heapify
+        heap = self._conn.execute(
+            "SELECT COALESCE(due, ''), id FROM cards WHERE deck_id = ? ORDER BY due",
+            (deck_id,),
+        ).fetchall()
+        for due, card_id in heap:
+            self._cards[card_id] = (deck_id, due)
+        self._heaps[deck_id] = heap
+        self._sizes[deck_id] = len(heap)
+        return heap
+
+    def _compact(self, deck_id):
+        heap = self._heaps[deck_id]
+        if len(heap) <= 2 * self._sizes[deck_id] + 64:
+            return
+        heap[:] = sorted(
+            (due, card_id)
+            for card_id, (card_deck_id, due) in self._cards.items()
+            if card_deck_id == deck_id
+        )
+
+
+# Global due queue
+due_queue = DueQueue()
+
+
+def _apply_queued_writes(writes):
+    for kind, target, values in writes:
+        if kind == "execute":
+            # Bulk jobs (rescheduling) do not report which cards they moved
+            due_queue.invalidate()
+        elif target is Card and "due" in values:
+            due_queue.update(values["id"], values["due"], values.get("deck_id"))
+
+
+def _stage(session, change):
+    session.info.setdefault("due_queue_changes", []).append(change)
+
+
+@event.listens_for(Card, "after_insert")
+def _card_inserted(mapper, connection, target):
+    _stage(inspect(target).session, ("update", target.id, target.due, target.deck_id))
+
+
+@event.listens_for(Card, "after_update")
+def _card_updated(mapper, connection, target):
+    if inspect(target).attrs.due.history.has_changes():
+        _stage(inspect(target).session, ("update", target.id, target.due, None))
+
+
+@event.listens_for(Card, "after_delete")
+def _card_deleted(mapper, connection, target):
+    _stage(inspect(target).session, ("remove", target.id, None, None))
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    # Changes by other writers must be noticed before this commit hides them
+    due_queue.check_external_writes()
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    due_queue.mark_synced()
+    for kind, card_id, due, deck_id in session.info.pop("due_queue_changes", []):
+        if kind == "remove":
+            due_queue.remove(card_id)
+        else:
+            due_queue.update(card_id, due, deck_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session, previous_transaction):
+    session.info.pop("due_queue_changes", None)
+
+
+write_queue.add_listener(_apply_queued_writes)
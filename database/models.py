@@ -6,6 +6,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -33,9 +34,21 @@ class Deck(Base):
     maximum_interval = Column(Integer, default=36500)  # Maximum interval in days
     enable_fuzz = Column(Integer, default=1)  # Enable/disable fuzzing (0 or 1)
 
+    # Scheduling algorithm ("FSRS" or "SM2"); falls back to settings.algorithm
+    algorithm = Column(String(32))
+
+    # Daily limits applied when studying across decks
+    new_per_day = Column(Integer, default=20)  # New cards introduced per day
+    reviews_per_day = Column(Integer, default=200)  # Reviews of seen cards per day
+
 
 class Card(Base):
     __tablename__ = "cards"
+    __table_args__ = (
+        Index("ix_cards_deck_id_due", "deck_id", "due"),
+        # Entries are ordered by (deck_id, rowid): pages a deck in ID order
+        Index("ix_cards_deck_id", "deck_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     deck_id = Column(Integer, nullable=False)
@@ -61,7 +74,18 @@ class Card(Base):
     anki_difficulty = Column(Float, default=2.5)  # SM2 easiness factor (difficulty)
 
     # Relationships
-    reviews = relationship("Review", back_populates="card")
+    reviews = relationship(
+        "Review", back_populates="card", cascade="all, delete-orphan"
+    )
+    sections = relationship(
+        "CardSection",
+        back_populates="card",
+        cascade="all, delete-orphan",
+        order_by="CardSection.position",
+    )
+    key_ideas = relationship(
+        "KeyIdea", back_populates="card", cascade="all, delete-orphan"
+    )
 
     @property
     def reps(self):
@@ -139,11 +163,67 @@ class Review(Base):
     card = relationship("Card", back_populates="reviews")
 
 
+class CardSection(Base):
+    __tablename__ = "card_sections"
+
+    id = Column(Integer, primary_key=True)
+
+    card_id = Column(Integer, ForeignKey("cards.id"), nullable=False, index=True)
+
+    # Position of the heading section within the card's file
+    position = Column(Integer, nullable=False)
+    heading = Column(Text)
+    content_hash = Column(String(64), nullable=False)  # sha256 of the section text
+
+    # Cached extraction result for this section
+    topic = Column(Text)
+    key_ideas = Column(Text)  # Key ideas as JSON string
+    extracted_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    card = relationship("Card", back_populates="sections")
+
+
+class KeyIdea(Base):
+    __tablename__ = "key_ideas"
+
+    id = Column(Integer, primary_key=True)
+
+    card_id = Column(Integer, ForeignKey("cards.id"), nullable=False, index=True)
+
+    title = Column(String(255), nullable=False)
+    description = Column(Text)
+    section = Column(Text)  # Heading of the section the idea came from
+
+    # FSRS scheduling state for this idea alone
+    stability = Column(Float, default=0.0)
+    difficulty = Column(Float, default=0.0)
+    state = Column(Integer, default=0)  # 0=New, 1=Learning, 2=Review, 3=Relearning
+    due = Column(DateTime, default=datetime.utcnow)
+    last_review = Column(DateTime)
+    reps = Column(Integer, default=0)
+    lapses = Column(Integer, default=0)
+
+    # Relationships
+    card = relationship("Card", back_populates="key_ideas")
+
+
 class Message(Base):
     __tablename__ = "messages"
 
     id = Column(Integer, primary_key=True)
-    review_id = Column(Integer, nullable=False)
-    message = Column(Text, nullable=False)
-    response = Column(Text)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    review_id = Column(Integer)
+    card_id = Column(Integer, index=True)
+
+    # Which call produced this row ("key_ideas", "judge", etc.)
+    kind = Column(String(32))
+    model = Column(String(64))
+
+    message = Column(Text, nullable=False)  # Prompt sent to the model
+    response = Column(Text)  # Raw model response (judge verdicts included)
+
+    latency_ms = Column(Integer)
+    prompt_tokens = Column(Integer)
+    completion_tokens = Column(Integer)
+
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
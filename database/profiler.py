@@ -0,0 +1,279 @@
+"""
+Opt-in profiling of the SQL the application runs.
+
+Enabled by the sql_profiling setting, or by the QUINT_SQL_PROFILE environment
+variable, which takes precedence. When enabled, cursor events on the engine
+count and time every statement, grouped by its normalized SQL:
+literals and IN lists are collapsed, so `WHERE card_id = 12` and
+`WHERE card_id = 13` are one pattern.
+
+Statements are attributed to the innermost logical operation of their
+thread, opened with `sql_profiler.operation(name)` or the `profiled(name)`
+decorator. When an operation ends, a summary is printed and any pattern run
+at least N_PLUS_ONE_THRESHOLD times inside it is flagged as a likely N+1
+query. SELECTs slower than sql_slow_query_ms get their EXPLAIN QUERY PLAN
+printed once per pattern. Timings cover executing a statement, not fetching
+its rows afterwards. A summary of the whole session is printed at exit.
+
+Only the engine is instrumented: the raw sqlite3 connections of the due
+queue and backups are not seen.
+"""
+
+import atexit
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from settings.settings import settings
+from utils.helpers import env_flag
+
+ENV_VAR = "QUINT_SQL_PROFILE"
+
+# Runs of one pattern within an operation that are reported as N+1
+N_PLUS_ONE_THRESHOLD = 10
+
+# Patterns listed in the session summary
+TOP_STATEMENTS = 5
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement) -> str:
+    """
+    Reduce a statement to its pattern.
+
+    String and number literals become ?, IN lists of any length become
+    IN (...), and whitespace is collapsed.
+    """
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _IN_LIST.sub("IN (...)", statement)
+    return _SPACE.sub(" ", statement).strip()
+
+
+def profiling_enabled() -> bool:
+    """Whether SQL statements are profiled this session."""
+    return env_flag(ENV_VAR, settings.sql_profiling)
+
+
+class StatementStats:
+    """Runs and total seconds of statements sharing a pattern."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.seconds += seconds
+
+
+class Operation:
+    """Statements run during one logical operation."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.statements = {}  # pattern -> StatementStats
+
+    def add(self, pattern, seconds):
+        stats = self.statements.get(pattern)
+        if stats is None:
+            stats = self.statements[pattern] = StatementStats()
+        stats.add(seconds)
+
+    @property
+    def count(self) -> int:
+        return sum(stats.count for stats in self.statements.values())
+
+    @property
+    def seconds(self) -> float:
+        return sum(stats.seconds for stats in self.statements.values())
+
+    def suspected_n_plus_one(self) -> list:
+        """Patterns run often enough within the operation to look like N+1."""
+        return [
+            (pattern, stats)
+            for pattern, stats in self.statements.items()
+            if stats.count >= N_PLUS_ONE_THRESHOLD
+        ]
+
+    def report(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        lines = [
+            f"SQL {self.name}: {self.count} queries, {self.seconds * 1000:.1f} ms "
+            f"of {elapsed * 1000:.1f} ms"
+        ]
+        for pattern, stats in self.suspected_n_plus_one():
+            lines.append(
+                f"  N+1? {stats.count}x ({stats.seconds * 1000:.1f} ms) {pattern}"
+            )
+        return "\n".join(lines)
+
+
+class SQLProfiler:
+    """Collects statement timings from the engine's cursor events."""
+
+    def __init__(self):
+        self._enabled = None
+        self.slow_seconds = 0.05
+        self.statements = {}  # pattern -> StatementStats, over the session
+        self._explained = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._engine = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether statements are profiled, decided on first use."""
+        if self._enabled is None:
+            self._enabled = profiling_enabled()
+        return self._enabled
+
+    def install(self, engine):
+        """Start profiling the engine's statements."""
+        from sqlalchemy import event
+
+        if self._engine is not None:
+            return
+        self._engine = engine
+        self._enabled = True
+        self.slow_seconds = settings.sql_slow_query_ms / 1000
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        atexit.register(self._report_session)
+        print(
+            f"SQL profiling enabled (slow queries from {settings.sql_slow_query_ms} ms)"
+        )
+
+    def uninstall(self):
+        """Stop profiling and forget what was collected."""
+        from sqlalchemy import event
+
+        if self._engine is None:
+            return
+        event.remove(self._engine, "before_cursor_execute", self._before_execute)
+        event.remove(self._engine, "after_cursor_execute", self._after_execute)
+        atexit.unregister(self._report_session)
+        self._engine = None
+        self._enabled = False
+        with self._lock:
+            self.statements.clear()
+            self._explained.clear()
+
+    def operation(self, name):
+        """
+        Context manager attributing the statements of this thread to `name`.
+
+        Operations nest; statements count towards the innermost one.
+        Returns a no-op context when profiling is off.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._operation(name)
+
+    @contextmanager
+    def _operation(self, name):
+        stack = self._stack()
+        operation = Operation(name)
+        stack.append(operation)
+        try:
+            yield operation
+        finally:
+            stack.pop()
+            if operation.statements:
+                print(operation.report())
+
+    def top_statements(self, limit=TOP_STATEMENTS) -> list:
+        """Patterns with the most total time over the session."""
+        with self._lock:
+            items = list(self.statements.items())
+        items.sort(key=lambda item: item[1].seconds, reverse=True)
+        return items[:limit]
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["profiler_started"].pop()
+        pattern = normalize_sql(statement)
+
+        with self._lock:
+            stats = self.statements.get(pattern)
+            if stats is None:
+                stats = self.statements[pattern] = StatementStats()
+            stats.add(seconds)
+            explain = (
+                seconds >= self.slow_seconds
+                and not executemany
+                and pattern not in self._explained
+                and pattern.upper().startswith(("SELECT", "WITH"))
+            )
+            if explain:
+                self._explained.add(pattern)
+
+        stack = self._stack()
+        if stack:
+            stack[-1].add(pattern, seconds)
+
+        if explain:
+            self._explain(cursor, statement, parameters, seconds)
+
+    def _explain(self, cursor, statement, parameters, seconds):
+        try:
+            plan = cursor.connection.execute(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            ).fetchall()
+        except Exception as e:
+            print(f"EXPLAIN QUERY PLAN failed: {e}")
+            return
+        lines = [f"Slow query ({seconds * 1000:.1f} ms): {normalize_sql(statement)}"]
+        lines += [f"  {row[-1]}" for row in plan]
+        print("\n".join(lines))
+
+    def _report_session(self):
+        top = self.top_statements()
+        if not top:
+            return
+        with self._lock:
+            count = sum(stats.count for stats in self.statements.values())
+            seconds = sum(stats.seconds for stats in self.statements.values())
+        lines = [f"SQL session: {count} queries, {seconds * 1000:.1f} ms"]
+        for pattern, stats in top:
+            lines.append(f"  {stats.count}x {stats.seconds * 1000:.1f} ms {pattern}")
+        print("\n".join(lines))
+
+
+# Global SQL profiler, installed on the engine when profiling is enabled
+sql_profiler = SQLProfiler()
+
+
+def profiled(name):
+    """Decorator running a function as a profiled operation."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not sql_profiler.enabled:
+                return function(*args, **kwargs)
+            with sql_profiler.operation(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -7,7 +7,7 @@ from sqlalchemy import and_
 from settings.settings import settings
 
 from .database import db
-from .models import Card, Deck
+from .models import Card, Deck, Message
 from .file_store import save_file
 
 
@@ -86,6 +86,42 @@ def count_due_cards(deck_id) -> int:
     )
 
 
+def get_next_due(deck_id: int, after: datetime) -> Optional[datetime]:
+    """
+    Get the earliest due time of a deck's seen cards after a given time.
+
+    Walks the (deck_id, due) index and stops at the first match.
+
+    Args:
+        deck_id: The ID of the deck to query
+        after: Only consider cards due after this time
+
+    Returns:
+        Naive UTC due timestamp, or None if no card is due after the time
+    """
+    return (
+        db.session.query(Card.due)
+        .filter(
+            Card.deck_id == deck_id,
+            Card.due > after,
+            Card.state.in_([1, 2, 3]),  # Learning, Review, Relearning
+        )
+        .order_by(Card.due)
+        .limit(1)
+        .scalar()
+    )
+
+
+def get_card_deck_ids(card_ids) -> List[int]:
+    """Get the IDs of the decks holding the given cards."""
+    return [
+        deck_id
+        for (deck_id,) in db.session.query(Card.deck_id)
+        .filter(Card.id.in_(list(card_ids)))
+        .distinct()
+    ]
+
+
 def count_total_cards(deck_id: int) -> int:
     """Count total cards in a deck."""
     return db.session.query(Card).filter(Card.deck_id == deck_id).count()
@@ -161,6 +197,73 @@ def create_deck(name: str, **kwargs) -> Deck:
     return deck
 
 
+def update_deck_scheduling(deck_id: int, **changes) -> Deck:
+    """
+    Change a deck's scheduling parameters and reschedule its cards.
+
+    Rescheduling runs in the background. Changing the effective algorithm
+    rebuilds every card from its review history; changing the retention or
+    maximum interval only moves intervals.
+
+    Args:
+        deck_id: The ID of the deck to update
+        **changes: algorithm ("FSRS", "SM2" or None for the global setting),
+            request_retention and/or maximum_interval
+
+    Returns:
+        Updated Deck object
+    """
+    from scheduler.algorithms import ALGORITHMS, deck_algorithm
+    from scheduler.reschedule import queue_reschedule
+
+    deck = get_deck_by_id(deck_id)
+    if not deck:
+        raise ValueError(f"Deck not found: {deck_id}")
+
+    unknown = set(changes) - {"algorithm", "request_retention", "maximum_interval"}
+    if unknown:
+        raise ValueError(f"Unknown scheduling parameters: {', '.join(unknown)}")
+    algorithm = changes.get("algorithm")
+    if algorithm and algorithm.lower() not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    previous = deck_algorithm(deck)
+    changed = [key for key, value in changes.items() if getattr(deck, key) != value]
+    for key in changed:
+        setattr(deck, key, changes[key])
+    db.session.commit()
+
+    if previous != deck_algorithm(deck):
+        queue_reschedule([deck.id], replay=True)
+    elif "request_retention" in changed or "maximum_interval" in changed:
+        queue_reschedule([deck.id])
+
+    return deck
+
+
+def set_default_algorithm(algorithm: str) -> None:
+    """
+    Change the global scheduling algorithm.
+
+    Decks without an algorithm of their own are rescheduled in the
+    background from their review history.
+
+    Args:
+        algorithm: "FSRS" or "SM2"
+    """
+    from scheduler.algorithms import ALGORITHMS
+    from scheduler.reschedule import queue_reschedule
+
+    if algorithm.lower() not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if (settings.algorithm or "").lower() == algorithm.lower():
+        return
+
+    settings.algorithm = algorithm
+    following = db.session.query(Deck.id).filter(Deck.algorithm.is_(None))
+    queue_reschedule([deck_id for (deck_id,) in following], replay=True)
+
+
 def get_all_decks() -> List[Deck]:
     """
     Get all decks.
@@ -226,3 +329,53 @@ def create_card(file_path, deck_id, copy=True):
     db.session.commit()
 
     return card
+
+
+def get_card_page(deck_id: int, after_id: Optional[int] = None, limit: int = 200):
+    """
+    Get one page of a deck's cards in ID order.
+
+    Pages are read with a keyset on the card ID, so every page costs the
+    same however deep into the deck it is.
+
+    Args:
+        deck_id: The ID of the deck to query
+        after_id: ID of the last card of the previous page (None for the first)
+        limit: Maximum number of cards to return
+
+    Returns:
+        List of (id, path, created_at) tuples
+    """
+    query = db.session.query(Card.id, Card.path, Card.created_at).filter(
+        Card.deck_id == deck_id
+    )
+    if after_id is not None:
+        query = query.filter(Card.id > after_id)
+    return [tuple(row) for row in query.order_by(Card.id).limit(limit)]
+
+
+def delete_card(card_id: int) -> bool:
+    """
+    Delete a card.
+
+    Args:
+        card_id: The ID of the card to delete
+
+    Returns:
+        True if the card existed and was deleted
+    """
+    card = db.session.get(Card, card_id)
+    if card is None:
+        return False
+    try:
+        # Reviews, sections and key ideas cascade; messages only hold the ID
+        db.session.query(Message).filter(Message.card_id == card_id).delete(
+            synchronize_session=False
+        )
+        db.session.delete(card)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return True
+
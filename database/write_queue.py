@@ -0,0 +1,179 @@
+import atexit
+import queue
+import sys
+import threading
+import time
+import traceback
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from .database import db
+
+
+class WriteQueue:
+    """
+    Write-behind queue that commits batched inserts and updates on a background thread.
+
+    Callers enqueue writes and return immediately; the worker thread groups
+    them into one transaction per batch so the interactive path never waits
+    on a commit.
+    """
+
+    def __init__(self, batch_size: int = 200, flush_interval: float = 2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        # (kind, target, values, error) of writes that failed on their own
+        self.failed = []
+
+    def insert(self, entity, values: dict):
+        """Queue an insert of one row."""
+        self._put(("insert", entity, values))
+
+    def update(self, entity, values: dict):
+        """Queue an update of one row; values must include the primary key."""
+        self._put(("update", entity, values))
+
+    def execute(self, fn):
+        """Queue a callable that receives the writer's session."""
+        self._put(("execute", fn, None))
+
+    def add_listener(self, callback):
+        """Register a callback run on the writer thread with each committed batch."""
+        self._listeners.append(callback)
+
+    def flush(self, timeout=None) -> bool:
+        """Block until everything queued so far has been committed."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", done, None))
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush pending writes and stop the worker thread."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(("stop", None, None))
+        self._thread.join()
+        self._thread = None
+
+    def _put(self, item):
+        self._ensure_started()
+        self._queue.put(item)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="write-queue", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        session = Session(bind=db.engine)
+        running = True
+
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            # Collect until the batch is full, the interval elapses or a
+            # flush/stop request arrives
+            while (
+                batch[-1][0] not in ("flush", "stop") and len(batch) < self.batch_size
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            writes = [item for item in batch if item[0] not in ("flush", "stop")]
+            if writes:
+                self._write(session, writes)
+
+            for kind, target, _ in batch:
+                if kind == "flush":
+                    target.set()
+                elif kind == "stop":
+                    running = False
+
+        session.close()
+
+    def _write(self, session, writes):
+        try:
+            self._commit(session, writes)
+            committed = writes
+        except Exception as e:
+            session.rollback()
+            print(
+                f"Write queue error, retrying {len(writes)} writes one by one: {e}",
+                file=sys.stderr,
+            )
+            committed = self._write_each(session, writes)
+
+        if not committed:
+            return
+        for callback in self._listeners:
+            try:
+                callback(committed)
+            except Exception as e:
+                print(f"Write queue listener error: {e}", file=sys.stderr)
+
+    def _write_each(self, session, writes) -> list:
+        """
+        Commit writes in their own transactions after their batch failed.
+
+        Returns:
+            The writes that were committed; the others are kept in `failed`
+        """
+        committed = []
+        for item in writes:
+            try:
+                self._commit(session, [item])
+                committed.append(item)
+            except Exception as e:
+                session.rollback()
+                self.failed.append(item + (e,))
+                name = getattr(item[1], "__name__", item[1])
+                print(
+                    f"Write queue error: {item[0]} of {name} failed and was not "
+                    f"written: {item[2]}",
+                    file=sys.stderr,
+                )
+                traceback.print_exc()
+        return committed
+
+    def _commit(self, session, writes):
+        # Consecutive writes of the same kind and entity share one executemany
+        group = []
+        for item in writes + [(None, None, None)]:
+            if group and (item[0], item[1]) != (group[0][0], group[0][1]):
+                self._execute_group(session, group)
+                group = []
+            if item[0] is not None:
+                group.append(item)
+        session.commit()
+
+    def _execute_group(self, session, group):
+        kind, target = group[0][0], group[0][1]
+        if kind == "execute":
+            for _, fn, _ in group:
+                fn(session)
+        elif kind == "insert":
+            session.execute(insert(target), [values for _, _, values in group])
+        elif kind == "update":
+            session.execute(update(target), [values for _, _, values in group])
+
+
+# Global write queue
+write_queue = WriteQueue()
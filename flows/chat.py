@@ -1,16 +1,27 @@
+import asyncio
 import json
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from openai import AsyncOpenAI
+from sqlalchemy.orm.attributes import set_committed_value
 
 from database.database import db
+from database.due_queue import due_queue
 from database.file_store import load_file
-from database.models import Card
+from database.models import Card, CardSection, Deck, KeyIdea, Review
+from database.write_queue import write_queue
+from scheduler import card_scheduler, retrievability, review_fsrs, scheduler_for_deck
+from scheduler.fsrs_scheduler import to_naive_utc
 from settings.settings import settings
 
+from .preprocess import normalize_content, report_token_savings
 from .prompts import JUDGE_ANSWER_PROMPT, KEY_IDEAS_PROMPT
 from .schemas import JUDGE_ANSWER_SCHEMA, KEY_IDEAS_SCHEMA
+from .sections import split_sections
+from .transcript import log_call
+
+MODEL = "gpt-5-mini"
 
 
 def get_card_from_deck(deck_id):
@@ -18,52 +29,70 @@ def get_card_from_deck(deck_id):
     now = datetime.now(timezone.utc)
     twenty_four_hours_later = now + timedelta(hours=24)
 
-    # Query cards that are due within the next 24 hours, ordered by due time (soonest first)
-    card = (
-        db.session.query(Card)
-        .filter(Card.deck_id == deck_id, Card.due <= twenty_four_hours_later)
-        .order_by(Card.due)
-        .first()
-    )
+    # Take the soonest due card from the deck's in-memory due queue
+    card_id = due_queue.next_card(deck_id, before=to_naive_utc(twenty_four_hours_later))
 
-    if not card:
+    if card_id is None:
         raise ValueError(
             f"No cards found in deck {deck_id} that are due within the next 24 hours"
         )
 
-    return card.id
-
+    return card_id
 
-async def run_card(card_id, worker):
-    # Get card from database
-    card = db.session.query(Card).filter(Card.id == card_id).first()
-    if not card:
-        raise ValueError(f"Card not found: {card_id}")
 
+def load_card_content(card):
+    """Read the raw file content behind a card."""
     # Load file content using load_file
     if card.is_external:
         # External file - read directly from path
         try:
             with open(card.path, "r", encoding="utf-8") as f:
-                content = f.read()
+                return f.read()
         except Exception as e:
             raise IOError(f"Failed to read external file: {e}")
     else:
         # Internal file - use load_file with relative path
         relative_path = Path(card.path).name
-        content = load_file(relative_path, internal=True)
+        return load_file(relative_path, internal=True)
+
 
-    # Generate key ideas to get the topic
-    result = await generate_key_ideas(content)
+async def run_card(card_id, worker):
+    # Get card from database; background rescheduling may have moved it
+    card = db.session.query(Card).populate_existing().filter(Card.id == card_id).first()
+    if not card:
+        raise ValueError(f"Card not found: {card_id}")
+
+    content = load_card_content(card)
+
+    # Strip low-value markup before it reaches the prompt
+    normalized = normalize_content(content)
+    report_token_savings(card_id, normalized)
+
+    # Generate key ideas to get the topic, reusing unchanged sections
+    result = await get_key_ideas(card_id, normalized["text"])
     topic = result.get("topic", "this topic")
 
-    key_ideas = [elem for elem in result.get("key_ideas", [])]
+    deck = db.session.query(Deck).filter(Deck.id == card.deck_id).first()
+    if not deck:
+        raise ValueError(f"Deck not found: {card.deck_id}")
+    scheduler = scheduler_for_deck(deck)
+
+    # Key ideas always use FSRS: selection needs a retrievability estimate
+    # Quiz only the ideas whose recall has dropped below the deck's target
+    idea_rows = sync_key_ideas(card_id, result.get("key_ideas", []))
+    quizzed = select_key_ideas(idea_rows, scheduler, deck.request_retention)
+    key_ideas = [
+        {"title": row.title, "description": row.description} for row in quizzed
+    ]
+    answered_on = {}
 
     # Clear previous messages and add the final topic question
     worker.clear_chat.emit()
     worker.message_ready.emit(f"Tell me what you remember about: {topic}", False)
     worker.scroll_to_bottom.emit()
 
+    started = time.perf_counter()
+
     # Loop until all key ideas are covered or max attempts reached
     max_attempts = 5
     attempt = 0
@@ -77,8 +106,10 @@ async def run_card(card_id, worker):
         print(user_response)
 
         # Judge the answer against remaining key ideas
-        result = await judge_answer(user_response, remaining_key_ideas)
+        result = await judge_answer(user_response, remaining_key_ideas, card_id)
         understood_titles = result.get("key_ideas_answered", [])
+        for title in understood_titles:
+            answered_on.setdefault(title, attempt)
 
         print(understood_titles)
 
@@ -125,20 +156,165 @@ async def run_card(card_id, worker):
 
     worker.scroll_to_bottom.emit()
 
+    # Queue the scheduling updates; nothing here waits on a commit
+    review_key_ideas(quizzed, answered_on, scheduler)
+    rating = rating_for_session(len(quizzed), answered_on)
+    response_ms = int((time.perf_counter() - started) * 1000)
+    record_review(card, rating, card_scheduler(deck), response_ms)
+
     return content
 
 
-async def judge_answer(user_response, key_ideas):
+def sync_key_ideas(card_id, key_ideas) -> list:
+    """
+    Make a card's KeyIdea rows match its extracted key ideas.
+
+    Ideas are matched by title so their scheduling state survives
+    re-extraction; ideas no longer extracted are removed.
+
+    Args:
+        card_id: ID of the card
+        key_ideas: Key idea dictionaries from get_key_ideas
+
+    Returns:
+        List of KeyIdea rows in extraction order
+    """
+    existing = {
+        row.title: row
+        for row in db.session.query(KeyIdea).filter(KeyIdea.card_id == card_id)
+    }
+
+    rows = []
+    for idea in key_ideas:
+        row = existing.pop(idea["title"], None)
+        if row is None:
+            row = KeyIdea(card_id=card_id, title=idea["title"])
+            db.session.add(row)
+        row.description = idea["description"]
+        row.section = idea.get("section")
+        rows.append(row)
+
+    for row in existing.values():
+        db.session.delete(row)
+
+    db.session.commit()
+    return rows
+
+
+def select_key_ideas(rows, scheduler, target_retention) -> list:
+    """
+    Pick the key ideas worth quizzing.
+
+    New ideas and ideas whose retrievability fell below the target are
+    selected. If every idea is still well remembered, the weakest one is
+    quizzed so the session is never empty.
+    """
+    now = datetime.now(timezone.utc)
+    recall = {
+        row.id: retrievability(scheduler, row, row.last_review, now) for row in rows
+    }
+
+    selected = [
+        row for row in rows if row.state == 0 or recall[row.id] < target_retention
+    ]
+    if not selected and rows:
+        selected = [min(rows, key=lambda row: recall[row.id])]
+
+    print(f"Quizzing {len(selected)} of {len(rows)} key ideas")
+    return selected
+
+
+def rating_for_attempt(attempt) -> int:
+    """Map the attempt an idea was recalled on to a rating (0=Again .. 3=Easy)."""
+    if attempt is None:
+        return 0  # Again: never recalled
+    if attempt == 1:
+        return 2  # Good: recalled unprompted
+    return 1  # Hard: recalled after being prompted
+
+
+def review_key_ideas(rows, answered_on, scheduler):
+    """Queue each quizzed idea's FSRS update from the judge verdicts."""
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        rating = rating_for_attempt(answered_on.get(row.title))
+        values = review_fsrs(scheduler, row, rating, row.last_review, now)
+        del values["scheduled_days"], values["elapsed_days"]
+        values["reps"] = (row.reps or 0) + 1
+        values["lapses"] = (row.lapses or 0) + (1 if rating == 0 else 0)
+
+        write_queue.update(KeyIdea, {"id": row.id, **values})
+        apply_committed(row, values)
+
+
+def rating_for_session(quizzed_count, answered_on) -> int:
+    """Map how much of a card was recalled to a rating (0=Again .. 3=Easy)."""
+    if not quizzed_count:
+        return 2
+    recalled = len(answered_on) / quizzed_count
+    if recalled < 0.5:
+        return 0  # Again: most ideas forgotten
+    if recalled < 1:
+        return 1  # Hard: some ideas never recalled
+    if all(attempt == 1 for attempt in answered_on.values()):
+        return 3  # Easy: everything recalled in the first answer
+    return 2  # Good: everything recalled with prompting
+
+
+def record_review(card, rating, scheduler, response_ms=None):
+    """
+    Reschedule a card and record the review through the write queue.
+
+    Args:
+        card: Card that was studied
+        rating: 0=Again, 1=Hard, 2=Good, 3=Easy
+        scheduler: Card scheduler selected for the card's deck
+        response_ms: Duration of the study session
+    """
+    now = datetime.now(timezone.utc)
+    values = scheduler.review(card, rating, card.last_review, now)
+    last_review = values.pop("last_review")
+    difficulty = scheduler.difficulty_column
+
+    write_queue.insert(
+        Review,
+        {
+            "card_id": card.id,
+            "reviewed_at": last_review,
+            "rating": rating,
+            "response_ms": response_ms,
+            "state_before": card.state,
+            "state_after": values["state"],
+            "scheduled_days_before": card.scheduled_days,
+            "scheduled_days_after": values["scheduled_days"],
+            "elapsed_days": values["elapsed_days"],
+            "stability_before": card.stability if "stability" in values else None,
+            "stability_after": values.get("stability"),
+            "difficulty_before": getattr(card, difficulty),
+            "difficulty_after": values[difficulty],
+            "algorithm": scheduler.name,
+        },
+    )
+    write_queue.update(Card, {"id": card.id, **values})
+    apply_committed(card, values)
+    due_queue.update(card.id, values["due"])
+
+
+def apply_committed(obj, values):
+    """Mirror queued column values onto a loaded object without dirtying it."""
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+
+
+async def judge_answer(user_response, key_ideas, card_id=None):
     """
     Judge the user's answer against the study material.
 
     Args:
         user_response: The user's response to the topic question
         key_ideas: List of key ideas dictionaries with 'title' and 'description'
+        card_id: Card being studied, recorded with the call log (optional)
     """
-    if not settings.openai_api_key:
-        raise ValueError("OpenAI API key is required. Set it in settings.")
-
     # Extract key idea titles for the schema enum
     key_idea_titles = [idea["title"] for idea in key_ideas]
 
@@ -151,29 +327,14 @@ async def judge_answer(user_response, key_ideas):
     judge_schema = JUDGE_ANSWER_SCHEMA.copy()
     judge_schema["properties"]["key_ideas_answered"]["items"]["enum"] = key_idea_titles
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-
-    response = await client.chat.completions.create(
-        model="gpt-5-mini",
-        messages=[
-            {
-                "role": "user",
-                "content": JUDGE_ANSWER_PROMPT.format(
-                    answer=user_response, key_ideas=key_ideas_text
-                ),
-            }
-        ],
-        response_format={
-            "type": "json_schema",
-            "json_schema": {
-                "name": "judge_answer_evaluation",
-                "schema": judge_schema,
-            },
-        },
+    content = await complete_json(
+        "judge",
+        JUDGE_ANSWER_PROMPT.format(answer=user_response, key_ideas=key_ideas_text),
+        "judge_answer_evaluation",
+        judge_schema,
+        card_id=card_id,
     )
 
-    content = response.choices[0].message.content
-
     print(content)
 
     if not content:
@@ -183,31 +344,178 @@ async def judge_answer(user_response, key_ideas):
     return result
 
 
-async def generate_key_ideas(markdown_text):
-    if not settings.openai_api_key:
-        raise ValueError("OpenAI API key is required. Set it in settings.")
+async def generate_key_ideas(markdown_text, card_id=None):
+    content = await complete_json(
+        "key_ideas",
+        KEY_IDEAS_PROMPT.format(text=markdown_text),
+        "key_ideas_extraction",
+        KEY_IDEAS_SCHEMA,
+        card_id=card_id,
+    )
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    if not content:
+        return {"topic": "", "key_ideas": []}
+    result = json.loads(content)
+    return result
 
-    response = await client.chat.completions.create(
-        model="gpt-5-mini",
-        messages=[
-            {"role": "user", "content": KEY_IDEAS_PROMPT.format(text=markdown_text)}
-        ],
-        response_format={
+
+def build_request_body(prompt, schema_name, schema):
+    """Build the chat completions request body for a structured-output call."""
+    return {
+        "model": MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {
             "type": "json_schema",
             "json_schema": {
-                "name": "key_ideas_extraction",
-                "schema": KEY_IDEAS_SCHEMA,
+                "name": schema_name,
+                "schema": schema,
             },
         },
+    }
+
+
+def build_key_ideas_request(markdown_text):
+    """Build the request body for extracting key ideas from one section."""
+    return build_request_body(
+        KEY_IDEAS_PROMPT.format(text=markdown_text),
+        "key_ideas_extraction",
+        KEY_IDEAS_SCHEMA,
+    )
+
+
+async def complete_json(kind, prompt, schema_name, schema, card_id=None):
+    """
+    Run a structured-output completion and log it to the transcript.
+
+    Args:
+        kind: Call type recorded in the log ("key_ideas", "judge", etc.)
+        prompt: User prompt text
+        schema_name: Name of the JSON schema
+        schema: JSON schema the response must follow
+        card_id: Card the call is made for (optional)
+
+    Returns:
+        Raw response content string
+    """
+    # The SDK is slow to import; load it with the first call
+    from openai import AsyncOpenAI
+
+    if not settings.openai_api_key:
+        raise ValueError("OpenAI API key is required. Set it in settings.")
+
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+
+    started = time.perf_counter()
+    response = await client.chat.completions.create(
+        **build_request_body(prompt, schema_name, schema)
     )
+    latency_ms = int((time.perf_counter() - started) * 1000)
 
     content = response.choices[0].message.content
-    if not content:
-        return {"topic": "", "key_ideas": []}
-    result = json.loads(content)
-    return result
+    log_call(
+        kind,
+        prompt,
+        content,
+        card_id=card_id,
+        model=MODEL,
+        latency_ms=latency_ms,
+        usage=response.usage,
+    )
+    return content
+
+
+async def get_key_ideas(card_id, markdown_text):
+    """
+    Get the key ideas for a card, re-extracting only the sections that changed.
+
+    Args:
+        card_id: ID of the card the text belongs to
+        markdown_text: Normalized markdown content of the card
+
+    Returns:
+        Dictionary with 'topic' and 'key_ideas', each idea tagged with its section
+    """
+    sections = split_sections(markdown_text)
+    cached = get_cached_sections(card_id)
+
+    # Extract all changed sections concurrently
+    stale = get_stale_sections(sections, cached)
+    results = await asyncio.gather(
+        *(generate_key_ideas(s["text"], card_id) for s in stale)
+    )
+    extracted = {s["hash"]: result for s, result in zip(stale, results)}
+
+    print(f"Card {card_id}: extracted {len(stale)} of {len(sections)} sections")
+
+    return save_sections(card_id, sections, cached, extracted)
+
+
+def get_cached_sections(card_id) -> dict:
+    """Get a card's cached sections keyed by content hash."""
+    return {
+        row.content_hash: row
+        for row in db.session.query(CardSection).filter(CardSection.card_id == card_id)
+    }
+
+
+def get_stale_sections(sections, cached) -> list:
+    """Get the unique sections whose hash has no cached extraction."""
+    return list({s["hash"]: s for s in sections if s["hash"] not in cached}.values())
+
+
+def save_sections(card_id, sections, cached, extracted):
+    """
+    Store newly extracted sections and merge them with the cached ones.
+
+    Args:
+        card_id: ID of the card
+        sections: Current sections of the card from split_sections
+        cached: Cached section rows keyed by hash, from get_cached_sections
+        extracted: Extraction results keyed by section hash
+
+    Returns:
+        Dictionary with 'topic' and 'key_ideas' over the sections available
+    """
+    # Drop sections that no longer exist and store the new ones
+    current_hashes = {s["hash"] for s in sections}
+    for content_hash, row in list(cached.items()):
+        if content_hash not in current_hashes:
+            db.session.delete(row)
+            del cached[content_hash]
+
+    for position, section in enumerate(sections):
+        row = cached.get(section["hash"])
+        if row is None:
+            result = extracted.get(section["hash"])
+            if result is None:
+                continue
+            row = CardSection(
+                card_id=card_id,
+                content_hash=section["hash"],
+                topic=result.get("topic", ""),
+                key_ideas=json.dumps(result.get("key_ideas", [])),
+            )
+            db.session.add(row)
+            cached[section["hash"]] = row
+        row.position = position
+        row.heading = section["heading"]
+
+    db.session.commit()
+
+    # Merge ideas in document order, skipping titles already seen
+    rows = [cached[s["hash"]] for s in sections if s["hash"] in cached]
+    key_ideas = []
+    seen_titles = set()
+    for row in rows:
+        for idea in json.loads(row.key_ideas or "[]"):
+            if idea["title"] in seen_titles:
+                continue
+            seen_titles.add(idea["title"])
+            key_ideas.append({**idea, "section": row.heading})
+
+    topic = next((row.topic for row in rows if row.topic), "")
+
+    return {"topic": topic, "key_ideas": key_ideas}
 
 
 async def process_study_card(deck_id, worker):
@@ -0,0 +1,347 @@
+"""
+Headless precompute of key ideas across whole decks.
+
+Usage:
+    python -m flows.precompute --deck 3 [--deck 4] [--concurrency 4]
+    python -m flows.precompute --deck 3 --emit-batch requests.jsonl
+    python -m flows.precompute --run-batch requests.jsonl results.jsonl
+    python -m flows.precompute --ingest-batch results.jsonl
+
+Batch files use the provider's batch-job JSONL format, so the emitted
+requests can be uploaded as a batch job and its output ingested later.
+--run-batch is a local stand-in for the batch service that executes the
+requests directly.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from database.database import db
+from database.models import Card, Deck
+from database.utilities import DATA_DIR
+from database.write_queue import write_queue
+from settings.settings import settings
+
+from .chat import (
+    build_key_ideas_request,
+    get_cached_sections,
+    get_key_ideas,
+    get_stale_sections,
+    load_card_content,
+    save_sections,
+)
+from .preprocess import normalize_content
+from .prompts import KEY_IDEAS_PROMPT
+from .sections import split_sections
+from .transcript import log_call
+
+CHECKPOINT_DIR = DATA_DIR + "/data/precompute"
+
+
+def load_checkpoint(deck_id) -> dict:
+    """Load the resumable checkpoint for a deck."""
+    path = Path(CHECKPOINT_DIR) / f"deck_{deck_id}.json"
+    if path.exists():
+        try:
+            return json.loads(path.read_text())
+        except (json.JSONDecodeError, IOError):
+            pass
+    return {"done": [], "failed": {}}
+
+
+def save_checkpoint(deck_id, checkpoint):
+    """Atomically write the checkpoint for a deck."""
+    path = Path(CHECKPOINT_DIR) / f"deck_{deck_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint))
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(deck_id):
+    path = Path(CHECKPOINT_DIR) / f"deck_{deck_id}.json"
+    if path.exists():
+        path.unlink()
+
+
+def get_deck_cards(deck_id) -> list:
+    """Get the IDs of all cards in a deck."""
+    return [
+        card_id
+        for (card_id,) in db.session.query(Card.id)
+        .filter(Card.deck_id == deck_id)
+        .order_by(Card.id)
+    ]
+
+
+def plan_card(card_id) -> dict:
+    """
+    Work out which sections of a card still need extraction.
+
+    Returns:
+        Dictionary with the card's sections, cached rows and stale sections
+    """
+    card = db.session.query(Card).filter(Card.id == card_id).first()
+    if not card:
+        raise ValueError(f"Card not found: {card_id}")
+
+    normalized = normalize_content(load_card_content(card))
+    sections = split_sections(normalized["text"])
+    cached = get_cached_sections(card_id)
+
+    return {
+        "text": normalized["text"],
+        "sections": sections,
+        "cached": cached,
+        "stale": get_stale_sections(sections, cached),
+    }
+
+
+async def precompute_deck(deck_id, concurrency=4, restart=False) -> dict:
+    """
+    Warm the key idea cache for every card in a deck.
+
+    Args:
+        deck_id: ID of the deck to precompute
+        concurrency: Maximum number of cards extracted at once
+        restart: Ignore an existing checkpoint
+
+    Returns:
+        Summary dictionary with counts and elapsed time
+    """
+    checkpoint = {"done": [], "failed": {}} if restart else load_checkpoint(deck_id)
+    done = set(checkpoint["done"])
+    card_ids = get_deck_cards(deck_id)
+
+    summary = {"cards": len(card_ids), "fresh": 0, "extracted": 0, "failed": 0}
+    summary["resumed"] = len(done & set(card_ids))
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    finished = 0
+
+    async def process(card_id):
+        nonlocal finished
+        async with semaphore:
+            try:
+                plan = plan_card(card_id)
+                if not plan["stale"]:
+                    summary["fresh"] += 1
+                    status = "fresh"
+                else:
+                    await get_key_ideas(card_id, plan["text"])
+                    summary["extracted"] += 1
+                    status = f"extracted {len(plan['stale'])} sections"
+                checkpoint["failed"].pop(str(card_id), None)
+                checkpoint["done"].append(card_id)
+            except Exception as e:
+                summary["failed"] += 1
+                checkpoint["failed"][str(card_id)] = str(e)
+                status = f"failed: {e}"
+
+            save_checkpoint(deck_id, checkpoint)
+            finished += 1
+            print(f"[{finished}/{len(pending)}] card {card_id}: {status}")
+
+    pending = [card_id for card_id in card_ids if card_id not in done]
+    await asyncio.gather(*(process(card_id) for card_id in pending))
+
+    if not checkpoint["failed"]:
+        clear_checkpoint(deck_id)
+
+    summary["elapsed_s"] = round(time.perf_counter() - started, 1)
+    return summary
+
+
+def emit_batch(deck_ids, output_path) -> int:
+    """
+    Write batch-job requests for every stale section in the given decks.
+
+    Returns:
+        Number of requests written
+    """
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for deck_id in deck_ids:
+            for card_id in get_deck_cards(deck_id):
+                try:
+                    plan = plan_card(card_id)
+                except Exception as e:
+                    print(f"card {card_id}: skipped ({e})")
+                    continue
+                for section in plan["stale"]:
+                    request = {
+                        "custom_id": f"card-{card_id}-{section['hash']}",
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": build_key_ideas_request(section["text"]),
+                    }
+                    f.write(json.dumps(request) + "\n")
+                    count += 1
+    return count
+
+
+async def run_batch(input_path, output_path, concurrency=4) -> int:
+    """
+    Local stand-in for the batch service: execute a batch request file.
+
+    Returns:
+        Number of requests executed
+    """
+    from openai import AsyncOpenAI
+
+    if not settings.openai_api_key:
+        raise ValueError("OpenAI API key is required. Set it in settings.")
+
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with open(input_path, "r", encoding="utf-8") as f:
+        requests = [json.loads(line) for line in f if line.strip()]
+
+    async def execute(index, request):
+        async with semaphore:
+            try:
+                response = await client.chat.completions.create(**request["body"])
+                return {
+                    "id": f"batch_req_{index}",
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": response.model_dump()},
+                    "error": None,
+                }
+            except Exception as e:
+                return {
+                    "id": f"batch_req_{index}",
+                    "custom_id": request["custom_id"],
+                    "response": None,
+                    "error": {"code": type(e).__name__, "message": str(e)},
+                }
+
+    results = await asyncio.gather(
+        *(execute(i, request) for i, request in enumerate(requests))
+    )
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+
+    return len(results)
+
+
+def ingest_batch(input_path) -> dict:
+    """
+    Store the results of a batch job in the section cache.
+
+    Results for sections that changed since the batch was emitted are ignored.
+
+    Returns:
+        Summary dictionary with counts
+    """
+    by_card = {}
+    summary = {"results": 0, "errors": 0, "stored": 0, "outdated": 0}
+
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            summary["results"] += 1
+
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                summary["errors"] += 1
+                continue
+
+            _, card_id, section_hash = result["custom_id"].split("-", 2)
+            by_card.setdefault(int(card_id), {})[section_hash] = response["body"]
+
+    for card_id, bodies in by_card.items():
+        try:
+            plan = plan_card(card_id)
+        except Exception as e:
+            print(f"card {card_id}: skipped ({e})")
+            continue
+
+        stale = {section["hash"]: section for section in plan["stale"]}
+        extracted = {}
+        for section_hash, body in bodies.items():
+            section = stale.get(section_hash)
+            if section is None:
+                summary["outdated"] += 1
+                continue
+
+            content = body["choices"][0]["message"]["content"]
+            extracted[section_hash] = (
+                json.loads(content) if content else {"topic": "", "key_ideas": []}
+            )
+            log_call(
+                "key_ideas",
+                KEY_IDEAS_PROMPT.format(text=section["text"]),
+                content,
+                card_id=card_id,
+                model=body.get("model"),
+                usage=SimpleNamespace(**(body.get("usage") or {})),
+            )
+
+        save_sections(card_id, plan["sections"], plan["cached"], extracted)
+        summary["stored"] += len(extracted)
+
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m flows.precompute",
+        description="Precompute key ideas for whole decks without the UI.",
+    )
+    parser.add_argument(
+        "--deck", type=int, action="append", help="Deck ID (repeatable, default all)"
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore existing checkpoints"
+    )
+    parser.add_argument("--emit-batch", metavar="FILE")
+    parser.add_argument("--run-batch", nargs=2, metavar=("REQUESTS", "RESULTS"))
+    parser.add_argument("--ingest-batch", metavar="FILE")
+    args = parser.parse_args(argv)
+
+    deck_ids = args.deck or [deck_id for (deck_id,) in db.session.query(Deck.id)]
+
+    try:
+        if args.emit_batch:
+            count = emit_batch(deck_ids, args.emit_batch)
+            print(f"Wrote {count} requests to {args.emit_batch}")
+        elif args.run_batch:
+            count = asyncio.run(run_batch(*args.run_batch, args.concurrency))
+            print(f"Executed {count} requests into {args.run_batch[1]}")
+        elif args.ingest_batch:
+            summary = ingest_batch(args.ingest_batch)
+            print(
+                f"Ingested {summary['stored']} sections from {summary['results']} "
+                f"results ({summary['errors']} errors, {summary['outdated']} outdated)"
+            )
+        else:
+            for deck_id in deck_ids:
+                summary = asyncio.run(
+                    precompute_deck(deck_id, args.concurrency, args.restart)
+                )
+                print(
+                    f"Deck {deck_id}: {summary['cards']} cards, "
+                    f"{summary['fresh']} fresh, {summary['extracted']} extracted, "
+                    f"{summary['failed']} failed, {summary['resumed']} resumed "
+                    f"from checkpoint in {summary['elapsed_s']}s"
+                )
+    finally:
+        write_queue.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import hashlib
+import re
+from collections import OrderedDict
+
+from settings.settings import settings
+
+# Rough characters-per-token ratio for English prose with the GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+# Number of normalized documents kept in memory
+CACHE_SIZE = 256
+
+FRONT_MATTER_RE = re.compile(
+    r"\A(?:---|\+\+\+)[ \t]*\n.*?\n(?:---|\+\+\+|\.\.\.)[ \t]*(?:\n|\Z)", re.S
+)
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+LINK_RE = re.compile(r"(?<!!)\[([^\]]+)\]\([^)]*\)")
+LINK_DEFINITION_RE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s+\S+.*$")
+HTML_TAG_RE = re.compile(r"</?(?:br|hr|img|div|span|p|sup|sub|small)\b[^>]*>", re.I)
+FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+TABLE_ROW_RE = re.compile(r"^\s*\|.*\|\s*$")
+TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-{3,}")
+
+_cache = OrderedDict()
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of prompt tokens a piece of text will cost."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def content_hash(text: str) -> str:
+    """Hash text content for cache lookups."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _truncate_code_block(lines, max_lines):
+    """Keep the opening fence, the first lines of the body and the closing fence."""
+    opening, body, closing = lines[0], lines[1:-1], lines[-1:]
+    if len(body) <= max_lines:
+        return lines
+    omitted = len(body) - max_lines
+    return [opening, *body[:max_lines], f"... ({omitted} more lines)", *closing]
+
+
+def _truncate_table(lines, max_rows):
+    """Keep the header, separator and the first rows of a table."""
+    rows = [re.sub(r"\s*\|\s*", " | ", line.strip()).strip() for line in lines]
+    rows = [re.sub(r"-{3,}", "---", row) for row in rows]
+    header = (
+        rows[:2] if len(rows) > 1 and TABLE_SEPARATOR_RE.match(rows[1]) else rows[:1]
+    )
+    body = rows[len(header) :]
+    if len(body) <= max_rows:
+        return header + body
+    omitted = len(body) - max_rows
+    return header + body[:max_rows] + [f"... ({omitted} more rows)"]
+
+
+def _clean_prose(line):
+    """Strip low-value inline markup from a line outside code blocks."""
+    line = IMAGE_RE.sub(
+        lambda m: f"[image: {m.group(1)}]" if m.group(1).strip() else "", line
+    )
+    line = LINK_RE.sub(r"\1", line)
+    line = HTML_TAG_RE.sub(" ", line)
+    # Collapse runs of whitespace but keep list indentation
+    indent = re.match(r"\s*", line).group(0)
+    return indent + re.sub(r"[ \t]+", " ", line[len(indent) :]).rstrip()
+
+
+def normalize_markdown(text, max_code_lines=None, max_table_rows=None) -> str:
+    """
+    Strip or summarize low-value spans of a markdown document.
+
+    Args:
+        text: Raw markdown text
+        max_code_lines: Lines kept per fenced code block (defaults to settings)
+        max_table_rows: Rows kept per table (defaults to settings)
+
+    Returns:
+        Normalized markdown text
+    """
+    if max_code_lines is None:
+        max_code_lines = settings.max_code_block_lines
+    if max_table_rows is None:
+        max_table_rows = settings.max_table_rows
+
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = FRONT_MATTER_RE.sub("", text)
+    text = HTML_COMMENT_RE.sub("", text)
+
+    output = []
+    lines = text.split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        # Fenced code block: copy verbatim up to the limit
+        fence = FENCE_RE.match(line)
+        if fence:
+            marker = fence.group(1)
+            block = [line.rstrip()]
+            i += 1
+            while i < len(lines):
+                block.append(lines[i].rstrip())
+                if lines[i].strip().startswith(marker):
+                    break
+                i += 1
+            output.extend(_truncate_code_block(block, max_code_lines))
+            i += 1
+            continue
+
+        # Table: gather consecutive rows
+        if TABLE_ROW_RE.match(line):
+            block = []
+            while i < len(lines) and TABLE_ROW_RE.match(lines[i]):
+                block.append(_clean_prose(lines[i]))
+                i += 1
+            output.extend(_truncate_table(block, max_table_rows))
+            continue
+
+        if not LINK_DEFINITION_RE.match(line):
+            output.append(_clean_prose(line))
+        i += 1
+
+    normalized = "\n".join(output)
+    # At most one blank line between blocks
+    normalized = re.sub(r"\n{3,}", "\n\n", normalized)
+    return normalized.strip() + "\n"
+
+
+def normalize_content(text: str) -> dict:
+    """
+    Normalize a document, caching the result by content hash.
+
+    Args:
+        text: Raw markdown text
+
+    Returns:
+        Dictionary with the normalized text, its source hash and token estimates
+    """
+    rules = (settings.max_code_block_lines, settings.max_table_rows)
+    key = (content_hash(text), rules)
+
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    normalized = normalize_markdown(text, *rules)
+    result = {
+        "text": normalized,
+        "hash": key[0],
+        "original_tokens": estimate_tokens(text),
+        "tokens": estimate_tokens(normalized),
+    }
+
+    _cache[key] = result
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+    return result
+
+
+def report_token_savings(card_id, normalized: dict) -> dict:
+    """Report how many prompt tokens normalization saved for a card."""
+    original = normalized["original_tokens"]
+    saved = original - normalized["tokens"]
+    percent = (saved / original * 100) if original else 0.0
+
+    print(
+        f"Card {card_id}: {original} -> {normalized['tokens']} prompt tokens "
+        f"({saved} saved, {percent:.1f}%)"
+    )
+    return {
+        "original_tokens": original,
+        "tokens": normalized["tokens"],
+        "saved_tokens": saved,
+        "saved_percent": round(percent, 1),
+    }
@@ -0,0 +1,59 @@
+import re
+
+from .preprocess import FENCE_RE, content_hash, estimate_tokens
+
+# Headings up to this level start a new section
+MAX_SECTION_LEVEL = 3
+
+# Sections smaller than this are folded into the preceding section, so a
+# typical note is extracted in one call and only long sections are cached
+# and re-extracted on their own
+MIN_SECTION_TOKENS = 1000
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+
+
+def split_sections(markdown_text: str) -> list:
+    """
+    Split a markdown document into heading sections.
+
+    Args:
+        markdown_text: Normalized markdown text
+
+    Returns:
+        List of dictionaries with 'heading', 'text' and 'hash' for each section
+    """
+    sections = []
+    heading = None
+    lines = []
+    in_code = False
+
+    for line in markdown_text.split("\n"):
+        if FENCE_RE.match(line):
+            in_code = not in_code
+
+        match = None if in_code else HEADING_RE.match(line)
+        if match and len(match.group(1)) <= MAX_SECTION_LEVEL:
+            if any(existing.strip() for existing in lines):
+                sections.append({"heading": heading, "text": "\n".join(lines)})
+            heading = match.group(2)
+            lines = []
+        lines.append(line)
+
+    if any(existing.strip() for existing in lines):
+        sections.append({"heading": heading, "text": "\n".join(lines)})
+
+    # Folding depends only on each section's own size, so editing one section
+    # does not move the boundaries of the others
+    merged = []
+    for section in sections:
+        if merged and estimate_tokens(section["text"]) < MIN_SECTION_TOKENS:
+            merged[-1]["text"] += "\n" + section["text"]
+        else:
+            merged.append(section)
+
+    for section in merged:
+        section["text"] = section["text"].strip() + "\n"
+        section["hash"] = content_hash(section["text"])
+
+    return merged
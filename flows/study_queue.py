@@ -0,0 +1,153 @@
+import heapq
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from sqlalchemy import case, func, tuple_
+
+from database.database import db
+from database.models import Card, Deck, Review
+
+from .chat import run_card
+
+# Cards fetched per deck and round trip
+PAGE_SIZE = 50
+
+
+def start_of_today():
+    """Start of the current UTC day as a naive timestamp."""
+    return datetime.now(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+    )
+
+
+def studied_today(deck_ids) -> dict:
+    """
+    Count today's reviews per deck, split into new and seen cards.
+
+    Returns:
+        Dictionary of deck_id -> {"new": count, "review": count}
+    """
+    rows = (
+        db.session.query(
+            Card.deck_id,
+            func.sum(case((Review.state_before == 0, 1), else_=0)),
+            func.sum(case((Review.state_before == 0, 0), else_=1)),
+        )
+        .join(Review, Review.card_id == Card.id)
+        .filter(Card.deck_id.in_(deck_ids), Review.reviewed_at >= start_of_today())
+        .group_by(Card.deck_id)
+    )
+    return {
+        deck_id: {"new": new or 0, "review": review or 0}
+        for deck_id, new, review in rows
+    }
+
+
+def deck_due_stream(deck_id, cutoff, new, page_size=PAGE_SIZE):
+    """
+    Stream a deck's due new or seen cards in due order.
+
+    Pages are read with a keyset on (due, id) over the (deck_id, due)
+    index, so no statement stays open between cards and only one page per
+    deck is held in memory.
+
+    Args:
+        deck_id: The ID of the deck
+        cutoff: Latest due time to include
+        new: Stream new cards (True) or seen cards (False)
+        page_size: Cards fetched per round trip
+
+    Yields:
+        Tuples of (due, card_id, deck_id)
+    """
+    last = None
+    while True:
+        query = db.session.query(Card.due, Card.id).filter(
+            Card.deck_id == deck_id,
+            Card.due <= cutoff,
+            Card.state == 0 if new else Card.state != 0,
+        )
+        if last is not None:
+            query = query.filter(tuple_(Card.due, Card.id) > last)
+        page = query.order_by(Card.due, Card.id).limit(page_size).all()
+
+        for due, card_id in page:
+            yield due, card_id, deck_id
+        if len(page) < page_size:
+            return
+        last = tuple(page[-1])
+
+
+def merge_due_cards(deck_ids=None, cutoff=None):
+    """
+    Interleave the due cards of several decks by due time.
+
+    Each deck contributes a stream of new and a stream of seen cards, cut
+    off at its daily allowances minus what was studied today; heapq.merge
+    keeps one pending card per stream.
+
+    Args:
+        deck_ids: Decks to study (default all)
+        cutoff: Latest due time to include (defaults to 24 hours from now)
+
+    Yields:
+        Tuples of (deck_id, card_id)
+    """
+    if cutoff is None:
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=24)
+
+    query = db.session.query(Deck)
+    if deck_ids is not None:
+        query = query.filter(Deck.id.in_(deck_ids))
+    decks = query.all()
+    done = studied_today([deck.id for deck in decks])
+
+    streams = []
+    for deck in decks:
+        studied = done.get(deck.id, {"new": 0, "review": 0})
+        new_limit = (deck.new_per_day or 0) - studied["new"]
+        review_limit = (deck.reviews_per_day or 0) - studied["review"]
+        if new_limit > 0:
+            streams.append(islice(deck_due_stream(deck.id, cutoff, True), new_limit))
+        if review_limit > 0:
+            streams.append(
+                islice(deck_due_stream(deck.id, cutoff, False), review_limit)
+            )
+
+    for _, card_id, deck_id in heapq.merge(*streams):
+        yield deck_id, card_id
+
+
+async def process_due_cards(worker, deck_ids=None):
+    """
+    Study every due card across decks, one card after another.
+
+    Args:
+        worker: Worker thread with signals to update UI
+        deck_ids: Decks to study (default all)
+    """
+    studied = 0
+    try:
+        for _, card_id in merge_due_cards(deck_ids):
+            if studied:
+                worker.message_ready.emit(
+                    f"{studied} cards studied. Send anything to continue.", False
+                )
+                worker.scroll_to_bottom.emit()
+                await worker.wait_for_user_input()
+
+            worker.clear_chat.emit()
+            worker.scroll_to_bottom.emit()
+            await run_card(card_id, worker)
+            studied += 1
+
+        worker.message_ready.emit(
+            f"All due cards studied ({studied} this session).", False
+        )
+        worker.scroll_to_bottom.emit()
+
+    except Exception as e:
+        worker.clear_chat.emit()
+        worker.message_ready.emit(f"Error loading study material: {str(e)}", False)
+        worker.scroll_to_bottom.emit()
+        raise
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+
+from database.models import Message
+from database.write_queue import write_queue
+from settings.settings import settings
+
+# Run the retention policy after this many logged calls
+COMPACT_EVERY = 500
+
+_calls_since_compaction = COMPACT_EVERY
+
+
+def log_call(
+    kind,
+    prompt,
+    response,
+    card_id=None,
+    model=None,
+    latency_ms=None,
+    usage=None,
+):
+    """
+    Persist one LLM call through the write-behind queue.
+
+    Args:
+        kind: Which call this was ("key_ideas", "judge", etc.)
+        prompt: Prompt text sent to the model
+        response: Raw response content (the verdict for judge calls)
+        card_id: Card the call was made for (optional)
+        model: Model name
+        latency_ms: Wall-clock latency of the call
+        usage: Usage object returned by the API (optional)
+    """
+    global _calls_since_compaction
+
+    write_queue.insert(
+        Message,
+        {
+            "card_id": card_id,
+            "kind": kind,
+            "model": model,
+            "message": prompt,
+            "response": response,
+            "latency_ms": latency_ms,
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "timestamp": datetime.utcnow(),
+        },
+    )
+
+    _calls_since_compaction += 1
+    if _calls_since_compaction >= COMPACT_EVERY:
+        _calls_since_compaction = 0
+        write_queue.execute(compact_messages)
+
+
+def compact_messages(session):
+    """
+    Keep the messages table bounded.
+
+    Rows older than the full-text window keep their metrics and response but
+    drop the prompt text, rows older than the retention window are deleted,
+    and only the newest rows up to the row cap are kept.
+    """
+    now = datetime.utcnow()
+    full_text_cutoff = now - timedelta(days=settings.message_full_text_days)
+    retention_cutoff = now - timedelta(days=settings.message_retention_days)
+
+    session.execute(
+        update(Message)
+        .where(Message.timestamp < full_text_cutoff, Message.message != "")
+        .values(message="")
+    )
+    session.execute(delete(Message).where(Message.timestamp < retention_cutoff))
+
+    # Oldest id that still fits under the cap
+    cutoff_id = session.execute(
+        select(Message.id)
+        .order_by(Message.id.desc())
+        .offset(settings.message_max_rows)
+        .limit(1)
+    ).scalar()
+    if cutoff_id is not None:
+        session.execute(delete(Message).where(Message.id <= cutoff_id))
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
+# Imported first so the timer covers every other import
+from utils.startup import startup_timer
+
 import sys
 
 from PyQt5.QtGui import QFontDatabase
 from PyQt5.QtWidgets import QApplication
 
 from ui import theme
+from ui.components import prewarm_icons
 from ui.pages.main_window import MainApp
+from utils.profiling import app_profiler, profiling_enabled
 
 
 def load_fonts():
@@ -26,13 +31,28 @@ def load_fonts():
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-
-    # Load custom fonts
-    font_family = load_fonts()
-    theme.FONT_FAMILY = font_family
-
-    window = MainApp()
-    window.show()
-    sys.exit(app.exec_())
-
+    startup_timer.mark("import")
+    if profiling_enabled():
+        app_profiler.start()
+
+    with app_profiler.thread("main"):
+        app = QApplication(sys.argv)
+
+        # Load custom fonts
+        font_family = load_fonts()
+        theme.FONT_FAMILY = font_family
+        startup_timer.mark("fonts")
+
+        # Render shared icons once before the pages ask for them
+        prewarm_icons()
+        startup_timer.mark("icons")
+
+        window = MainApp()
+        window.show()
+        startup_timer.mark("window")
+        exit_code = app.exec_()
+
+    if app_profiler.running:
+        app_profiler.stop()
+        app_profiler.save()
+    sys.exit(exit_code)
@@ -0,0 +1,25 @@
+from .algorithms import ALGORITHMS, card_scheduler, deck_algorithm
+from .base import CardScheduler
+from .fsrs_scheduler import (
+    FSRSCardScheduler,
+    build_scheduler,
+    parse_weights,
+    retrievability,
+    review_fsrs,
+    scheduler_for_deck,
+)
+from .sm2 import SM2Scheduler
+
+__all__ = [
+    "ALGORITHMS",
+    "CardScheduler",
+    "FSRSCardScheduler",
+    "SM2Scheduler",
+    "build_scheduler",
+    "card_scheduler",
+    "deck_algorithm",
+    "parse_weights",
+    "retrievability",
+    "review_fsrs",
+    "scheduler_for_deck",
+]
@@ -0,0 +1,22 @@
+from settings.settings import settings
+
+from .base import CardScheduler
+from .fsrs_scheduler import FSRSCardScheduler
+from .sm2 import SM2Scheduler
+
+# Card schedulers by the lowercase name stored in Review.algorithm
+ALGORITHMS = {
+    FSRSCardScheduler.name: FSRSCardScheduler,
+    SM2Scheduler.name: SM2Scheduler,
+}
+
+
+def deck_algorithm(deck) -> str:
+    """Name of the algorithm scheduling a deck: its own, else the global setting."""
+    name = (deck.algorithm or settings.algorithm or "").lower()
+    return name if name in ALGORITHMS else FSRSCardScheduler.name
+
+
+def card_scheduler(deck) -> CardScheduler:
+    """Get the card scheduler selected for a deck."""
+    return ALGORITHMS[deck_algorithm(deck)](deck)
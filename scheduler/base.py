@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+
+
+class CardScheduler(ABC):
+    """
+    Interface of a card scheduling algorithm.
+
+    Implementations are built for one deck and turn a rating into the card
+    columns to write back. Timestamps in and out are naive UTC, as stored.
+    """
+
+    # Name recorded in Review.algorithm
+    name = ""
+
+    # Card column holding the algorithm's difficulty, snapshotted on reviews
+    difficulty_column = "difficulty"
+
+    def __init__(self, deck):
+        self.deck = deck
+
+    @abstractmethod
+    def review(self, card, rating, last_review, now=None) -> dict:
+        """
+        Schedule a card after a review.
+
+        Args:
+            card: Object with the card scheduling columns
+            rating: 0=Again, 1=Hard, 2=Good, 3=Easy
+            last_review: Timestamp of the card's previous review
+            now: Review time (defaults to now)
+
+        Returns:
+            Dictionary of updated card columns plus "last_review"
+        """
+
+    def blank_card(self):
+        """State of a card that has never been reviewed."""
+        return SimpleNamespace(
+            state=0,
+            stability=0.0,
+            difficulty=0.0,
+            anki_difficulty=2.5,
+            scheduled_days=0,
+            due=None,
+        )
+
+    def replay(self, reviews) -> dict:
+        """
+        Rebuild a card's scheduling state from its full review history.
+
+        Args:
+            reviews: Chronological list of (reviewed_at, rating)
+
+        Returns:
+            Dictionary of card columns after the last review
+        """
+        card = self.blank_card()
+        last_review = None
+        values = {}
+        for reviewed_at, rating in reviews:
+            values = self.review(card, rating, last_review, reviewed_at)
+            last_review = values.pop("last_review")
+            for key, value in values.items():
+                setattr(card, key, value)
+        return values
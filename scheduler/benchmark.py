@@ -0,0 +1,337 @@
+"""
+Compare scheduling algorithms by replaying the review log.
+
+Usage:
+    python -m scheduler.benchmark [--deck N] [--processes P] [--no-cache] [--json FILE]
+
+Every card's reviews are replayed in order through each algorithm. Before
+each review the algorithm's recall prediction is scored against what
+happened (log loss, binned RMSE), and the interval it would have scheduled
+is compared with the actual gap to estimate its workload.
+
+Algorithms:
+    fsrs-default  FSRS with the library's default weights
+    fsrs-fitted   FSRS with the deck's stored weights, when they were fitted
+                  (scored on the same reviews they were fitted to)
+    sm2           SM-2, with recall modelled as 0.9 ** (elapsed / interval)
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from types import SimpleNamespace
+
+from fsrs.scheduler import DEFAULT_PARAMETERS
+
+from .fsrs_scheduler import FSRSCardScheduler, parse_weights, retrievability
+from .replay import bin_predictions, rmse_from_bins, stream_sequences
+from .sm2 import SM2Scheduler
+
+# Bump when replay or scoring changes, so cached shards are recomputed
+CACHE_VERSION = 1
+
+# Reviews per shard handed to a worker process
+SHARD_REVIEWS = 50000
+
+BINS = 20
+
+
+def sm2_recall(card, last_review, now) -> float:
+    """SM-2 has no memory model: assume each interval targets 90% recall."""
+    elapsed = max(0.0, (now - last_review).total_seconds() / 86400)
+    return 0.9 ** (elapsed / max(card.scheduled_days or 1, 1))
+
+
+def fsrs_recall(scheduler):
+    def predict(card, last_review, now):
+        return retrievability(scheduler, card, last_review, now)
+
+    return predict
+
+
+def build_algorithms(config) -> dict:
+    """Build the schedulers and recall models described by a shard config."""
+    algorithms = {}
+    for name, options in config["algorithms"].items():
+        deck = SimpleNamespace(
+            w=json.dumps(options.get("weights")),
+            request_retention=config["request_retention"],
+            maximum_interval=config["maximum_interval"],
+            enable_fuzz=0,
+        )
+        if name == "sm2":
+            algorithms[name] = (SM2Scheduler(deck), sm2_recall)
+        else:
+            scheduler = FSRSCardScheduler(deck)
+            algorithms[name] = (scheduler, fsrs_recall(scheduler.scheduler))
+    return algorithms
+
+
+def score_shard(db_path, config) -> dict:
+    """
+    Replay one shard of cards through every algorithm; runs in a worker.
+
+    Args:
+        db_path: Path to the collection database
+        config: Shard description with deck_id, card_range and algorithms
+
+    Returns:
+        Dictionary of algorithm -> accumulated scores
+    """
+    algorithms = build_algorithms(config)
+    totals = {
+        name: {"reviews": 0, "log_loss": 0.0, "bins": {}, "workload": 0.0}
+        for name in algorithms
+    }
+
+    conn = sqlite3.connect(db_path)
+    try:
+        sequences = stream_sequences(
+            conn, deck_id=config["deck_id"], card_range=config["card_range"]
+        )
+        for card_id, reviews in sequences:
+            for name, (scheduler, predict) in algorithms.items():
+                score_card(card_id, reviews, scheduler, predict, totals[name])
+    finally:
+        conn.close()
+
+    return totals
+
+
+def score_card(card_id, reviews, scheduler, predict, totals):
+    """Replay one card through one algorithm, adding to its totals."""
+    card = scheduler.blank_card()
+    card.id = card_id
+    last_review = None
+    predictions = []
+
+    for reviewed_at, rating in reviews:
+        if last_review is not None:
+            p = min(max(predict(card, last_review, reviewed_at), 1e-6), 1 - 1e-6)
+            recalled = rating > 0
+            predictions.append((p, recalled))
+            totals["log_loss"] -= math.log(p) if recalled else math.log(1 - p)
+
+            # Reviews the algorithm would have asked for over the same gap
+            gap = (reviewed_at - last_review).total_seconds() / 86400
+            totals["workload"] += gap / max(card.scheduled_days or 1, 1)
+
+        values = scheduler.review(card, rating, last_review, reviewed_at)
+        last_review = values.pop("last_review").replace(tzinfo=reviewed_at.tzinfo)
+        for key, value in values.items():
+            setattr(card, key, value)
+
+    totals["reviews"] += len(predictions)
+    bin_predictions(predictions, BINS, totals["bins"])
+
+
+def plan_shards(conn, deck, shard_reviews=SHARD_REVIEWS) -> list:
+    """
+    Split a deck's cards into ID ranges holding about shard_reviews reviews.
+
+    Returns:
+        List of (first card ID, last card ID, review count, highest review ID)
+    """
+    rows = conn.execute(
+        "SELECT reviews.card_id, COUNT(*), MAX(reviews.id) FROM reviews "
+        "JOIN cards ON cards.id = reviews.card_id WHERE cards.deck_id = ? "
+        "GROUP BY reviews.card_id ORDER BY reviews.card_id",
+        (deck.id,),
+    ).fetchall()
+
+    shards, first, count, max_id = [], None, 0, 0
+    for card_id, reviews, last_id in rows:
+        if first is None:
+            first = card_id
+        count += reviews
+        max_id = max(max_id, last_id)
+        if count >= shard_reviews:
+            shards.append((first, card_id, count, max_id))
+            first, count, max_id = None, 0, 0
+    if first is not None:
+        shards.append((first, rows[-1][0], count, max_id))
+    return shards
+
+
+def deck_config(deck) -> dict:
+    """Algorithms and scheduling parameters to benchmark a deck with."""
+    algorithms = {
+        "fsrs-default": {"weights": list(DEFAULT_PARAMETERS)},
+        "sm2": {},
+    }
+    weights = parse_weights(deck.w)
+    if weights != tuple(DEFAULT_PARAMETERS):
+        algorithms["fsrs-fitted"] = {"weights": list(weights)}
+
+    return {
+        "deck_id": deck.id,
+        "request_retention": deck.request_retention or 0.9,
+        "maximum_interval": deck.maximum_interval or 36500,
+        "algorithms": algorithms,
+    }
+
+
+def cache_path(cache_dir, config, shard) -> Path:
+    """Cache file of a shard, keyed by its config and review log fingerprint."""
+    key = json.dumps(
+        {"version": CACHE_VERSION, "config": config, "shard": shard}, sort_keys=True
+    )
+    return Path(cache_dir) / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
+def load_cached(path):
+    try:
+        totals = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    for scores in totals.values():
+        scores["bins"] = {
+            int(index): values for index, values in scores["bins"].items()
+        }
+    return totals
+
+
+def save_cached(path, totals):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(totals))
+    os.replace(tmp_path, path)
+
+
+def merge_totals(merged, totals):
+    for name, scores in totals.items():
+        target = merged.setdefault(
+            name, {"reviews": 0, "log_loss": 0.0, "bins": {}, "workload": 0.0}
+        )
+        target["reviews"] += scores["reviews"]
+        target["log_loss"] += scores["log_loss"]
+        target["workload"] += scores["workload"]
+        for index, (count, predicted, observed) in scores["bins"].items():
+            total = target["bins"].setdefault(index, [0, 0.0, 0])
+            total[0] += count
+            total[1] += predicted
+            total[2] += observed
+
+
+def run_benchmark(deck_ids=None, processes=None, use_cache=True) -> dict:
+    """
+    Benchmark the algorithms on the review log.
+
+    Args:
+        deck_ids: Decks to replay (default all)
+        processes: Worker process count (default CPU count)
+        use_cache: Reuse results of shards whose reviews did not change
+
+    Returns:
+        Dictionary of algorithm -> reviews, log_loss, rmse_bins, workload
+        (simulated reviews per actual review)
+    """
+    from database.database import DB_PATH, DB_DIR, db
+    from database.models import Deck
+
+    cache_dir = os.path.join(DB_DIR, "benchmark")
+
+    query = db.session.query(Deck)
+    if deck_ids:
+        query = query.filter(Deck.id.in_(deck_ids))
+
+    jobs = []
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        for deck in query:
+            config = deck_config(deck)
+            for shard in plan_shards(conn, deck):
+                jobs.append(
+                    (
+                        dict(config, card_range=shard[:2]),
+                        cache_path(cache_dir, config, shard),
+                    )
+                )
+    finally:
+        conn.close()
+
+    merged = {}
+    pending = []
+    for config, path in jobs:
+        totals = load_cached(path) if use_cache else None
+        if totals is None:
+            pending.append((config, path))
+        else:
+            merge_totals(merged, totals)
+    print(f"{len(jobs)} shards, {len(jobs) - len(pending)} cached")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {
+                pool.submit(score_shard, DB_PATH, config): path
+                for config, path in pending
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                totals = future.result()
+                save_cached(futures[future], totals)
+                merge_totals(merged, totals)
+                print(f"[{done}/{len(pending)}] shards replayed")
+
+    return {
+        name: {
+            "reviews": scores["reviews"],
+            "log_loss": (
+                scores["log_loss"] / scores["reviews"]
+                if scores["reviews"]
+                else float("nan")
+            ),
+            "rmse_bins": rmse_from_bins(scores["bins"]),
+            "workload": (
+                scores["workload"] / scores["reviews"]
+                if scores["reviews"]
+                else float("nan")
+            ),
+        }
+        for name, scores in merged.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m scheduler.benchmark",
+        description="Compare scheduling algorithms on the review log.",
+    )
+    parser.add_argument(
+        "--deck", type=int, action="append", help="Deck ID (repeatable, default all)"
+    )
+    parser.add_argument("--processes", type=int)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Replay every shard again"
+    )
+    parser.add_argument("--json", metavar="FILE", help="Also write results as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run_benchmark(args.deck, args.processes, not args.no_cache)
+
+    print(
+        f"{'algorithm':<14}{'reviews':>10}{'log loss':>10}{'RMSE':>8}{'workload':>10}"
+    )
+    for name, scores in sorted(results.items()):
+        print(
+            f"{name:<14}{scores['reviews']:>10}{scores['log_loss']:>10.4f}"
+            f"{scores['rmse_bins']:>8.4f}{scores['workload']:>10.3f}"
+        )
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
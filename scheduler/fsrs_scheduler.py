@@ -0,0 +1,164 @@
+import json
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from fsrs import Card as FSRSCard
+from fsrs import Rating, Scheduler, State
+from fsrs.scheduler import DEFAULT_PARAMETERS
+
+from .base import CardScheduler
+
+
+@lru_cache(maxsize=128)
+def parse_weights(w: str) -> tuple:
+    """
+    Parse a deck's FSRS weights JSON string.
+
+    Weight sets for older FSRS versions (fewer than 21 values) cannot drive
+    the installed scheduler, so the library defaults are used instead.
+
+    Args:
+        w: FSRS weights as JSON string
+
+    Returns:
+        Tuple of 21 FSRS parameters
+    """
+    try:
+        weights = tuple(float(value) for value in json.loads(w or "[]"))
+    except (json.JSONDecodeError, TypeError, ValueError):
+        weights = ()
+
+    if len(weights) != len(DEFAULT_PARAMETERS):
+        return tuple(DEFAULT_PARAMETERS)
+    return weights
+
+
+@lru_cache(maxsize=128)
+def build_scheduler(
+    w: str,
+    request_retention: float = 0.9,
+    maximum_interval: int = 36500,
+    enable_fuzz: bool = True,
+) -> Scheduler:
+    """
+    Build an FSRS scheduler for a set of deck parameters.
+
+    A study session is one LLM conversation per card, so cards are never
+    repeated within minutes: learning and relearning steps are disabled and
+    every rating schedules a whole-day interval.
+    """
+    return Scheduler(
+        parameters=parse_weights(w),
+        desired_retention=request_retention or 0.9,
+        learning_steps=(),
+        relearning_steps=(),
+        maximum_interval=maximum_interval or 36500,
+        enable_fuzzing=bool(enable_fuzz),
+    )
+
+
+def scheduler_for_deck(deck) -> Scheduler:
+    """Get the FSRS scheduler configured by a Deck's parameters."""
+    return build_scheduler(
+        deck.w,
+        deck.request_retention,
+        deck.maximum_interval,
+        bool(deck.enable_fuzz),
+    )
+
+
+def to_utc(value):
+    """Attach UTC to a naive database timestamp."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def to_naive_utc(value):
+    """Convert a timestamp to the naive UTC form stored in the database."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _to_fsrs_card(item, last_review):
+    # fsrs sleeps 1ms to make up a unique card_id when none is given
+    card_id = getattr(item, "id", None) or 0
+
+    # State 0 (New) has no FSRS counterpart: a learning card without memory state
+    if not item.state or not item.stability:
+        return FSRSCard(card_id=card_id, state=State.Learning)
+
+    return FSRSCard(
+        card_id=card_id,
+        state=State(item.state),
+        stability=item.stability,
+        difficulty=item.difficulty,
+        due=to_utc(item.due),
+        last_review=to_utc(last_review),
+    )
+
+
+def retrievability(scheduler, item, last_review, now=None) -> float:
+    """
+    Current probability of recall for a scheduled item.
+
+    Args:
+        scheduler: FSRS scheduler
+        item: Object with FSRS state columns (Card, KeyIdea)
+        last_review: Timestamp of the item's last review
+        now: Time to evaluate at (defaults to now)
+
+    Returns:
+        Retrievability between 0 and 1 (0 for new items)
+    """
+    if not item.state or not item.stability or last_review is None:
+        return 0.0
+    return scheduler.get_card_retrievability(
+        _to_fsrs_card(item, last_review), to_utc(now) if now else None
+    )
+
+
+def review_fsrs(scheduler, item, rating, last_review, now=None) -> dict:
+    """
+    Run one review through the FSRS scheduler.
+
+    Args:
+        scheduler: FSRS scheduler
+        item: Object with FSRS state columns (Card, KeyIdea)
+        rating: 0=Again, 1=Hard, 2=Good, 3=Easy
+        last_review: Timestamp of the item's last review
+        now: Review time (defaults to now)
+
+    Returns:
+        Dictionary of updated scheduling columns, timestamps as naive UTC
+    """
+    now = to_utc(now) if now else datetime.now(timezone.utc)
+    fsrs_card, _ = scheduler.review_card(
+        _to_fsrs_card(item, last_review), Rating(rating + 1), now
+    )
+
+    elapsed_days = (now - to_utc(last_review)).days if last_review else 0
+
+    return {
+        "stability": fsrs_card.stability,
+        "difficulty": fsrs_card.difficulty,
+        "state": int(fsrs_card.state),
+        "due": to_naive_utc(fsrs_card.due),
+        "scheduled_days": (fsrs_card.due - now).days,
+        "elapsed_days": max(0, elapsed_days),
+        "last_review": to_naive_utc(now),
+    }
+
+
+class FSRSCardScheduler(CardScheduler):
+    """Card scheduling with FSRS, configured by the deck's parameters."""
+
+    name = "fsrs"
+
+    def __init__(self, deck):
+        super().__init__(deck)
+        self.scheduler = scheduler_for_deck(deck)
+
+    def review(self, card, rating, last_review, now=None) -> dict:
+        return review_fsrs(self.scheduler, card, rating, last_review, now)
@@ -0,0 +1,184 @@
+"""
+Fit each deck's FSRS weights to its review history.
+
+Usage:
+    python -m scheduler.optimizer [--deck N] [--processes P] [--dry-run]
+
+Requires the optional optimizer extra: pip install "fsrs[optimizer]"
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from fsrs import Rating, ReviewLog
+from fsrs.optimizer import Optimizer
+
+from .fsrs_scheduler import parse_weights
+from .replay import log_loss, replay_fsrs, rmse_bins, stream_sequences
+
+# The FSRS optimizer returns the defaults below this many reviews
+MIN_REVIEWS = 512
+
+# One card in EVAL_MODULUS is held out for evaluation
+EVAL_MODULUS = 5
+
+
+def optimize_deck(db_path, deck_id, current_w) -> dict:
+    """
+    Fit FSRS weights for one deck; runs inside a worker process.
+
+    Cards are split deterministically by ID into a training set and a
+    held-out evaluation set. The fitted weights are only proposed if they
+    beat the current weights on the held-out cards.
+
+    Args:
+        db_path: Path to the collection database
+        deck_id: ID of the deck to optimize
+        current_w: The deck's current weights as JSON string
+
+    Returns:
+        Result dictionary with the fitted weights and evaluation metrics
+    """
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    try:
+        train_logs, eval_sequences = [], []
+        for card_id, reviews in stream_sequences(conn, deck_id=deck_id):
+            if card_id % EVAL_MODULUS == 0:
+                eval_sequences.append((card_id, reviews))
+                continue
+            train_logs.extend(
+                ReviewLog(
+                    card_id=card_id,
+                    rating=Rating(rating + 1),
+                    review_datetime=reviewed_at,
+                    review_duration=None,
+                )
+                for reviewed_at, rating in reviews
+            )
+    finally:
+        conn.close()
+
+    result = {
+        "deck_id": deck_id,
+        "train_reviews": len(train_logs),
+        "eval_reviews": sum(len(reviews) for _, reviews in eval_sequences),
+        "weights": None,
+        "improved": False,
+    }
+    if len(train_logs) < MIN_REVIEWS:
+        result["elapsed_s"] = round(time.perf_counter() - started, 1)
+        return result
+
+    fitted = Optimizer(train_logs).compute_optimal_parameters()
+
+    current = replay_fsrs(eval_sequences, parse_weights(current_w))
+    candidate = replay_fsrs(eval_sequences, fitted)
+    result.update(
+        {
+            "weights": [round(value, 4) for value in fitted],
+            "log_loss_before": log_loss(current),
+            "log_loss_after": log_loss(candidate),
+            "rmse_before": rmse_bins(current),
+            "rmse_after": rmse_bins(candidate),
+            "elapsed_s": round(time.perf_counter() - started, 1),
+        }
+    )
+    # Without held-out reviews there is nothing to compare against
+    result["improved"] = not candidate or (
+        result["log_loss_after"] < result["log_loss_before"]
+    )
+    return result
+
+
+def optimize_decks(deck_ids=None, processes=None, dry_run=False) -> list:
+    """
+    Optimize decks in parallel and write improved weights back.
+
+    Improved decks are rescheduled on the write queue, which is flushed
+    before returning.
+
+    Args:
+        deck_ids: Decks to optimize (default all); SM-2 decks are skipped
+        processes: Worker process count (default CPU count)
+        dry_run: Report results without writing weights
+
+    Returns:
+        List of per-deck result dictionaries
+    """
+    from database.database import DB_PATH, db
+    from database.models import Deck
+    from database.write_queue import write_queue
+
+    from .algorithms import deck_algorithm
+    from .reschedule import queue_reschedule
+
+    query = db.session.query(Deck)
+    if deck_ids:
+        query = query.filter(Deck.id.in_(deck_ids))
+    # SM-2 decks have no FSRS weights to fit
+    decks = {deck.id: deck for deck in query if deck_algorithm(deck) == "fsrs"}
+
+    results = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(optimize_deck, DB_PATH, deck.id, deck.w)
+            for deck in decks.values()
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            deck = decks[result["deck_id"]]
+
+            if result["weights"] is None:
+                status = f"skipped ({result['train_reviews']} training reviews)"
+            elif not result["improved"]:
+                status = (
+                    f"kept current weights (log loss {result['log_loss_before']:.4f}"
+                    f" vs {result['log_loss_after']:.4f})"
+                )
+            else:
+                status = (
+                    f"log loss {result['log_loss_before']:.4f} -> "
+                    f"{result['log_loss_after']:.4f}, RMSE {result['rmse_before']:.4f}"
+                    f" -> {result['rmse_after']:.4f}"
+                )
+                if not dry_run:
+                    deck.w = json.dumps(result["weights"])
+                    db.session.commit()
+                    queue_reschedule([deck.id])
+
+            print(f"[{done}/{len(futures)}] deck {deck.id} ({deck.name}): {status}")
+
+    write_queue.flush()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m scheduler.optimizer",
+        description="Fit FSRS weights to each deck's review history.",
+    )
+    parser.add_argument(
+        "--deck", type=int, action="append", help="Deck ID (repeatable, default all)"
+    )
+    parser.add_argument("--processes", type=int)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without writing weights"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        optimize_decks(args.deck, args.processes, args.dry_run)
+    except ImportError as e:
+        print(e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import math
+from datetime import datetime, timezone
+
+from fsrs import Card as FSRSCard
+from fsrs import Rating, Scheduler, State
+
+# Rows fetched per round trip when streaming the review log
+CHUNK_SIZE = 5000
+
+
+def stream_sequences(
+    conn, deck_id=None, card_filter=None, card_range=None, chunk_size=CHUNK_SIZE
+):
+    """
+    Stream per-card review sequences from the review log.
+
+    Reviews are read in chronological order per card, in chunks, so memory
+    holds one card's sequence at a time.
+
+    Args:
+        conn: sqlite3 connection to the collection
+        deck_id: Only stream cards of this deck (optional)
+        card_filter: (modulus, remainder) to stream a slice of cards (optional)
+        card_range: Inclusive (first, last) card IDs to stream (optional)
+        chunk_size: Rows fetched per round trip
+
+    Yields:
+        Tuples of (card_id, [(reviewed_at, rating), ...])
+    """
+    query = (
+        "SELECT reviews.card_id, reviews.reviewed_at, reviews.rating "
+        "FROM reviews JOIN cards ON cards.id = reviews.card_id"
+    )
+    conditions, params = [], []
+    if deck_id is not None:
+        conditions.append("cards.deck_id = ?")
+        params.append(deck_id)
+    if card_filter is not None:
+        conditions.append("reviews.card_id % ? = ?")
+        params.extend(card_filter)
+    if card_range is not None:
+        conditions.append("reviews.card_id BETWEEN ? AND ?")
+        params.extend(card_range)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY reviews.card_id, reviews.reviewed_at"
+
+    cursor = conn.execute(query, params)
+    card_id, reviews = None, []
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for row_card_id, reviewed_at, rating in rows:
+            if row_card_id != card_id:
+                if reviews:
+                    yield card_id, reviews
+                card_id, reviews = row_card_id, []
+            reviews.append((parse_timestamp(reviewed_at), rating))
+
+    if reviews:
+        yield card_id, reviews
+
+
+def parse_timestamp(value) -> datetime:
+    """Parse a stored naive UTC timestamp into an aware datetime."""
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def replay_fsrs(sequences, weights) -> list:
+    """
+    Replay review sequences through FSRS.
+
+    Args:
+        sequences: Iterable of (card_id, [(reviewed_at, rating), ...])
+        weights: FSRS parameters to replay with
+
+    Returns:
+        List of (predicted retrievability, recalled) pairs, one per review
+        after each card's first
+    """
+    scheduler = Scheduler(
+        parameters=weights,
+        learning_steps=(),
+        relearning_steps=(),
+        enable_fuzzing=False,
+    )
+
+    predictions = []
+    for card_id, reviews in sequences:
+        card = FSRSCard(card_id=card_id, state=State.Learning)
+        for reviewed_at, rating in reviews:
+            if card.last_review is not None:
+                predictions.append(
+                    (scheduler.get_card_retrievability(card, reviewed_at), rating > 0)
+                )
+            card, _ = scheduler.review_card(card, Rating(rating + 1), reviewed_at)
+
+    return predictions
+
+
+def log_loss(predictions) -> float:
+    """Mean binary cross-entropy of recall predictions."""
+    if not predictions:
+        return float("nan")
+    total = 0.0
+    for p, recalled in predictions:
+        p = min(max(p, 1e-6), 1 - 1e-6)
+        total -= math.log(p) if recalled else math.log(1 - p)
+    return total / len(predictions)
+
+
+def rmse_bins(predictions, bins=20) -> float:
+    """RMSE between mean predicted and observed recall over prediction bins."""
+    return rmse_from_bins(bin_predictions(predictions, bins))
+
+
+def bin_predictions(predictions, bins=20, totals=None) -> dict:
+    """
+    Accumulate predictions into probability bins.
+
+    Args:
+        predictions: Iterable of (predicted retrievability, recalled)
+        bins: Number of equal-width bins
+        totals: Bins to add to (optional), so shards can be merged
+
+    Returns:
+        Dictionary of bin index -> [count, predicted sum, observed sum]
+    """
+    totals = {} if totals is None else totals
+    for p, recalled in predictions:
+        index = min(int(p * bins), bins - 1)
+        total = totals.setdefault(index, [0, 0.0, 0])
+        total[0] += 1
+        total[1] += p
+        total[2] += int(recalled)
+    return totals
+
+
+def rmse_from_bins(totals) -> float:
+    """RMSE between mean predicted and observed recall of accumulated bins."""
+    reviews = sum(count for count, _, _ in totals.values())
+    if not reviews:
+        return float("nan")
+
+    error = sum(
+        count * (predicted / count - observed / count) ** 2
+        for count, predicted, observed in totals.values()
+    )
+    return math.sqrt(error / reviews)
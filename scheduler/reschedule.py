@@ -0,0 +1,94 @@
+"""
+Background rescheduling after a deck's scheduling parameters change.
+
+Jobs run on the write queue's thread, after every review queued before
+them, and write cards with bulk statements instead of one ORM object at a
+time.
+"""
+
+import time
+
+from sqlalchemy import update
+
+from database.models import Card, Deck
+from database.write_queue import write_queue
+
+from .algorithms import card_scheduler, deck_algorithm
+from .replay import stream_sequences
+from .vectorized import cap_intervals, reschedule_deck
+
+# Cards written per bulk UPDATE while replaying
+BATCH_SIZE = 1000
+
+
+def queue_reschedule(deck_ids, replay=False):
+    """
+    Queue a background rescheduling of decks.
+
+    Args:
+        deck_ids: IDs of the decks to reschedule
+        replay: Rebuild every card's state from its review history, needed
+            when the deck's algorithm changed
+    """
+    deck_ids = list(deck_ids)
+    if deck_ids:
+        write_queue.execute(lambda session: reschedule_decks(session, deck_ids, replay))
+
+
+def reschedule_decks(session, deck_ids, replay=False) -> int:
+    """
+    Reschedule decks inside the caller's transaction.
+
+    Without replay only intervals move: FSRS intervals are recomputed for
+    the deck's retention and maximum interval, and SM-2 intervals are
+    capped at the maximum interval.
+
+    Args:
+        session: Session whose transaction the writes join
+        deck_ids: IDs of the decks to reschedule
+        replay: Rebuild every card's state from its review history
+
+    Returns:
+        Number of cards rescheduled
+    """
+    conn = session.connection().connection
+    total = 0
+
+    for deck in session.query(Deck).filter(Deck.id.in_(deck_ids)):
+        started = time.perf_counter()
+        algorithm = deck_algorithm(deck)
+
+        if replay:
+            count = replay_deck(session, conn, deck)
+        elif algorithm == "fsrs":
+            count = reschedule_deck(deck, conn=conn)
+        else:
+            count = cap_intervals(deck, conn=conn)
+
+        total += count
+        elapsed = time.perf_counter() - started
+        print(
+            f"Rescheduled {count} cards in deck {deck.name} "
+            f"with {algorithm} in {elapsed:.2f}s"
+        )
+
+    return total
+
+
+def replay_deck(session, conn, deck) -> int:
+    """Rebuild the scheduling state of a deck's reviewed cards with its algorithm."""
+    scheduler = card_scheduler(deck)
+
+    # Read everything first: SQLite cursors should not see their own writes
+    sequences = list(stream_sequences(conn.cursor(), deck_id=deck.id))
+
+    rows = []
+    for card_id, reviews in sequences:
+        rows.append({"id": card_id, **scheduler.replay(reviews)})
+        if len(rows) >= BATCH_SIZE:
+            session.execute(update(Card), rows)
+            rows = []
+    if rows:
+        session.execute(update(Card), rows)
+
+    return len(sequences)
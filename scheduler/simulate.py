@@ -0,0 +1,270 @@
+"""
+Monte Carlo forecast of future review workload.
+
+Every card of a deck is simulated at once with numpy, in several independent
+runs, one day at a time: due cards are reviewed, recall is sampled from
+their retrievability, a rating is sampled for recalled cards and FSRS
+schedules the next review.
+"""
+
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .fsrs_scheduler import parse_weights
+from .vectorized import (
+    UNIX_EPOCH_JULIAN_DAY,
+    initial_difficulty,
+    initial_stability,
+    load_deck_arrays,
+    next_difficulty,
+    next_interval,
+    next_stability,
+    raw_connection,
+    retrievability,
+)
+
+# Judge calls per study session by rating (0=Again .. 3=Easy): a card is
+# rated Again or Hard when the session ran out of its 5 attempts, Good when
+# it needed prompting and Easy when the first answer covered everything
+JUDGE_CALLS = np.array([5, 5, 2, 1])
+
+# Key idea extraction calls the first time a card is studied
+EXTRACTION_CALLS = 1
+
+# Rating shares used while a deck has too few reviews of its own
+DEFAULT_FIRST_RATINGS = (0.2, 0.1, 0.6, 0.1)
+DEFAULT_RECALL_RATINGS = (0.15, 0.75, 0.1)  # Hard, Good, Easy
+MIN_RATING_SAMPLES = 50
+
+
+def rating_shares(deck_id, conn=None) -> tuple:
+    """
+    Share of each rating in a deck's review history.
+
+    Returns:
+        Tuple of (first review shares for Again..Easy,
+        shares of Hard/Good/Easy among later recalled reviews)
+    """
+    with raw_connection(conn) as conn:
+        rows = (
+            conn.cursor()
+            .execute(
+                "SELECT reviews.state_before = 0, reviews.rating, COUNT(*) "
+                "FROM reviews JOIN cards ON cards.id = reviews.card_id "
+                "WHERE cards.deck_id = ? GROUP BY 1, 2",
+                (deck_id,),
+            )
+            .fetchall()
+        )
+
+    first, recall = np.zeros(4), np.zeros(4)
+    for is_first, rating, count in rows:
+        if rating is not None and 0 <= rating <= 3:
+            (first if is_first else recall)[rating] += count
+
+    recall = recall[1:]
+    first_shares = (
+        first / first.sum()
+        if first.sum() >= MIN_RATING_SAMPLES
+        else np.array(DEFAULT_FIRST_RATINGS)
+    )
+    recall_shares = (
+        recall / recall.sum()
+        if recall.sum() >= MIN_RATING_SAMPLES
+        else np.array(DEFAULT_RECALL_RATINGS)
+    )
+    return first_shares, recall_shares
+
+
+def forecast_deck(
+    deck,
+    days=30,
+    simulations=16,
+    request_retention=None,
+    seed=None,
+    now=None,
+) -> dict:
+    """
+    Forecast a deck's daily reviews and LLM calls.
+
+    Cards scheduled by SM-2 that have no FSRS memory state are simulated
+    from their current interval, which approximates their stability.
+
+    Args:
+        deck: Deck to forecast
+        days: Number of days to project, starting today
+        simulations: Number of Monte Carlo runs
+        request_retention: Retention to simulate (defaults to the deck's)
+        seed: Random seed, for reproducible forecasts
+        now: Start of the forecast (defaults to now)
+
+    Returns:
+        Dictionary of per-day arrays: "due" (mean reviews), "due_low" and
+        "due_high" (10th/90th percentiles), "new" (first reviews) and
+        "llm_calls" (mean calls), plus the raw per-run counts as "runs"
+    """
+    now = now or datetime.now(timezone.utc)
+    arrays = load_deck_arrays(deck.id, now)
+    first_shares, recall_shares = rating_shares(deck.id)
+    current_retention = deck.request_retention or 0.9
+
+    return simulate(
+        arrays,
+        weights=parse_weights(deck.w),
+        request_retention=request_retention or current_retention,
+        # A retention change reschedules every seen card straight away
+        reschedule=bool(request_retention) and request_retention != current_retention,
+        maximum_interval=deck.maximum_interval or 36500,
+        new_per_day=deck.new_per_day or 0,
+        first_shares=first_shares,
+        recall_shares=recall_shares,
+        days=days,
+        simulations=simulations,
+        rng=np.random.default_rng(seed),
+        now_jd=now.timestamp() / 86400 + UNIX_EPOCH_JULIAN_DAY,
+    )
+
+
+def simulate(
+    arrays,
+    weights,
+    request_retention,
+    maximum_interval,
+    new_per_day,
+    first_shares,
+    recall_shares,
+    days,
+    simulations,
+    rng,
+    now_jd,
+    reschedule=False,
+) -> dict:
+    """Run the Monte Carlo simulation on arrays from load_deck_arrays."""
+    started = time.perf_counter()
+    count = len(arrays["id"])
+
+    is_new = arrays["state"] == 0
+    stability = arrays["stability"].copy()
+    difficulty = arrays["difficulty"].copy()
+
+    # Seen cards without FSRS state (SM-2): stability ~ interval at 90%
+    missing = ~is_new & (stability <= 0)
+    stability[missing] = np.maximum(arrays["scheduled_days"][missing], 1)
+    difficulty[missing] = 5.0
+
+    # Times are in days relative to now
+    last_review = arrays["last_review"] - now_jd
+    due = last_review + arrays["scheduled_days"]
+    if reschedule:
+        due[~is_new] = last_review[~is_new] + next_interval(
+            stability[~is_new], request_retention, maximum_interval, weights
+        )
+
+    # New cards are introduced in creation order, new_per_day at a time
+    new_order = np.argsort(due[is_new], kind="stable")
+    intro_day = np.empty(new_order.size)
+    if new_per_day > 0:
+        intro_day[new_order] = np.arange(new_order.size) // new_per_day
+    else:
+        intro_day[:] = np.inf
+    due[is_new] = intro_day
+
+    # One copy of every card per simulation
+    sim = np.repeat(np.arange(simulations), count)
+    is_new = np.tile(is_new, simulations)
+    stability = np.tile(stability, simulations)
+    difficulty = np.tile(difficulty, simulations)
+    last_review = np.tile(last_review, simulations)
+    due = np.tile(due, simulations)
+
+    reviews = np.zeros((simulations, days))
+    first_reviews = np.zeros((simulations, days))
+    calls = np.zeros((simulations, days))
+
+    for day in range(days):
+        index = np.flatnonzero(due < day + 1)
+        if index.size == 0:
+            continue
+
+        # Reviews happen when due, or at the start of the day if overdue
+        t = np.maximum(due[index], day)
+        first = is_new[index]
+        rating = np.empty(index.size, dtype=np.int64)
+
+        rating[first] = rng.choice(4, size=int(first.sum()), p=first_shares)
+        seen = ~first
+        recall = retrievability(
+            stability[index[seen]], t[seen] - last_review[index[seen]], weights
+        )
+        recalled = rng.random(recall.size) < recall
+        rating[seen] = np.where(
+            recalled, 1 + rng.choice(3, size=recall.size, p=recall_shares), 0
+        )
+
+        new_stability = np.empty(index.size)
+        new_difficulty = np.empty(index.size)
+        new_stability[first] = initial_stability(rating[first], weights)
+        new_difficulty[first] = initial_difficulty(rating[first], weights)
+        new_stability[seen] = next_stability(
+            difficulty[index[seen]],
+            stability[index[seen]],
+            recall,
+            rating[seen],
+            weights,
+        )
+        new_difficulty[seen] = next_difficulty(
+            difficulty[index[seen]], rating[seen], weights
+        )
+
+        stability[index] = new_stability
+        difficulty[index] = new_difficulty
+        is_new[index] = False
+        last_review[index] = t
+        due[index] = t + next_interval(
+            new_stability, request_retention, maximum_interval, weights
+        )
+
+        runs = sim[index]
+        reviews[:, day] = np.bincount(runs, minlength=simulations)
+        first_reviews[:, day] = np.bincount(runs[first], minlength=simulations)
+        calls[:, day] = np.bincount(
+            runs,
+            weights=JUDGE_CALLS[rating] + EXTRACTION_CALLS * first,
+            minlength=simulations,
+        )
+
+    return summarize(
+        reviews, first_reviews, calls, count, time.perf_counter() - started
+    )
+
+
+def summarize(reviews, first_reviews, calls, cards, elapsed_s) -> dict:
+    """Reduce per-run daily counts of shape (simulations, days) to a forecast."""
+    return {
+        "days": reviews.shape[1],
+        "cards": cards,
+        "due": reviews.mean(axis=0),
+        "due_low": np.percentile(reviews, 10, axis=0),
+        "due_high": np.percentile(reviews, 90, axis=0),
+        "new": first_reviews.mean(axis=0),
+        "llm_calls": calls.mean(axis=0),
+        "runs": (reviews, first_reviews, calls),
+        "elapsed_s": round(elapsed_s, 2),
+    }
+
+
+def combine_forecasts(forecasts) -> dict:
+    """
+    Add up the forecasts of several decks.
+
+    Runs are added before taking percentiles, so every deck must have been
+    forecast with the same number of days and simulations.
+    """
+    runs = [sum(forecast["runs"][i] for forecast in forecasts) for i in range(3)]
+    return summarize(
+        *runs,
+        cards=sum(forecast["cards"] for forecast in forecasts),
+        elapsed_s=sum(forecast["elapsed_s"] for forecast in forecasts),
+    )
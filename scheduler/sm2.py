@@ -0,0 +1,67 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from .base import CardScheduler
+from .fsrs_scheduler import to_naive_utc, to_utc
+
+# SM-2 quality (0-5) for each rating (0=Again .. 3=Easy)
+QUALITY = {0: 1, 1: 3, 2: 4, 3: 5}
+
+MIN_EASE = 1.3
+EASY_BONUS = 1.3
+
+# Fraction an interval may be moved by when fuzzing is enabled
+FUZZ_RANGE = 0.05
+
+
+class SM2Scheduler(CardScheduler):
+    """
+    Card scheduling with SM-2.
+
+    The easiness factor lives in Card.anki_difficulty and the current
+    interval in Card.scheduled_days. As in the original SM-2, only
+    successful recalls (quality 3 and up) update the easiness factor; a
+    failed card keeps it, goes back to a one day interval and climbs
+    1 -> 6 -> interval * ease again.
+    """
+
+    name = "sm2"
+    difficulty_column = "anki_difficulty"
+
+    def review(self, card, rating, last_review, now=None) -> dict:
+        now = to_utc(now) if now else datetime.now(timezone.utc)
+
+        quality = QUALITY[rating]
+        ease = card.anki_difficulty or 2.5
+        if quality >= 3:
+            ease += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+            ease = max(MIN_EASE, ease)
+
+        previous = card.scheduled_days or 0
+        if rating == 0:
+            interval = 1
+            state = 3 if card.state == 2 else 1  # Relearning / Learning
+        elif card.state != 2:
+            interval = 4 if rating == 3 else 1
+            state = 2
+        elif previous <= 1:
+            interval = 6
+            state = 2
+        else:
+            interval = previous * ease * (EASY_BONUS if rating == 3 else 1)
+            state = 2
+
+        if self.deck.enable_fuzz and interval > 2:
+            interval *= random.uniform(1 - FUZZ_RANGE, 1 + FUZZ_RANGE)
+        interval = min(max(1, round(interval)), self.deck.maximum_interval or 36500)
+
+        elapsed_days = (now - to_utc(last_review)).days if last_review else 0
+
+        return {
+            "anki_difficulty": ease,
+            "state": state,
+            "due": to_naive_utc(now + timedelta(days=interval)),
+            "scheduled_days": interval,
+            "elapsed_days": max(0, elapsed_days),
+            "last_review": to_naive_utc(now),
+        }
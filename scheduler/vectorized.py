@@ -0,0 +1,274 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+from database.database import db
+
+from .fsrs_scheduler import parse_weights
+
+# Julian day of the Unix epoch, for converting SQLite julianday() values
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# Lower bound FSRS applies to every stability
+STABILITY_MIN = 0.001
+
+
+def decay_and_factor(weights):
+    """Forgetting curve shape for a weight set (FSRS-6 stores the decay in w[20])."""
+    decay = -weights[20] if len(weights) > 20 else -0.5
+    factor = 0.9 ** (1 / decay) - 1
+    return decay, factor
+
+
+def retrievability(stability, elapsed_days, weights):
+    """
+    Retrievability for arrays of cards.
+
+    Args:
+        stability: Array of memory stabilities
+        elapsed_days: Array of days since each card's last review
+        weights: FSRS weights tuple
+
+    Returns:
+        Array of recall probabilities (0 where stability is unset)
+    """
+    decay, factor = decay_and_factor(weights)
+    stability = np.asarray(stability, dtype=np.float64)
+    elapsed_days = np.maximum(np.asarray(elapsed_days, dtype=np.float64), 0)
+
+    result = np.zeros_like(stability)
+    known = stability > 0
+    result[known] = (1 + factor * elapsed_days[known] / stability[known]) ** decay
+    return result
+
+
+def next_interval(stability, request_retention, maximum_interval, weights):
+    """
+    Whole-day intervals that bring each card down to the requested retention.
+
+    Fuzzing is not applied, so bulk rescheduling is deterministic.
+    """
+    decay, factor = decay_and_factor(weights)
+    stability = np.asarray(stability, dtype=np.float64)
+    interval = stability / factor * (request_retention ** (1 / decay) - 1)
+    return np.clip(np.round(interval), 1, maximum_interval).astype(np.int64)
+
+
+def julian_to_db_strings(julian_days):
+    """Format julian days as the naive UTC timestamps SQLAlchemy stores."""
+    micros = np.round((julian_days - UNIX_EPOCH_JULIAN_DAY) * 86400e6)
+    stamps = micros.astype("datetime64[us]")
+    return np.char.replace(np.datetime_as_string(stamps, unit="us"), "T", " ")
+
+
+@contextmanager
+def raw_connection(conn=None):
+    """
+    DBAPI connection for bulk statements.
+
+    A caller's connection is used as is, inside the caller's transaction.
+    Otherwise a pooled connection is checked out and committed on exit.
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    conn = db.engine.raw_connection()
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_deck_arrays(deck_id, now=None, conn=None) -> dict:
+    """
+    Load a deck's scheduling state into arrays.
+
+    The last review time is recovered as due - scheduled_days, which avoids
+    joining the reviews table.
+
+    Args:
+        deck_id: ID of the deck
+        now: Time to measure elapsed days against (defaults to now)
+        conn: DBAPI connection to read through (optional)
+
+    Returns:
+        Dictionary of arrays: id, stability, difficulty, state,
+        scheduled_days, last_review (julian day) and elapsed_days
+    """
+    now = now or datetime.now(timezone.utc)
+    now_jd = now.timestamp() / 86400 + UNIX_EPOCH_JULIAN_DAY
+
+    # Plain DBAPI tuples; numpy converts SQLAlchemy Row objects very slowly
+    with raw_connection(conn) as conn:
+        rows = (
+            conn.cursor()
+            .execute(
+                "SELECT id, COALESCE(stability, 0), COALESCE(difficulty, 0), "
+                "COALESCE(state, 0), COALESCE(scheduled_days, 0), "
+                "julianday(due) - COALESCE(scheduled_days, 0) "
+                "FROM cards WHERE deck_id = ?",
+                (deck_id,),
+            )
+            .fetchall()
+        )
+
+    if rows:
+        data = np.array(rows, dtype=np.float64)
+    else:
+        data = np.empty((0, 6), dtype=np.float64)
+
+    last_review = np.nan_to_num(data[:, 5], nan=now_jd)
+    return {
+        "id": data[:, 0].astype(np.int64),
+        "stability": data[:, 1],
+        "difficulty": data[:, 2],
+        "state": data[:, 3].astype(np.int64),
+        "scheduled_days": data[:, 4].astype(np.int64),
+        "last_review": last_review,
+        "elapsed_days": now_jd - last_review,
+    }
+
+
+def deck_retrievability(deck, now=None):
+    """
+    Current retrievability of every card in a deck.
+
+    Returns:
+        Tuple of (card id array, retrievability array)
+    """
+    arrays = load_deck_arrays(deck.id, now)
+    weights = parse_weights(deck.w)
+    return arrays["id"], retrievability(
+        arrays["stability"], arrays["elapsed_days"], weights
+    )
+
+
+def reschedule_deck(deck, now=None, conn=None) -> int:
+    """
+    Recompute the FSRS interval of every reviewed card in a deck.
+
+    Used after the deck's request_retention, maximum_interval or weights
+    change. New cards are left untouched.
+
+    Args:
+        deck: Deck whose cards to reschedule
+        now: Reference time for loading state (defaults to now)
+        conn: DBAPI connection to write through (optional)
+
+    Returns:
+        Number of cards rescheduled
+    """
+    arrays = load_deck_arrays(deck.id, now, conn)
+    reviewed = (arrays["state"] > 0) & (arrays["stability"] > 0)
+    if not reviewed.any():
+        return 0
+
+    weights = parse_weights(deck.w)
+    intervals = next_interval(
+        arrays["stability"][reviewed],
+        deck.request_retention or 0.9,
+        deck.maximum_interval or 36500,
+        weights,
+    )
+    due = julian_to_db_strings(arrays["last_review"][reviewed] + intervals)
+
+    with raw_connection(conn) as conn:
+        conn.cursor().executemany(
+            "UPDATE cards SET due = ?, scheduled_days = ? WHERE id = ?",
+            zip(due.tolist(), intervals.tolist(), arrays["id"][reviewed].tolist()),
+        )
+
+    return int(reviewed.sum())
+
+
+def cap_intervals(deck, conn=None) -> int:
+    """
+    Shorten intervals longer than the deck's maximum interval.
+
+    SM-2 intervals do not depend on a target retention, so a lower maximum
+    interval is the only deck change that moves them.
+
+    Args:
+        deck: Deck whose cards to reschedule
+        conn: DBAPI connection to write through (optional)
+
+    Returns:
+        Number of cards rescheduled
+    """
+    arrays = load_deck_arrays(deck.id, conn=conn)
+    maximum_interval = deck.maximum_interval or 36500
+    over = arrays["scheduled_days"] > maximum_interval
+    if not over.any():
+        return 0
+
+    due = julian_to_db_strings(arrays["last_review"][over] + maximum_interval)
+
+    with raw_connection(conn) as conn:
+        conn.cursor().executemany(
+            "UPDATE cards SET due = ?, scheduled_days = ? WHERE id = ?",
+            (
+                (stamp, maximum_interval, card_id)
+                for stamp, card_id in zip(due.tolist(), arrays["id"][over].tolist())
+            ),
+        )
+
+    return int(over.sum())
+
+
+def initial_stability(rating, weights):
+    """Stability after a card's first review, for ratings 0=Again .. 3=Easy."""
+    return np.maximum(np.asarray(weights[:4], dtype=np.float64)[rating], STABILITY_MIN)
+
+
+def initial_difficulty(rating, weights, clamp=True):
+    """Difficulty after a card's first review, for ratings 0=Again .. 3=Easy."""
+    difficulty = weights[4] - np.exp(weights[5] * rating) + 1
+    return np.clip(difficulty, 1.0, 10.0) if clamp else difficulty
+
+
+def next_difficulty(difficulty, rating, weights):
+    """Difficulty after a review, with linear damping and mean reversion."""
+    delta = -weights[6] * (rating - 2)
+    damped = difficulty + (10.0 - difficulty) * delta / 9.0
+    target = initial_difficulty(3, weights, clamp=False)
+    return np.clip(weights[7] * target + (1 - weights[7]) * damped, 1.0, 10.0)
+
+
+def next_stability(difficulty, stability, recall, rating, weights):
+    """
+    Stability after a review at least a day after the previous one.
+
+    Args:
+        difficulty: Array of difficulties before the review
+        stability: Array of stabilities before the review
+        recall: Array of retrievabilities at the time of the review
+        rating: Array of ratings (0=Again .. 3=Easy)
+        weights: FSRS weights tuple
+
+    Returns:
+        Array of new stabilities
+    """
+    hard_penalty = np.where(rating == 1, weights[15], 1.0)
+    easy_bonus = np.where(rating == 3, weights[16], 1.0)
+    recalled = stability * (
+        1
+        + np.exp(weights[8])
+        * (11 - difficulty)
+        * stability ** -weights[9]
+        * (np.exp((1 - recall) * weights[10]) - 1)
+        * hard_penalty
+        * easy_bonus
+    )
+
+    forgotten = np.minimum(
+        weights[11]
+        * difficulty ** -weights[12]
+        * ((stability + 1) ** weights[13] - 1)
+        * np.exp((1 - recall) * weights[14]),
+        stability / np.exp(weights[17] * weights[18]),
+    )
+
+    return np.maximum(np.where(rating == 0, forgotten, recalled), STABILITY_MIN)
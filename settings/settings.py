@@ -28,6 +28,17 @@ class Settings:
             "window_height": 1200,
             "window_x": -1,
             "window_y": -1,
+            "max_code_block_lines": 20,
+            "max_table_rows": 12,
+            "message_retention_days": 180,
+            "message_full_text_days": 30,
+            "message_max_rows": 50000,
+            "backup_interval_hours": 24,
+            "backup_keep": 7,
+            "backup_compress": False,
+            "sql_profiling": False,
+            "sql_slow_query_ms": 50,
+            "profiling": False,
         }
 
         self._load_settings()
@@ -117,6 +128,94 @@ class Settings:
     def window_y(self, value: int) -> None:
         self.set("window_y", value)
 
+    @property
+    def max_code_block_lines(self) -> int:
+        return self.get("max_code_block_lines", 20)
+
+    @max_code_block_lines.setter
+    def max_code_block_lines(self, value: int) -> None:
+        self.set("max_code_block_lines", value)
+
+    @property
+    def max_table_rows(self) -> int:
+        return self.get("max_table_rows", 12)
+
+    @max_table_rows.setter
+    def max_table_rows(self, value: int) -> None:
+        self.set("max_table_rows", value)
+
+    @property
+    def message_retention_days(self) -> int:
+        return self.get("message_retention_days", 180)
+
+    @message_retention_days.setter
+    def message_retention_days(self, value: int) -> None:
+        self.set("message_retention_days", value)
+
+    @property
+    def message_full_text_days(self) -> int:
+        return self.get("message_full_text_days", 30)
+
+    @message_full_text_days.setter
+    def message_full_text_days(self, value: int) -> None:
+        self.set("message_full_text_days", value)
+
+    @property
+    def message_max_rows(self) -> int:
+        return self.get("message_max_rows", 50000)
+
+    @message_max_rows.setter
+    def message_max_rows(self, value: int) -> None:
+        self.set("message_max_rows", value)
+
+    @property
+    def backup_interval_hours(self) -> int:
+        return self.get("backup_interval_hours", 24)
+
+    @backup_interval_hours.setter
+    def backup_interval_hours(self, value: int) -> None:
+        self.set("backup_interval_hours", value)
+
+    @property
+    def backup_keep(self) -> int:
+        return self.get("backup_keep", 7)
+
+    @backup_keep.setter
+    def backup_keep(self, value: int) -> None:
+        self.set("backup_keep", value)
+
+    @property
+    def backup_compress(self) -> bool:
+        return self.get("backup_compress", False)
+
+    @backup_compress.setter
+    def backup_compress(self, value: bool) -> None:
+        self.set("backup_compress", value)
+
+    @property
+    def sql_profiling(self) -> bool:
+        return self.get("sql_profiling", False)
+
+    @sql_profiling.setter
+    def sql_profiling(self, value: bool) -> None:
+        self.set("sql_profiling", value)
+
+    @property
+    def sql_slow_query_ms(self) -> int:
+        return self.get("sql_slow_query_ms", 50)
+
+    @sql_slow_query_ms.setter
+    def sql_slow_query_ms(self, value: int) -> None:
+        self.set("sql_slow_query_ms", value)
+
+    @property
+    def profiling(self) -> bool:
+        return self.get("profiling", False)
+
+    @profiling.setter
+    def profiling(self, value: bool) -> None:
+        self.set("profiling", value)
+
 
 # Global settings instance
 settings = Settings()
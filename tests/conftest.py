@@ -0,0 +1,62 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# Application modules resolve the data directory and settings file on
+# import, so point them at a throwaway home before any test imports them
+_home = tempfile.mkdtemp(prefix="quint-tests-")
+os.environ.update({"HOME": _home, "XDG_DATA_HOME": _home, "LOCALAPPDATA": _home})
+
+# Reference time for due dates in tests, as naive UTC like the database
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def make_deck():
+    """Create decks in the test database, removed with their cards afterwards."""
+    from database import services
+    from database.database import db
+    from database.models import Card, Deck
+
+    created = []
+
+    def make(**columns):
+        deck = services.create_deck(f"Test deck {len(created)}", **columns)
+        created.append(deck.id)
+        return deck
+
+    yield make
+
+    db.session.rollback()
+    for (card_id,) in db.session.query(Card.id).filter(Card.deck_id.in_(created)):
+        services.delete_card(card_id)
+    db.session.query(Deck).filter(Deck.id.in_(created)).delete()
+    db.session.commit()
+
+
+@pytest.fixture
+def deck(make_deck):
+    """A fresh deck in the test database."""
+    return make_deck()
+
+
+@pytest.fixture
+def add_card(deck):
+    """Add a card to the test deck, due the given number of days from NOW."""
+    from database.database import db
+    from database.models import Card
+
+    def add(days=0, deck_id=None, **columns):
+        card = Card(
+            deck_id=deck_id or deck.id,
+            path="card.md",
+            due=NOW + timedelta(days=days),
+            **columns,
+        )
+        db.session.add(card)
+        db.session.commit()
+        return card
+
+    return add
@@ -0,0 +1,54 @@
+import os
+import time
+from datetime import datetime
+
+from database.backup import (
+    STALE_TMP_SECONDS,
+    list_snapshots,
+    rotate_backups,
+    snapshot_name,
+)
+
+
+def touch(path, age=0):
+    path.write_text("")
+    if age:
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+
+
+def test_list_snapshots_skips_partial_copies(tmp_path):
+    touch(tmp_path / "decks-20260101-120000.db")
+    touch(tmp_path / "decks-20260101-120000.manifest.json")
+    touch(tmp_path / "decks-20260102-120000-000001.zip")
+    touch(tmp_path / "decks-20260103-120000-000001.db.tmp")
+    touch(tmp_path / "decks-notes.db")
+
+    snapshots = list_snapshots(tmp_path)
+
+    assert [stem for stem, _ in snapshots] == [
+        "decks-20260101-120000",
+        "decks-20260102-120000-000001",
+    ]
+    assert len(snapshots[0][1]) == 2
+
+
+def test_snapshot_names_within_a_second_differ():
+    first = datetime(2026, 1, 1, 12, 0, 0, 1000)
+    second = first.replace(microsecond=2000)
+    assert snapshot_name(first) < snapshot_name(second)
+
+
+def test_rotation_keeps_newest_and_drops_stale_tmp(tmp_path):
+    for day in range(1, 4):
+        touch(tmp_path / f"decks-2026010{day}-120000-000000.db")
+    touch(tmp_path / "decks-20260104-120000-000000.db.tmp", age=STALE_TMP_SECONDS * 2)
+    touch(tmp_path / "decks-20260105-120000-000000.db.tmp")
+
+    rotate_backups(tmp_path, keep=2)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "decks-20260102-120000-000000.db",
+        "decks-20260103-120000-000000.db",
+        "decks-20260105-120000-000000.db.tmp",
+    ]
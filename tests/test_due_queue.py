@@ -0,0 +1,79 @@
+import sqlite3
+from datetime import timedelta
+
+from conftest import NOW
+from database.database import DB_PATH, db
+from database.due_queue import due_queue, due_key
+from database.write_queue import write_queue
+
+
+def test_next_card_is_the_earliest_due(deck, add_card):
+    add_card(days=2)
+    earliest = add_card(days=-1)
+
+    assert due_queue.next_card(deck.id) == earliest.id
+    assert due_queue.next_card(deck.id, before=NOW) == earliest.id
+    assert due_queue.next_card(deck.id, before=NOW - timedelta(days=2)) is None
+
+
+def test_orm_commits_update_a_loaded_heap(deck, add_card):
+    first = add_card(days=0)
+    second = add_card(days=1)
+    assert due_queue.next_card(deck.id) == first.id
+
+    first.due = NOW + timedelta(days=5)
+    db.session.commit()
+    assert due_queue.next_card(deck.id) == second.id
+
+    db.session.delete(second)
+    db.session.commit()
+    assert due_queue.next_card(deck.id) == first.id
+
+
+def test_bulk_jobs_invalidate_the_heap(deck, add_card):
+    first = add_card(days=0)
+    second = add_card(days=1)
+    assert due_queue.next_card(deck.id) == first.id
+
+    # Rescheduling jobs write without reporting which cards moved
+    write_queue.execute(
+        lambda session: session.connection().exec_driver_sql(
+            "UPDATE cards SET due = ? WHERE id = ?",
+            (due_key(NOW + timedelta(days=9)), first.id),
+        )
+    )
+    write_queue.flush()
+
+    assert due_queue.next_card(deck.id) == second.id
+
+
+def test_external_writes_invalidate_the_heap(deck, add_card):
+    first = add_card(days=0)
+    second = add_card(days=1)
+    assert due_queue.next_card(deck.id) == first.id
+
+    conn = sqlite3.connect(DB_PATH)
+    with conn:
+        conn.execute(
+            "UPDATE cards SET due = ? WHERE id = ?",
+            (due_key(NOW + timedelta(days=9)), first.id),
+        )
+    conn.close()
+
+    assert due_queue.next_card(deck.id) == second.id
+
+
+def test_invalidate_rebuilds_from_the_database(deck, add_card):
+    first = add_card(days=0)
+    second = add_card(days=1)
+    assert due_queue.next_card(deck.id) == first.id
+
+    # A write the queue was not told about, then an explicit invalidation
+    db.session.connection().exec_driver_sql(
+        "UPDATE cards SET due = ? WHERE id = ?",
+        (due_key(NOW + timedelta(days=9)), first.id),
+    )
+    db.session.commit()
+    due_queue.invalidate(deck.id)
+
+    assert due_queue.next_card(deck.id) == second.id
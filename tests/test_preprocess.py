@@ -0,0 +1,64 @@
+from flows import preprocess
+from flows.preprocess import normalize_content, normalize_markdown
+from settings.settings import settings
+
+
+def test_strips_low_value_markup():
+    text = (
+        "---\ntitle: Note\n---\n"
+        "# Heading\r\n"
+        "<!-- draft -->\n"
+        "See [the docs](https://example.com) and ![diagram](d.png) ![](x.png)\n"
+        "Line<br>break   with   spaces\n"
+        "\n\n\n\n"
+        "[ref]: https://example.com\n"
+        "End\n"
+    )
+
+    assert normalize_markdown(text) == (
+        "# Heading\n\n"
+        "See the docs and [image: diagram]\n"
+        "Line break with spaces\n\n"
+        "End\n"
+    )
+
+
+def test_truncates_code_blocks_and_tables():
+    code = "```python\n" + "\n".join(f"line {i}" for i in range(5)) + "\n```\n"
+    table = "| a | b |\n|---|---|\n" + "".join(f"| {i} | x |\n" for i in range(4))
+
+    normalized = normalize_markdown(code + table, max_code_lines=2, max_table_rows=1)
+
+    assert normalized.split("\n") == [
+        "```python",
+        "line 0",
+        "line 1",
+        "... (3 more lines)",
+        "```",
+        "| a | b |",
+        "| --- | --- |",
+        "| 0 | x |",
+        "... (3 more rows)",
+        "",
+    ]
+
+
+def test_headings_inside_code_are_kept_verbatim():
+    text = "```\n#   not   a heading\n[x](y)\n```\n"
+    assert normalize_markdown(text, max_code_lines=10) == text
+
+
+def test_cache_key_includes_the_truncation_rules(monkeypatch):
+    monkeypatch.setattr(preprocess, "_cache", preprocess.OrderedDict())
+    monkeypatch.setitem(settings._settings, "max_code_block_lines", 1)
+    text = "```\na\nb\nc\n```\n"
+
+    first = normalize_content(text)
+    assert normalize_content(text) is first
+    assert "2 more lines" in first["text"]
+
+    monkeypatch.setitem(settings._settings, "max_code_block_lines", 10)
+    second = normalize_content(text)
+    assert second is not first
+    assert second["hash"] == first["hash"]
+    assert "more lines" not in second["text"]
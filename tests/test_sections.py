@@ -0,0 +1,43 @@
+from flows.sections import MIN_SECTION_TOKENS, split_sections
+
+# Enough prose for a section to stand on its own
+LONG = "word " * (MIN_SECTION_TOKENS + 10)
+
+
+def test_short_note_is_one_section():
+    text = "# Title\n\nIntro.\n\n## First\n\nOne.\n\n## Second\n\nTwo.\n"
+
+    sections = split_sections(text)
+
+    assert len(sections) == 1
+    assert sections[0]["heading"] == "Title"
+    assert "## Second" in sections[0]["text"]
+
+
+def test_long_sections_stand_alone():
+    text = f"# Title\n\n{LONG}\n\n## Small\n\nShort.\n\n## Big\n\n{LONG}\n"
+
+    sections = split_sections(text)
+
+    assert [s["heading"] for s in sections] == ["Title", "Big"]
+    assert "## Small" in sections[0]["text"]
+
+
+def test_editing_a_section_keeps_the_others():
+    before = split_sections(f"# A\n\n{LONG}\n\n## B\n\n{LONG}\n\n## C\n\n{LONG}\n")
+    after = split_sections(
+        f"# A\n\n{LONG}\n\n## B\n\nEdited.\n{LONG}\n\n## C\n\n{LONG}\n"
+    )
+
+    assert [s["hash"] for s in before] != [s["hash"] for s in after]
+    assert before[0]["hash"] == after[0]["hash"]
+    assert before[2]["hash"] == after[2]["hash"]
+
+
+def test_headings_in_code_blocks_do_not_split():
+    text = f"# A\n\n```\n# not a heading\n{LONG}\n```\n"
+
+    sections = split_sections(text)
+
+    assert len(sections) == 1
+    assert "# not a heading" in sections[0]["text"]
@@ -0,0 +1,30 @@
+from database import services
+from database.database import db
+from database.models import Card, CardSection, Message, Review
+
+
+def test_delete_reviewed_card(deck, add_card):
+    card = add_card()
+    card_id = card.id
+    db.session.add_all(
+        [
+            Review(card_id=card_id, rating=2),
+            Review(card_id=card_id, rating=0),
+            CardSection(card_id=card_id, position=0, content_hash="0" * 64),
+            Message(card_id=card_id, kind="judge", message="prompt"),
+        ]
+    )
+    db.session.commit()
+
+    assert services.delete_card(card_id)
+
+    assert db.session.get(Card, card_id) is None
+    for model in (Review, CardSection, Message):
+        assert db.session.query(model).filter(model.card_id == card_id).count() == 0
+
+    # The shared session is still usable afterwards
+    assert any(stats["id"] == deck.id for stats in services.get_all_deck_stats())
+
+
+def test_delete_missing_card():
+    assert not services.delete_card(-1)
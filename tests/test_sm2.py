@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from scheduler.sm2 import MIN_EASE, SM2Scheduler
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def make_scheduler(maximum_interval=36500):
+    deck = SimpleNamespace(enable_fuzz=False, maximum_interval=maximum_interval)
+    return SM2Scheduler(deck)
+
+
+def reviewed_card(ease=2.5, interval=10):
+    return SimpleNamespace(state=2, anki_difficulty=ease, scheduled_days=interval)
+
+
+def test_new_card_climbs_one_six_then_ease():
+    scheduler = make_scheduler()
+
+    reviews = [(NOW + timedelta(days=day), 2) for day in (0, 1, 7, 22)]
+    intervals = [values["scheduled_days"] for values in review_all(scheduler, reviews)]
+
+    # Good (quality 4) leaves the ease at 2.5
+    assert intervals == [1, 6, 15, round(15 * 2.5)]
+
+
+def test_good_raises_and_hard_lowers_ease():
+    scheduler = make_scheduler()
+
+    good = scheduler.review(reviewed_card(), 2, NOW - timedelta(days=10), NOW)
+    hard = scheduler.review(reviewed_card(), 1, NOW - timedelta(days=10), NOW)
+    easy = scheduler.review(reviewed_card(), 3, NOW - timedelta(days=10), NOW)
+
+    assert good["anki_difficulty"] == pytest.approx(2.5)
+    assert hard["anki_difficulty"] == pytest.approx(2.36)
+    assert easy["anki_difficulty"] == pytest.approx(2.6)
+    assert good["scheduled_days"] == 25
+    assert easy["scheduled_days"] == round(10 * 2.6 * 1.3)
+
+
+def test_lapse_resets_interval_and_keeps_ease():
+    scheduler = make_scheduler()
+
+    values = scheduler.review(reviewed_card(ease=2.2), 0, NOW - timedelta(days=10), NOW)
+
+    assert values["anki_difficulty"] == pytest.approx(2.2)
+    assert values["scheduled_days"] == 1
+    assert values["state"] == 3
+    assert values["due"] == NOW + timedelta(days=1)
+    assert values["elapsed_days"] == 10
+
+
+def test_ease_never_drops_below_minimum():
+    scheduler = make_scheduler()
+
+    values = scheduler.review(reviewed_card(ease=MIN_EASE), 1, NOW, NOW)
+
+    assert values["anki_difficulty"] == MIN_EASE
+
+
+def test_interval_is_capped_by_the_deck():
+    scheduler = make_scheduler(maximum_interval=30)
+
+    values = scheduler.review(reviewed_card(interval=100), 2, NOW, NOW)
+
+    assert values["scheduled_days"] == 30
+
+
+def test_replay_matches_step_by_step_reviews():
+    scheduler = make_scheduler()
+    reviews = [
+        (NOW + timedelta(days=day), rating)
+        for day, rating in [(0, 2), (1, 2), (7, 0), (8, 2), (14, 3)]
+    ]
+
+    assert scheduler.replay(reviews) == review_all(scheduler, reviews)[-1]
+
+
+def review_all(scheduler, reviews) -> list:
+    """Review a new card in turn and return the columns after each review."""
+    card = scheduler.blank_card()
+    last_review = None
+    history = []
+    for reviewed_at, rating in reviews:
+        values = scheduler.review(card, rating, last_review, reviewed_at)
+        last_review = values.pop("last_review")
+        for key, value in values.items():
+            setattr(card, key, value)
+        history.append(values)
+    return history
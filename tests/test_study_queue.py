@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+from conftest import NOW
+from database.database import db
+from database.models import Card, Review
+from flows.study_queue import merge_due_cards
+
+CUTOFF = NOW + timedelta(days=1)
+
+
+def merged(*decks, cutoff=CUTOFF) -> list:
+    return list(merge_due_cards([deck.id for deck in decks], cutoff))
+
+
+def test_interleaves_decks_by_due_time(make_deck, add_card):
+    first, second = make_deck(), make_deck()
+    a = add_card(days=-3, deck_id=first.id, state=2)
+    b = add_card(days=-2, deck_id=second.id, state=2)
+    c = add_card(days=-1, deck_id=first.id, state=0)
+    d = add_card(days=0, deck_id=second.id, state=0)
+    add_card(days=2, deck_id=first.id, state=2)  # Past the cutoff
+
+    assert merged(first, second) == [
+        (first.id, a.id),
+        (second.id, b.id),
+        (first.id, c.id),
+        (second.id, d.id),
+    ]
+
+
+def test_limits_apply_per_deck(make_deck, add_card):
+    small = make_deck(new_per_day=1, reviews_per_day=2)
+    large = make_deck(new_per_day=3, reviews_per_day=3)
+    for day in range(-5, 0):
+        for deck in (small, large):
+            add_card(days=day, deck_id=deck.id, state=0)
+            add_card(days=day, deck_id=deck.id, state=2)
+
+    result = merged(small, large)
+
+    def count(deck, new):
+        return sum(
+            1
+            for deck_id, card_id in result
+            if deck_id == deck.id and (db.session.get(Card, card_id).state == 0) == new
+        )
+
+    assert (count(small, True), count(small, False)) == (1, 2)
+    assert (count(large, True), count(large, False)) == (3, 3)
+
+
+def test_todays_reviews_use_up_the_allowance(deck, add_card):
+    deck.new_per_day, deck.reviews_per_day = 2, 2
+    db.session.commit()
+    studied_new = add_card(days=-9, state=2)
+    studied_seen = add_card(days=-9, state=2)
+    now = datetime.utcnow()
+    db.session.add_all(
+        [
+            Review(card_id=studied_new.id, rating=2, state_before=0, reviewed_at=now),
+            Review(card_id=studied_seen.id, rating=2, state_before=2, reviewed_at=now),
+            Review(
+                card_id=studied_seen.id,
+                rating=2,
+                state_before=2,
+                reviewed_at=now - timedelta(days=2),
+            ),
+        ]
+    )
+    db.session.commit()
+    new = [add_card(days=-2, state=0), add_card(days=-1, state=0)]
+    add_card(days=-3, state=2)
+
+    result = [card_id for _, card_id in merged(deck)]
+
+    # One new and one seen card left of the two each allowed today
+    assert len(result) == 2
+    assert new[0].id in result and new[1].id not in result
+
+
+def test_exhausted_decks_are_skipped(deck, add_card):
+    deck.new_per_day, deck.reviews_per_day = 0, 0
+    db.session.commit()
+    add_card(days=-1, state=0)
+    add_card(days=-1, state=2)
+
+    assert merged(deck) == []
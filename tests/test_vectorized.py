@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from fsrs import Card, Scheduler, State
+
+from scheduler.vectorized import next_interval, retrievability
+
+WEIGHTS = Scheduler().parameters
+STABILITIES = [0.1, 0.5, 1.0, 3.7, 12.0, 45.5, 180.0, 900.0, 5000.0]
+
+
+@pytest.mark.parametrize("retention", [0.7, 0.85, 0.9, 0.97])
+@pytest.mark.parametrize("maximum_interval", [36500, 100])
+def test_next_interval_matches_fsrs(retention, maximum_interval):
+    scheduler = Scheduler(
+        desired_retention=retention,
+        maximum_interval=maximum_interval,
+        enable_fuzzing=False,
+    )
+    expected = [scheduler._next_interval(stability=s) for s in STABILITIES]
+
+    intervals = next_interval(STABILITIES, retention, maximum_interval, WEIGHTS)
+
+    assert intervals.tolist() == expected
+
+
+def test_retrievability_matches_fsrs():
+    scheduler = Scheduler()
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    elapsed = [0, 1, 5, 30, 400]
+    stabilities = [2.0, 2.0, 10.0, 10.0, 100.0]
+    expected = [
+        scheduler.get_card_retrievability(
+            Card(
+                state=State.Review,
+                stability=stability,
+                difficulty=5.0,
+                last_review=now - timedelta(days=days),
+            ),
+            now,
+        )
+        for stability, days in zip(stabilities, elapsed)
+    ]
+
+    assert retrievability(stabilities, elapsed, WEIGHTS) == pytest.approx(expected)
+
+
+def test_retrievability_is_zero_for_new_cards():
+    result = retrievability([0.0, 5.0], [3, 3], WEIGHTS)
+
+    assert result[0] == 0
+    assert 0 < result[1] < 1
+    assert np.all(retrievability([5.0], [-2], WEIGHTS) == 1)
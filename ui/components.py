@@ -2,25 +2,50 @@
 Shared UI components for consistent styling and behavior across pages.
 """
 
+from collections import OrderedDict
+
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor, QIcon, QPainter, QPixmap
 from PyQt5.QtSvg import QSvgRenderer
 from PyQt5.QtWidgets import (
+    QApplication,
     QFileDialog,
     QHBoxLayout,
     QLabel,
     QLineEdit,
     QPushButton,
+    QStackedWidget,
     QWidget,
 )
 
 from .theme import COLORS, FONT_FAMILY
 
 
+# Most recently used icons kept by create_colored_icon
+ICON_CACHE_SIZE = 128
+
+# Icons every session shows, rendered by prewarm_icons at startup
+PREWARM_ICONS = (
+    ("resources/left_arrow.svg", "#ff6b35", 24),
+    ("resources/left_arrow.svg", COLORS["bg_soft"], 24),
+    ("resources/decks.svg", COLORS["highlight"], 24),
+    ("resources/stats.svg", COLORS["highlight"], 24),
+    ("resources/gear.svg", COLORS["highlight"], 24),
+    ("resources/gear.svg", COLORS["fg"], 32),
+    ("resources/trash.svg", "#ff4444", 24),
+)
+
+_icon_cache = OrderedDict()  # (svg_path, color, size, dpr) -> QIcon
+_renderers = {}  # svg_path -> QSvgRenderer
+
+
 def create_colored_icon(svg_path: str, color: str, size: int = 24) -> QIcon:
     """
     Create a colored icon from an SVG file.
 
+    Icons are cached by path, color, size and device pixel ratio, and each
+    SVG file is parsed once, so repeated calls are a dictionary lookup.
+
     Args:
         svg_path: Path to SVG file
         color: Hex color string (e.g., "#e78a4e")
@@ -29,27 +54,39 @@ def create_colored_icon(svg_path: str, color: str, size: int = 24) -> QIcon:
     Returns:
         QIcon with the specified color
     """
-    # Create a pixmap with the desired size
-    pixmap = QPixmap(size, size)
-    pixmap.fill(Qt.transparent)
+    app = QApplication.instance()
+    ratio = app.devicePixelRatio() if app else 1.0
+    key = (svg_path, color, size, ratio)
+
+    icon = _icon_cache.get(key)
+    if icon is not None:
+        _icon_cache.move_to_end(key)
+        return icon
 
-    # Render SVG to pixmap
-    renderer = QSvgRenderer(svg_path)
+    renderer = _renderers.get(svg_path)
+    if renderer is None:
+        renderer = _renderers[svg_path] = QSvgRenderer(svg_path)
+
+    # Render SVG at device resolution, then tint it in place
+    pixmap = QPixmap(round(size * ratio), round(size * ratio))
+    pixmap.fill(Qt.transparent)
     painter = QPainter(pixmap)
     renderer.render(painter)
-    painter.end()
-
-    # Apply color overlay
-    colored_pixmap = QPixmap(size, size)
-    colored_pixmap.fill(Qt.transparent)
-    painter = QPainter(colored_pixmap)
-    painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-    painter.drawPixmap(0, 0, pixmap)
     painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-    painter.fillRect(colored_pixmap.rect(), QColor(color))
+    painter.fillRect(pixmap.rect(), QColor(color))
     painter.end()
+    pixmap.setDevicePixelRatio(ratio)
+
+    icon = _icon_cache[key] = QIcon(pixmap)
+    if len(_icon_cache) > ICON_CACHE_SIZE:
+        _icon_cache.popitem(last=False)
+    return icon
+
 
-    return QIcon(colored_pixmap)
+def prewarm_icons():
+    """Render the icons every session uses ahead of building the pages."""
+    for svg_path, color, size in PREWARM_ICONS:
+        create_colored_icon(svg_path, color, size)
 
 
 class BackButton(QPushButton):
@@ -263,3 +300,43 @@ class FileSelector(QWidget):
         if file_path:
             self.file_input.setText(file_path)
             self.fileSelected.emit(file_path)
+
+
+class LazyStackedWidget(QStackedWidget):
+    """
+    Stacked widget whose pages are built the first time they are needed.
+
+    Each slot holds an empty placeholder until setCurrentIndex or page asks
+    for it, so startup only builds the page it shows.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._factories = {}  # placeholder -> factory
+
+    def add_lazy_page(self, factory) -> int:
+        """Reserve a slot for the page the factory builds."""
+        placeholder = QWidget()
+        self._factories[placeholder] = factory
+        return self.addWidget(placeholder)
+
+    def page(self, index):
+        """Get the page at an index, building it if needed."""
+        placeholder = self.widget(index)
+        factory = self._factories.pop(placeholder, None)
+        if factory is None:
+            return placeholder
+
+        was_current = self.currentIndex() == index
+        page = factory()
+        self.insertWidget(index, page)
+        self.removeWidget(placeholder)
+        placeholder.deleteLater()
+        if was_current:
+            super().setCurrentIndex(index)
+        return page
+
+    def setCurrentIndex(self, index):
+        self.page(index)
+        super().setCurrentIndex(index)
+
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from database import services
+from database.models import Card, Review
+from database.write_queue import write_queue
+
+
+class DueWatcher(QObject):
+    """
+    Signals when a deck's due count changes, without polling.
+
+    Due counts include every seen card due before the end of the current
+    day (services.get_today_end), so time alone only changes a count when
+    the day rolls over, and only for decks whose next due card falls in
+    the new day. The watcher keeps each deck's next due time beyond today
+    from an index lookup and arms one single-shot timer for the rollover.
+    Cards written through the write queue refresh their decks directly.
+    """
+
+    deck_changed = pyqtSignal(int)
+    day_changed = pyqtSignal()
+
+    # Emitted from the write queue thread, delivered on the UI thread
+    _cards_written = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._next_due = {}  # deck_id -> next due time beyond today, or None
+        self._day_end = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_rollover)
+
+        self._cards_written.connect(self._on_cards_written)
+        write_queue.add_listener(self._on_writes)
+
+    def resync(self):
+        """Reload the next due time of every deck and re-arm the timer."""
+        self._day_end = services.get_today_end()
+        self._next_due = {
+            deck.id: services.get_next_due(deck.id, self._day_end)
+            for deck in services.get_all_decks()
+        }
+        self._arm()
+
+    def _arm(self):
+        rollover = self._day_end + timedelta(microseconds=1)
+        delay = (rollover - datetime.now(timezone.utc)).total_seconds()
+        self._timer.start(max(0, int(delay * 1000)) + 1)
+
+    def _on_rollover(self):
+        self._day_end = services.get_today_end()
+        cutoff = self._day_end.replace(tzinfo=None)
+        self.day_changed.emit()
+
+        for deck_id, due in list(self._next_due.items()):
+            if due is not None and due <= cutoff:
+                self._next_due[deck_id] = services.get_next_due(deck_id, self._day_end)
+                self.deck_changed.emit(deck_id)
+
+        self._arm()
+
+    def _on_writes(self, writes):
+        # Runs on the write queue thread; only collect and hand over
+        card_ids = set()
+        for kind, target, values in writes:
+            if kind == "execute":
+                self._cards_written.emit(None)  # Bulk job: any deck may change
+                return
+            if target is Card:
+                card_ids.add(values["id"])
+            elif target is Review:
+                card_ids.add(values["card_id"])
+        if card_ids:
+            self._cards_written.emit(card_ids)
+
+    def _on_cards_written(self, card_ids):
+        if self._day_end is None:
+            return
+        if card_ids is None:
+            deck_ids = list(self._next_due)
+        else:
+            deck_ids = services.get_card_deck_ids(card_ids)
+
+        for deck_id in deck_ids:
+            self._next_due[deck_id] = services.get_next_due(deck_id, self._day_end)
+            self.deck_changed.emit(deck_id)
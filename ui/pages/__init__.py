@@ -1,7 +1,19 @@
-from .menu import MenuPage
-from .decks import DecksPage
-from .chat import ChatPage
-from .stats import StatsPage
-from .settings import SettingsPage
+from importlib import import_module
 
-__all__ = ['MenuPage', 'DecksPage', 'ChatPage', 'StatsPage', 'SettingsPage']
\ No newline at end of file
+# Pages import their flows and SDKs, so they are loaded on first access
+_PAGE_MODULES = {
+    'MenuPage': '.menu',
+    'DecksPage': '.decks',
+    'ChatPage': '.chat',
+    'StatsPage': '.stats',
+    'SettingsPage': '.settings',
+}
+
+
+def __getattr__(name):
+    if name in _PAGE_MODULES:
+        return getattr(import_module(_PAGE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['MenuPage', 'DecksPage', 'ChatPage', 'StatsPage', 'SettingsPage']
@@ -1,33 +1,53 @@
 import asyncio
+from collections import OrderedDict
+from itertools import count
+from pathlib import Path
 
 from PyQt5.QtCore import (
+    QAbstractListModel,
+    QAbstractTableModel,
     QEasingCurve,
+    QEvent,
+    QModelIndex,
+    QPointF,
     QPropertyAnimation,
+    QRect,
+    QRectF,
+    QSize,
     Qt,
     QThread,
     QTimer,
     pyqtSignal,
 )
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QTextLayout, QTextOption
 from PyQt5.QtWidgets import (
+    QAbstractItemView,
     QCheckBox,
     QDialog,
     QDialogButtonBox,
-    QFrame,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
     QListWidgetItem,
     QMessageBox,
     QPushButton,
-    QScrollArea,
     QSizePolicy,
+    QStackedWidget,
+    QStyle,
+    QStyledItemDelegate,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from database import services
+from database.profiler import profiled
 from flows.chat import process_study_card
+from flows.study_queue import process_due_cards
+from utils.profiling import app_profiler
 
 from ..components import FileSelector, create_colored_icon
 from ..template import GenericPage
@@ -38,6 +58,7 @@ class AsyncWorker(QThread):
     """Worker thread for async operations."""
 
     message_ready = pyqtSignal(str, bool)  # message, is_user
+    message_appended = pyqtSignal(str)  # streamed text for the last message
     clear_chat = pyqtSignal()
     scroll_to_bottom = pyqtSignal()
     error_occurred = pyqtSignal(str)
@@ -45,31 +66,35 @@ class AsyncWorker(QThread):
 
     def __init__(self, deck_id):
         super().__init__()
-        self.deck_id = deck_id
+        self.deck_id = deck_id  # None studies every due card across decks
         self._user_input_future = None
         self._event_loop = None
         self.is_loading = False
 
     def run(self):
         """Run the async operation in a separate thread."""
-        try:
-            # Create event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            self._event_loop = loop
+        with app_profiler.thread("worker"):
+            try:
+                # Create event loop for this thread
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._event_loop = loop
 
-            # Start in loading state
-            self.set_loading(True)
+                # Start in loading state
+                self.set_loading(True)
 
-            # Run the async function, passing self as the worker
-            loop.run_until_complete(process_study_card(self.deck_id, self))
+                # Run the async function, passing self as the worker
+                if self.deck_id is None:
+                    loop.run_until_complete(process_due_cards(self))
+                else:
+                    loop.run_until_complete(process_study_card(self.deck_id, self))
 
-        except Exception as e:
-            self.error_occurred.emit(str(e))
-        finally:
-            # End in non-loading state
-            self.set_loading(False)
-            loop.close()
+            except Exception as e:
+                self.error_occurred.emit(str(e))
+            finally:
+                # End in non-loading state
+                self.set_loading(False)
+                loop.close()
 
     async def wait_for_user_input(self):
         """Wait for user input from the chat interface."""
@@ -183,80 +208,189 @@ class LoadingDots(QWidget):
         self.current_dot = (self.current_dot + 1) % len(self.dots)
 
 
-class ChatBubble(QWidget):
-    """A chat bubble widget that can be positioned on left or right side."""
+class ChatMessageModel(QAbstractListModel):
+    """
+    Chat transcript, capped at MAX_MESSAGES by dropping the oldest.
+
+    Every message has a key that changes whenever its text does, so views
+    can cache whatever they derive from the text.
+    """
 
-    def __init__(self, message, is_user=False, parent=None):
+    IS_USER_ROLE = Qt.UserRole
+    KEY_ROLE = Qt.UserRole + 1
+
+    MAX_MESSAGES = 1000
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.message = message
-        self.is_user = is_user
-        self.setup_ui()
+        self._messages = []  # [text, is_user, key]
+        self._keys = count()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        text, is_user, key = self._messages[index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == self.IS_USER_ROLE:
+            return is_user
+        if role == self.KEY_ROLE:
+            return key
+        return None
+
+    def message_key(self, row):
+        return self._messages[row][2]
+
+    def add_message(self, text, is_user=False):
+        """Append a message, dropping the oldest beyond MAX_MESSAGES."""
+        if len(self._messages) >= self.MAX_MESSAGES:
+            dropped = len(self._messages) - self.MAX_MESSAGES + 1
+            self.beginRemoveRows(QModelIndex(), 0, dropped - 1)
+            del self._messages[:dropped]
+            self.endRemoveRows()
+
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append([text, is_user, next(self._keys)])
+        self.endInsertRows()
+
+    def append_text(self, text):
+        """Extend the last message in place, for streamed text."""
+        if not self._messages:
+            self.add_message(text)
+            return
 
-    def setup_ui(self):
-        # Main layout for the bubble container
-        main_layout = QHBoxLayout(self)
-        main_layout.setContentsMargins(20, 5, 20, 5)
-
-        # Create the message bubble
-        bubble = QFrame()
-        bubble.setWordWrap = True
-
-        # Set bubble alignment and width based on sender
-        if self.is_user:
-            # User message: align to right, orange theme
-            main_layout.addStretch(1)  # 25% left space
-            bubble.setStyleSheet(
-                f"""
-                QFrame {{
-                    background-color: {COLORS['highlight']};
-                    border: none;
-                    border-radius: 15px;
-                    padding: 15px 20px;
-                    margin: 5px;
-                }}
-                """
+        message = self._messages[-1]
+        message[0] += text
+        message[2] = next(self._keys)
+        index = self.index(len(self._messages) - 1)
+        self.dataChanged.emit(index, index)
+
+    def clear(self):
+        self.beginResetModel()
+        self._messages.clear()
+        self.endResetModel()
+
+
+class ChatBubbleDelegate(QStyledItemDelegate):
+    """
+    Measures and paints chat bubbles on the left or right side of the view.
+
+    Heights are cached per message key and width for every message, so
+    relayouts after inserts do not lay text out again; full text layouts
+    are kept in a smaller LRU for the bubbles being painted.
+    """
+
+    SIDE_MARGIN = 20
+    ROW_MARGIN = 5
+    BUBBLE_MARGIN = 5
+    PADDING_X = 20
+    PADDING_Y = 15
+    RADIUS = 15
+    WIDTH_SHARE = 0.75  # Bubble width as a share of the row
+
+    LAYOUT_CACHE_SIZE = 256
+    HEIGHT_CACHE_SIZE = 4 * ChatMessageModel.MAX_MESSAGES
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.font = QFont(FONT_FAMILY)
+        self.font.setPixelSize(32)
+        self._layouts = OrderedDict()  # (key, width) -> (QTextLayout, height)
+        self._heights = OrderedDict()  # (key, viewport width) -> row height
+
+    def _bubble_width(self):
+        row_width = self.view.viewport().width() - 2 * self.SIDE_MARGIN
+        return int(row_width * self.WIDTH_SHARE)
+
+    def _text_layout(self, index, bubble_width):
+        key = (index.data(ChatMessageModel.KEY_ROLE), bubble_width)
+        cached = self._layouts.get(key)
+        if cached is not None:
+            self._layouts.move_to_end(key)
+            return cached
+
+        # Line separators break lines inside a single paragraph
+        text = index.data(Qt.DisplayRole).replace("\n", "\u2028")
+        layout = QTextLayout(text, self.font)
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        layout.setTextOption(option)
+
+        text_width = max(
+            bubble_width - 2 * (self.BUBBLE_MARGIN + self.PADDING_X), self.PADDING_X
+        )
+        height = 0.0
+        layout.beginLayout()
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(text_width)
+            line.setPosition(QPointF(0, height))
+            height += line.height()
+        layout.endLayout()
+
+        cached = self._layouts[key] = (layout, height)
+        if len(self._layouts) > self.LAYOUT_CACHE_SIZE:
+            self._layouts.popitem(last=False)
+        return cached
+
+    def sizeHint(self, option, index):
+        # Called for every row on each relayout: keep the cache hit cheap
+        width = self.view.viewport().width()
+        key = (index.model().message_key(index.row()), width)
+        height = self._heights.get(key)
+        if height is None:
+            _, text_height = self._text_layout(index, self._bubble_width())
+            height = self._heights[key] = int(text_height) + 2 * (
+                self.ROW_MARGIN + self.BUBBLE_MARGIN + self.PADDING_Y
             )
+            if len(self._heights) > self.HEIGHT_CACHE_SIZE:
+                self._heights.popitem(last=False)
+        return QSize(width, height)
+
+    def paint(self, painter, option, index):
+        bubble_width = self._bubble_width()
+        layout, height = self._text_layout(index, bubble_width)
+        is_user = index.data(ChatMessageModel.IS_USER_ROLE)
+
+        row = option.rect
+        left = row.left() + self.SIDE_MARGIN
+        if is_user:
+            left = row.right() - self.SIDE_MARGIN - bubble_width
+        bubble = QRectF(
+            left + self.BUBBLE_MARGIN,
+            row.top() + self.ROW_MARGIN + self.BUBBLE_MARGIN,
+            bubble_width - 2 * self.BUBBLE_MARGIN,
+            height + 2 * self.PADDING_Y,
+        )
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if is_user:
+            # User message: orange theme
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(COLORS["highlight"]))
             text_color = COLORS["bg_hard"]
         else:
-            # Assistant message: align to left, dark theme
-            bubble.setStyleSheet(
-                f"""
-                QFrame {{
-                    background-color: {COLORS['bg_hard']};
-                    border: 1px solid {COLORS['fg_faded']};
-                    border-radius: 15px;
-                    padding: 15px 20px;
-                    margin: 5px;
-                }}
-                """
-            )
+            # Assistant message: dark theme
+            painter.setPen(QPen(QColor(COLORS["fg_faded"]), 1))
+            painter.setBrush(QColor(COLORS["bg_hard"]))
             text_color = COLORS["fg"]
+        painter.drawRoundedRect(bubble, self.RADIUS, self.RADIUS)
 
-        # Create message text
-        bubble_layout = QVBoxLayout(bubble)
-        bubble_layout.setContentsMargins(0, 0, 0, 0)
-
-        message_label = QLabel(self.message)
-        message_label.setWordWrap(True)
-        message_label.setStyleSheet(
-            f"""
-            QLabel {{
-                font-family: {FONT_FAMILY};
-                font-size: 32px;
-                color: {text_color};
-                background: transparent;
-                border: none;
-            }}
-            """
+        painter.setPen(QColor(text_color))
+        layout.draw(
+            painter,
+            QPointF(bubble.left() + self.PADDING_X, bubble.top() + self.PADDING_Y),
         )
-        bubble_layout.addWidget(message_label)
-
-        # Add bubble with stretch factor 3 (75% width)
-        main_layout.addWidget(bubble, 3)
-
-        # Add stretch to opposite side
-        if not self.is_user:
-            main_layout.addStretch(1)  # 25% right space
+        painter.restore()
 
 
 class ChatPage(GenericPage):
@@ -339,31 +473,27 @@ class ChatPage(GenericPage):
         )  # 140 (add card position) + 240 (add card width) + 10 (spacing)
         self.manage_btn.raise_()  # Bring to front
 
-        # Create scrollable chat area that takes full height
-        self.chat_scroll = QScrollArea()
-        self.chat_scroll.setWidgetResizable(True)
-        self.chat_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.chat_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.chat_scroll.setStyleSheet(
-            f"""
-            QScrollArea {{
+        # Transcript view: only visible bubbles are painted
+        self.chat_model = ChatMessageModel(self)
+        self.chat_view = QListView()
+        self.chat_view.setModel(self.chat_model)
+        self.chat_delegate = ChatBubbleDelegate(self.chat_view)
+        self.chat_view.setItemDelegate(self.chat_delegate)
+        self.chat_view.setResizeMode(QListView.Adjust)
+        self.chat_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.chat_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.chat_view.setFocusPolicy(Qt.NoFocus)
+        self.chat_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.chat_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.chat_view.setStyleSheet(
+            """
+            QListView {
                 border: none;
                 background-color: transparent;
-                margin-top: 110px;
-                margin-left: 20px;
-                margin-right: 20px;
-                margin-bottom: 20px;
-            }}
+            }
             """
         )
 
-        # Chat content widget
-        self.chat_content = QWidget()
-        self.chat_layout = QVBoxLayout(self.chat_content)
-        self.chat_layout.setAlignment(Qt.AlignTop)
-        self.chat_layout.setSpacing(5)
-        self.chat_layout.setContentsMargins(0, 20, 0, 20)
-
         # Add start button instead of welcome message
         self.start_button = QPushButton("Let's Start Studying!")
         self.start_button.setStyleSheet(
@@ -401,12 +531,12 @@ class ChatPage(GenericPage):
         button_layout.addWidget(self.start_button)
         button_layout.addStretch()
 
-        self.chat_layout.addStretch()
-        self.chat_layout.addWidget(button_container)
-        self.chat_layout.addStretch()
-
-        self.chat_scroll.setWidget(self.chat_content)
-        self.add_widget(self.chat_scroll)
+        # The start button gives way to the transcript once study begins
+        self.chat_stack = QStackedWidget()
+        self.chat_stack.setContentsMargins(20, 110, 20, 20)
+        self.chat_stack.addWidget(button_container)
+        self.chat_stack.addWidget(self.chat_view)
+        self.add_widget(self.chat_stack)
 
         # Ensure buttons stay on top
         self.back_btn.raise_()
@@ -494,19 +624,28 @@ class ChatPage(GenericPage):
     def set_deck(self, deck_name, deck_id=None):
         self.deck_name = deck_name
         self.deck_id = deck_id
+        self.all_due = False
+
+    def set_all_due(self):
+        """Study the due cards of every deck, interleaved by due time."""
+        self.deck_name = "All due"
+        self.deck_id = None
+        self.all_due = True
 
     def on_back_clicked(self):
         self.parent().setCurrentIndex(1)
 
     def on_start_study(self):
         """Handle start study button click - start async card processing."""
-        if not hasattr(self, "deck_id") or not self.deck_id:
+        all_due = getattr(self, "all_due", False)
+        if not all_due and (not hasattr(self, "deck_id") or not self.deck_id):
             QMessageBox.warning(self, "No Deck Selected", "Please select a deck first.")
             return
 
         # Create and start async worker
-        self.worker = AsyncWorker(self.deck_id)
+        self.worker = AsyncWorker(None if all_due else self.deck_id)
         self.worker.message_ready.connect(self.add_message)
+        self.worker.message_appended.connect(self.append_to_message)
         self.worker.clear_chat.connect(self.clear_chat_area)
         self.worker.scroll_to_bottom.connect(self.scroll_to_bottom)
         self.worker.error_occurred.connect(self.handle_error)
@@ -518,21 +657,25 @@ class ChatPage(GenericPage):
 
     def add_message(self, message: str, is_user: bool = False):
         """Add a message bubble to the chat."""
-        bubble = ChatBubble(message, is_user=is_user)
-        self.chat_layout.addWidget(bubble)
+        self.chat_stack.setCurrentWidget(self.chat_view)
+        self.chat_model.add_message(message, is_user)
+
+    def append_to_message(self, text: str):
+        """Extend the last message with streamed text."""
+        self.chat_stack.setCurrentWidget(self.chat_view)
+        self.chat_model.append_text(text)
+        self.chat_delegate.sizeHintChanged.emit(
+            self.chat_model.index(self.chat_model.rowCount() - 1)
+        )
 
     def clear_chat_area(self):
         """Clear all messages from the chat area."""
-        for i in reversed(range(self.chat_layout.count())):
-            child = self.chat_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
+        self.chat_stack.setCurrentWidget(self.chat_view)
+        self.chat_model.clear()
 
     def scroll_to_bottom(self):
         """Scroll chat to bottom."""
-        self.chat_scroll.verticalScrollBar().setValue(
-            self.chat_scroll.verticalScrollBar().maximum()
-        )
+        self.chat_view.scrollToBottom()
 
     def handle_error(self, error_message: str):
         """Handle async operation errors."""
@@ -565,6 +708,7 @@ class ChatPage(GenericPage):
             if self.loading_dots:
                 self.loading_dots.stop_animation()
                 self.loading_dots.setParent(None)
+                self.loading_dots.deleteLater()
                 self.loading_dots = None
                 
                 # Clear layout and add stretch back
@@ -634,8 +778,7 @@ class ChatPage(GenericPage):
         )
         if message:
             # Add user message bubble
-            user_bubble = ChatBubble(message, is_user=True)
-            self.chat_layout.addWidget(user_bubble)
+            self.add_message(message, is_user=True)
 
             # If we have an active worker waiting for input, provide it
             if hasattr(self, "worker") and self.worker:
@@ -643,13 +786,10 @@ class ChatPage(GenericPage):
             else:
                 # Fallback for when no worker is active
                 response = f"You said: {message}"  # Placeholder response
-                assistant_bubble = ChatBubble(response, is_user=False)
-                self.chat_layout.addWidget(assistant_bubble)
+                self.add_message(response, is_user=False)
 
             # Scroll to bottom
-            self.chat_scroll.verticalScrollBar().setValue(
-                self.chat_scroll.verticalScrollBar().maximum()
-            )
+            self.scroll_to_bottom()
 
             # Clear input
             self.chat_input.setText("> ")
@@ -771,9 +911,133 @@ class AddCardDialog(QDialog):
         return self.copy_checkbox.isChecked()
 
 
+class CardTableModel(QAbstractTableModel):
+    """Cards of a deck, fetched from the database one page at a time."""
+
+    PAGE_SIZE = 200
+    HEADERS = ("Card", "Added", "")
+
+    def __init__(self, deck_id, parent=None):
+        super().__init__(parent)
+        self.deck_id = deck_id
+        self._rows = []  # (id, path, created_at)
+        self._exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    @profiled("cards.fetch_page")
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+
+        after_id = self._rows[-1][0] if self._rows else None
+        page = services.get_card_page(self.deck_id, after_id, self.PAGE_SIZE)
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        card_id, path, created_at = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return f"📄 {Path(path).name}"
+            if column == 1 and created_at:
+                return created_at.strftime("%Y-%m-%d %H:%M")
+        elif role == Qt.ToolTipRole and column == 0:
+            return path
+        elif role == Qt.UserRole:
+            return card_id
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def remove_card(self, row):
+        """Delete the card of a row and drop just that row."""
+        card_id = self._rows[row][0]
+        services.delete_card(card_id)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """Paints a trash button in a cell and reports clicks on it."""
+
+    delete_requested = pyqtSignal(int)  # row
+
+    COLOR = "#ff4444"
+    BUTTON_SIZE = 40
+    ICON_SIZE = 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Rendered once, shared by every row
+        self.icon = create_colored_icon(
+            "resources/trash.svg", self.COLOR, self.ICON_SIZE
+        )
+
+    def _button_rect(self, rect):
+        size = min(self.BUTTON_SIZE, rect.height() - 4)
+        return QRect(
+            rect.center().x() - size // 2, rect.center().y() - size // 2, size, size
+        )
+
+    def paint(self, painter, option, index):
+        button = self._button_rect(option.rect)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor(self.COLOR), 2))
+        painter.setBrush(QColor(self.COLOR) if hovered else Qt.NoBrush)
+        painter.drawRoundedRect(button.adjusted(1, 1, -1, -1), 8, 8)
+        self.icon.paint(
+            painter,
+            QRect(
+                button.center().x() - self.ICON_SIZE // 2,
+                button.center().y() - self.ICON_SIZE // 2,
+                self.ICON_SIZE,
+                self.ICON_SIZE,
+            ),
+        )
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and self._button_rect(option.rect).contains(event.pos())
+        ):
+            self.delete_requested.emit(index.row())
+            return True
+        return False
+
+
 class ManageCardsDialog(QDialog):
     """Dialog for managing cards in a deck."""
 
+    ROW_HEIGHT = 50
+
     def __init__(self, deck_id, parent=None):
         super().__init__(parent)
         self.deck_id = deck_id
@@ -802,159 +1066,90 @@ class ManageCardsDialog(QDialog):
         )
         layout.addWidget(title_label)
 
-        # Cards container with scroll area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet(
+        # Only the visible rows are painted; more are fetched while scrolling
+        self.model = CardTableModel(deck_id, self)
+        self.delegate = DeleteButtonDelegate(self)
+        self.delegate.delete_requested.connect(self.delete_row)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(2, self.delegate)
+        self.table.setMouseTracking(True)
+        self.table.setShowGrid(False)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setFocusPolicy(Qt.NoFocus)
+        self.table.verticalHeader().hide()
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        header.setSectionResizeMode(2, QHeaderView.Fixed)
+        header.resizeSection(1, 280)
+        header.resizeSection(2, 70)
+
+        self.table.setStyleSheet(
             f"""
-            QScrollArea {{
+            QTableView {{
+                font-family: {FONT_FAMILY};
+                font-size: 24px;
+                color: {COLORS['fg']};
+                background-color: {COLORS['bg_hard']};
                 border: 2px solid {COLORS['fg_faded']};
                 border-radius: 5px;
+            }}
+            QTableView::item {{
+                padding: 10px;
+                border-bottom: 1px solid {COLORS['fg_faded']};
+            }}
+            QTableView::item:hover {{
+                background-color: {COLORS['bg_soft']};
+            }}
+            QHeaderView::section {{
+                font-family: {FONT_FAMILY};
+                font-size: 20px;
+                color: {COLORS['fg_dim']};
                 background-color: {COLORS['bg_hard']};
+                border: none;
+                padding: 8px;
             }}
             """
         )
 
-        self.cards_widget = QWidget()
-        self.cards_layout = QVBoxLayout(self.cards_widget)
-        self.cards_layout.setSpacing(5)
-        self.cards_layout.setContentsMargins(10, 10, 10, 10)
-
-        scroll_area.setWidget(self.cards_widget)
-
-        # Load cards
-        self.load_cards()
-
-        layout.addWidget(scroll_area)
+        self.empty_label = QLabel()
+        self.empty_label.hide()
 
+        layout.addWidget(self.table)
+        layout.addWidget(self.empty_label)
         self.setLayout(layout)
 
-    def load_cards(self):
-        """Load and display all cards in the deck."""
+        # Load the first page
         try:
-            # Import Card model here to avoid circular imports
-            from pathlib import Path
-
-            from database.database import db
-            from database.models import Card
-
-            # Query all cards for this deck
-            cards = db.session.query(Card).filter(Card.deck_id == self.deck_id).all()
-
-            if not cards:
-                no_cards_label = QLabel("No cards found in this deck.")
-                no_cards_label.setStyleSheet(
-                    f"""
-                    QLabel {{
-                        font-family: {FONT_FAMILY};
-                        font-size: 24px;
-                        color: {COLORS['fg_faded']};
-                        padding: 20px;
-                        text-align: center;
-                    }}
-                    """
-                )
-                self.cards_layout.addWidget(no_cards_label)
-                return
-
-            for card in cards:
-                # Create card item widget
-                card_item = QWidget()
-                card_layout = QHBoxLayout(card_item)
-                card_layout.setContentsMargins(10, 10, 10, 10)
-
-                # File icon and name
-                file_name = Path(card.path).name
-                card_info = f"📄 {file_name}"
-                if hasattr(card, "created_at") and card.created_at:
-                    card_info += (
-                        f" (Added: {card.created_at.strftime('%Y-%m-%d %H:%M')})"
-                    )
-
-                card_label = QLabel(card_info)
-                card_label.setStyleSheet(
-                    f"""
-                    QLabel {{
-                        font-family: {FONT_FAMILY};
-                        font-size: 24px;
-                        color: {COLORS['fg']};
-                        padding: 10px;
-                    }}
-                    """
-                )
-
-                # Delete button with trash icon
-                delete_btn = QPushButton()
-                delete_btn.setFixedSize(40, 40)
-
-                # Create red trash icon
-                red_trash_icon = create_colored_icon(
-                    "resources/trash.svg", "#ff4444", 24
-                )
-                delete_btn.setIcon(red_trash_icon)
-                delete_btn.setStyleSheet(
-                    f"""
-                    QPushButton {{
-                        background-color: transparent;
-                        border: 2px solid #ff4444;
-                        border-radius: 8px;
-                        padding: 5px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: #ff4444;
-                        border: 2px solid #ff4444;
-                    }}
-                    QPushButton:pressed {{
-                        background-color: #dd3333;
-                        border: 2px solid #dd3333;
-                    }}
-                    """
-                )
-
-                # Store card ID in button for deletion
-                delete_btn.card_id = card.id
-                delete_btn.clicked.connect(
-                    lambda checked, btn=delete_btn: self.delete_card(btn.card_id)
-                )
-
-                # Add to layout
-                card_layout.addWidget(card_label)
-                card_layout.addStretch()  # Push delete button to right
-                card_layout.addWidget(delete_btn)
-
-                # Style the card item
-                card_item.setStyleSheet(
-                    f"""
-                    QWidget {{
-                        background-color: {COLORS['bg_soft']};
-                        border: 1px solid {COLORS['fg_faded']};
-                        border-radius: 5px;
-                        margin: 2px;
-                    }}
-                    QWidget:hover {{
-                        background-color: {COLORS['bg_hard']};
-                    }}
-                    """
-                )
-
-                self.cards_layout.addWidget(card_item)
-
+            self.model.fetchMore()
+            if self.model.rowCount() == 0:
+                self.show_message("No cards found in this deck.")
         except Exception as e:
-            error_label = QLabel(f"Error loading cards: {str(e)}")
-            error_label.setStyleSheet(
-                f"""
-                QLabel {{
-                    font-family: {FONT_FAMILY};
-                    font-size: 24px;
-                    color: #ff4444;
-                    padding: 20px;
-                }}
-                """
-            )
-            self.cards_layout.addWidget(error_label)
+            self.show_message(f"Error loading cards: {str(e)}", "#ff4444")
 
-    def delete_card(self, card_id):
-        """Delete a card from the deck."""
+    def show_message(self, text, color=COLORS["fg_faded"]):
+        """Replace the table with a message."""
+        self.table.hide()
+        self.empty_label.setText(text)
+        self.empty_label.setStyleSheet(
+            f"""
+            QLabel {{
+                font-family: {FONT_FAMILY};
+                font-size: 24px;
+                color: {color};
+                padding: 20px;
+            }}
+            """
+        )
+        self.empty_label.show()
+
+    def delete_row(self, row):
+        """Delete the card of a table row."""
         try:
             # Confirm deletion
             reply = QMessageBox.question(
@@ -966,29 +1161,9 @@ class ManageCardsDialog(QDialog):
             )
 
             if reply == QMessageBox.Yes:
-                # Import here to avoid circular imports
-                from database.database import db
-                from database.models import Card
-
-                # Delete from database
-                card = db.session.query(Card).filter(Card.id == card_id).first()
-                if card:
-                    db.session.delete(card)
-                    db.session.commit()
-
-                    # Refresh the list
-                    self.refresh_cards()
+                self.model.remove_card(row)
+                if self.model.rowCount() == 0 and not self.model.canFetchMore():
+                    self.show_message("No cards found in this deck.")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to delete card: {str(e)}")
-
-    def refresh_cards(self):
-        """Refresh the cards display."""
-        # Clear existing items
-        for i in reversed(range(self.cards_layout.count())):
-            child = self.cards_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-
-        # Reload cards
-        self.load_cards()
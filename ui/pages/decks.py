@@ -1,60 +1,186 @@
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QSize, Qt
 from PyQt5.QtGui import QColor, QShowEvent
 from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QAbstractScrollArea,
     QHBoxLayout,
+    QHeaderView,
     QInputDialog,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from database import services
+from database.profiler import profiled
 
 from ..components import create_colored_icon
+from ..due_watcher import DueWatcher
 from ..template import GenericPage
 from ..theme import COLORS, FONT_FAMILY
 
+# Decks highlighted in the deck column
+SPECIAL_DECKS = ("Art History", "Biology - Cell Structure")
+
+
+class DeckTableModel(QAbstractTableModel):
+    """
+    Deck names and counts, updated by diffing on deck ID.
+
+    Refreshes only insert, remove or move the rows of decks that appeared,
+    disappeared or were renamed, and emit dataChanged for the cells whose
+    values changed, so the view repaints just those.
+    """
+
+    HEADERS = ("Deck", "New", "Due", "")
+    KEYS = ("name", "new", "due")
+    COUNT_COLORS = {1: "new_blue", 2: "due_yellow"}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        # Rendered once, shared by every row
+        self._gear_icon = create_colored_icon("resources/gear.svg", COLORS["fg"], 32)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        deck = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole and column < len(self.KEYS):
+            return str(deck[self.KEYS[column]])
+        if role == Qt.DecorationRole and column == 3:
+            return self._gear_icon
+        if role == Qt.TextAlignmentRole:
+            if column == 0:
+                return int(Qt.AlignLeft | Qt.AlignVCenter)
+            return int(Qt.AlignCenter)
+        if role == Qt.ForegroundRole:
+            if column == 0 and deck["name"] in SPECIAL_DECKS:
+                return QColor("#ff6b35")
+            if column in self.COUNT_COLORS:
+                color = self.COUNT_COLORS[column]
+                if deck[self.KEYS[column]] == 0:
+                    color = "fg_faded"
+                return QColor(COLORS[color])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+        if role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        if role == Qt.TextAlignmentRole and section == 0:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        return None
+
+    def flags(self, index):
+        # Count cells are not selectable, so they do not highlight on hover
+        if index.column() in self.COUNT_COLORS:
+            return Qt.ItemIsEnabled
+        return super().flags(index)
+
+    def deck(self, row) -> dict:
+        return self._rows[row]
+
+    def set_decks(self, decks):
+        """
+        Apply a fresh list of deck stats, keeping rows in the list's order.
+
+        Args:
+            decks: Dictionaries with id, name, new and due, in display order
+        """
+        ids = {deck["id"] for deck in decks}
+        for row in reversed(range(len(self._rows))):
+            if self._rows[row]["id"] not in ids:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+
+        for row, deck in enumerate(decks):
+            if row < len(self._rows) and self._rows[row]["id"] == deck["id"]:
+                self._update_row(row, deck)
+                continue
+
+            current = next(
+                (
+                    other
+                    for other in range(row + 1, len(self._rows))
+                    if self._rows[other]["id"] == deck["id"]
+                ),
+                None,
+            )
+            if current is None:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows.insert(row, dict(deck))
+                self.endInsertRows()
+            else:
+                # Renamed decks move to their new place in the order
+                self.beginMoveRows(QModelIndex(), current, current, QModelIndex(), row)
+                self._rows.insert(row, self._rows.pop(current))
+                self.endMoveRows()
+                self._update_row(row, deck)
+
+    def update_deck(self, deck_id, stats):
+        """Update the counts of one deck, if it is shown."""
+        for row, deck in enumerate(self._rows):
+            if deck["id"] == deck_id:
+                self._update_row(row, dict(deck, new=stats["new"], due=stats["due"]))
+                return
+
+    def _update_row(self, row, deck):
+        current = self._rows[row]
+        for column, key in enumerate(self.KEYS):
+            if current[key] != deck[key]:
+                current[key] = deck[key]
+                index = self.index(row, column)
+                self.dataChanged.emit(index, index)
+
 
 class DecksPage(GenericPage):
+    ROW_HEIGHT = 70
+    # Rows kept visible however short the page is
+    MIN_VISIBLE_ROWS = 3
+
     def __init__(self):
         super().__init__()
 
-        # Get deck data from database
-        deck_data = services.get_all_deck_stats()
-
-        # Store deck data for access in click handler
-        self.deck_data = deck_data
+        self.model = DeckTableModel(self)
+        self.model.set_decks(services.get_all_deck_stats())
 
         # Store reference to table for live updates
-        self.table = QTableWidget()
+        self.table = QTableView()
         table = self.table
-        table.setRowCount(len(deck_data))
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels(["Deck", "New", "Due", ""])
-
-        # Left-align the "Deck" header
-        table.horizontalHeaderItem(0).setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        table.setModel(self.model)
+        table.setIconSize(QSize(32, 32))
 
         # Remove row numbers and gridlines
         table.verticalHeader().setVisible(False)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
         table.setShowGrid(False)
 
-        # Disable scrollbars and auto-size to content
+        # Scroll vertically once the list outgrows the page
         table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        table.setSizePolicy(table.sizePolicy().Minimum, table.sizePolicy().Minimum)
+        table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
 
         # Disable selection
-        table.setSelectionMode(QTableWidget.NoSelection)
+        table.setSelectionMode(QAbstractItemView.NoSelection)
         table.setMouseTracking(True)
 
         # Style the table with alternating row colors
         table.setStyleSheet(
             f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {COLORS['bg_soft']};
                 color: {COLORS['fg']};
                 font-family: {FONT_FAMILY};
@@ -74,75 +200,37 @@ class DecksPage(GenericPage):
                 padding: 12px 8px;
                 text-align: left;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 10px 10px;
                 border: none;
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: transparent;
                 color: inherit;
             }}
         """
         )
 
-        for row, data in enumerate(deck_data):
-            deck_item = QTableWidgetItem(data["name"])
-            deck_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-            table.setItem(row, 0, deck_item)
+        # Fixed column widths: nothing is measured per row
+        header = table.horizontalHeader()
+        for column, width in enumerate((600, 120, 120, 100)):
+            header.setSectionResizeMode(column, QHeaderView.Fixed)
+            header.resizeSection(column, width)
 
-            new_item = QTableWidgetItem(str(data["new"]))
-            new_item.setTextAlignment(Qt.AlignCenter)
-            new_item.setFlags(
-                new_item.flags() & ~Qt.ItemIsSelectable
-            )  # Disable selection/hover
-            # Color new count blue if there are new cards
-            if data["new"] > 0:
-                new_item.setForeground(QColor(COLORS["new_blue"]))
-            else:
-                new_item.setForeground(QColor(COLORS["fg_faded"]))
-
-            table.setItem(row, 1, new_item)
-
-            due_item = QTableWidgetItem(str(data["due"]))
-            due_item.setTextAlignment(Qt.AlignCenter)
-            due_item.setFlags(
-                due_item.flags() & ~Qt.ItemIsSelectable
-            )  # Disable selection/hover
-            # Color due count yellow if there are due cards
-            if data["due"] > 0:
-                due_item.setForeground(QColor(COLORS["due_yellow"]))
-            else:
-                due_item.setForeground(QColor(COLORS["fg_faded"]))
-
-            table.setItem(row, 2, due_item)
-
-            # Add gear icon in the rightmost column
-            gear_item = QTableWidgetItem("")
-            gear_item.setTextAlignment(Qt.AlignCenter)
-            # Create gear icon for this cell
-            gear_icon = create_colored_icon("resources/gear.svg", COLORS["fg"], 32)
-            gear_item.setIcon(gear_icon)
-            table.setItem(row, 3, gear_item)
-
-        # Auto-resize columns to content
-        table.resizeColumnsToContents()
-        table.resizeRowsToContents()
-
-        # Set column widths (make wider)
-        table.setColumnWidth(0, max(table.columnWidth(0), 600))
-        table.setColumnWidth(1, max(table.columnWidth(1), 120))
-        table.setColumnWidth(2, max(table.columnWidth(2), 120))
-        table.setColumnWidth(3, 100)  # Fixed width for gear icon column
-
-        # Resize table to fit contents exactly
-        table.setFixedSize(
-            table.horizontalHeader().length() + 20,
-            table.verticalHeader().length() + table.horizontalHeader().height() + 10,
+        # Size to the deck list, shrinking and scrolling when the page is
+        # too short to hold it
+        table.setFixedWidth(
+            header.length() + table.verticalScrollBar().sizeHint().width()
+        )
+        table.setSizeAdjustPolicy(QAbstractScrollArea.AdjustToContents)
+        table.setMinimumHeight(
+            header.sizeHint().height() + self.MIN_VISIBLE_ROWS * self.ROW_HEIGHT
         )
 
         # Connect table click to open chat
-        table.cellClicked.connect(self.on_deck_clicked)
+        table.clicked.connect(
+            lambda index: self.on_deck_clicked(index.row(), index.column())
+        )
 
         # Create container for table and header alignment
         table_container = QWidget()
@@ -180,6 +268,27 @@ class DecksPage(GenericPage):
         )
         new_deck_btn.clicked.connect(self.on_new_deck_clicked)
         button_layout.addWidget(new_deck_btn)
+
+        # Study every deck's due cards in one session
+        all_due_btn = QPushButton("All due", self)
+        all_due_btn.setFixedSize(160, 50)
+        all_due_btn.setStyleSheet(
+            f"""
+            QPushButton {{
+                font-family: {FONT_FAMILY};
+                font-size: 24px;
+                color: {COLORS['due_yellow']};
+                background-color: transparent;
+                border: 2px solid {COLORS['due_yellow']};
+                border-radius: 8px;
+            }}
+            QPushButton:hover {{
+                background-color: {COLORS['bg_hard']};
+            }}
+            """
+        )
+        all_due_btn.clicked.connect(self.on_all_due_clicked)
+        button_layout.addWidget(all_due_btn)
         button_layout.addStretch()  # Push everything else to the right
 
         table_layout.addLayout(button_layout)
@@ -187,61 +296,21 @@ class DecksPage(GenericPage):
         # Center the entire container
         self.add_widget(table_container, alignment=Qt.AlignCenter)
 
-        # Set up timer for live updates
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_live_counts)
-        self.update_timer.start(2000)  # Update every 2 seconds
+        # Refresh a deck's counts when they change instead of polling
+        self.due_watcher = DueWatcher(self)
+        self.due_watcher.deck_changed.connect(self.update_deck_counts)
 
     def showEvent(self, event: QShowEvent):
         """Override showEvent to update deck counts when page comes into focus."""
         super().showEvent(event)
         # Force immediate update when page becomes visible
-        self.update_live_counts()
-
-    def update_live_counts(self):
-        """Update deck counts in real-time without recreating the table."""
-        try:
-            # Get fresh data from database
-            fresh_deck_data = services.get_all_deck_stats()
-            
-            # Only update if data structure hasn't changed (same decks exist)
-            if len(fresh_deck_data) != len(self.deck_data):
-                # Structure changed, do full refresh
-                self._refresh_deck_list()
-                return
-            
-            # Update counts for existing decks
-            for row, (old_data, new_data) in enumerate(zip(self.deck_data, fresh_deck_data)):
-                # Skip if deck names don't match (order changed)
-                if old_data["name"] != new_data["name"]:
-                    self._refresh_deck_list()
-                    return
-                
-                # Update New count if changed
-                if old_data["new"] != new_data["new"]:
-                    new_item = self.table.item(row, 1)
-                    new_item.setText(str(new_data["new"]))
-                    if new_data["new"] > 0:
-                        new_item.setForeground(QColor(COLORS["new_blue"]))
-                    else:
-                        new_item.setForeground(QColor(COLORS["fg_faded"]))
-                
-                # Update Due count if changed
-                if old_data["due"] != new_data["due"]:
-                    due_item = self.table.item(row, 2)
-                    due_item.setText(str(new_data["due"]))
-                    if new_data["due"] > 0:
-                        due_item.setForeground(QColor(COLORS["due_yellow"]))
-                    else:
-                        due_item.setForeground(QColor(COLORS["fg_faded"]))
-            
-            # Update stored data
-            self.deck_data = fresh_deck_data
-            
-        except Exception as e:
-            # If there's an error, fall back to full refresh
-            print(f"Live update error: {e}")
-            self._refresh_deck_list()
+        self._refresh_deck_list()
+        self.due_watcher.resync()
+
+    @profiled("decks.update_counts")
+    def update_deck_counts(self, deck_id):
+        """Update the counts of a single deck's row."""
+        self.model.update_deck(deck_id, services.get_deck_stats(deck_id))
 
     def on_new_deck_clicked(self):
         """Handle new deck button click - prompt for deck name."""
@@ -268,65 +337,20 @@ class DecksPage(GenericPage):
         elif ok:  # User clicked OK but entered empty name
             QMessageBox.warning(self, "Invalid Name", "Deck name cannot be empty.")
 
+    @profiled("decks.refresh")
     def _refresh_deck_list(self):
-        """Refresh the deck table with latest data."""
-        # Get updated deck data
-        deck_data = services.get_all_deck_stats()
-        self.deck_data = deck_data
-
-        # Find the table widget and update it
-        for widget in self.findChildren(QTableWidget):
-            # Clear and repopulate table
-            widget.setRowCount(len(deck_data))
-            widget.setColumnCount(4)
-
-            special_decks = ["Art History", "Biology - Cell Structure"]
-
-            for row, data in enumerate(deck_data):
-                deck_item = QTableWidgetItem(data["name"])
-                deck_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-                if data["name"] in special_decks:
-                    deck_item.setForeground(QColor("#ff6b35"))
-
-                widget.setItem(row, 0, deck_item)
-
-                new_item = QTableWidgetItem(str(data["new"]))
-                new_item.setTextAlignment(Qt.AlignCenter)
-                new_item.setFlags(
-                    new_item.flags() & ~Qt.ItemIsSelectable
-                )  # Disable selection/hover
-                if data["new"] > 0:
-                    new_item.setForeground(QColor(COLORS["new_blue"]))
-                else:
-                    new_item.setForeground(QColor(COLORS["fg_faded"]))
-                widget.setItem(row, 1, new_item)
-
-                due_item = QTableWidgetItem(str(data["due"]))
-                due_item.setTextAlignment(Qt.AlignCenter)
-                due_item.setFlags(
-                    due_item.flags() & ~Qt.ItemIsSelectable
-                )  # Disable selection/hover
-                if data["due"] > 0:
-                    due_item.setForeground(QColor(COLORS["due_yellow"]))
-                else:
-                    due_item.setForeground(QColor(COLORS["fg_faded"]))
-                widget.setItem(row, 2, due_item)
-
-                # Add gear icon in the rightmost column
-                gear_item = QTableWidgetItem("")
-                gear_item.setTextAlignment(Qt.AlignCenter)
-                gear_icon = create_colored_icon(
-                    "resources/gear.svg", COLORS["fg_dim"], 20
-                )
-                gear_item.setIcon(gear_icon)
-                widget.setItem(row, 3, gear_item)
+        """Apply the latest deck stats to the table."""
+        self.model.set_decks(services.get_all_deck_stats())
 
-            break
+    def on_all_due_clicked(self):
+        """Open a study session over the due cards of every deck."""
+        chat_page = self.parent().parent().chat_page
+        chat_page.set_all_due()
+        self.parent().setCurrentIndex(4)
 
     def on_deck_clicked(self, row, column):
         # Get the deck data from the clicked row
-        deck_data = self.deck_data[row]
+        deck_data = self.model.deck(row)
         deck_id = deck_data["id"]
         deck_name = deck_data["name"]
 
@@ -1,12 +1,27 @@
-from PyQt5.QtWidgets import QVBoxLayout, QStackedWidget, QApplication, QWidget
-from PyQt5.QtCore import Qt
+from functools import partial
+from importlib import import_module
+
+from PyQt5.QtWidgets import QVBoxLayout, QApplication, QWidget
+from PyQt5.QtCore import Qt, QTimer
+from ..components import LazyStackedWidget
 from ..theme import COLORS
-from .menu import MenuPage
-from .decks import DecksPage
-from .chat import ChatPage
-from .stats import StatsPage
-from .settings import SettingsPage
 from settings.settings import settings
+from utils.startup import startup_timer
+
+# Page module and class per stacked widget index
+PAGES = (
+    ("menu", "MenuPage"),
+    ("decks", "DecksPage"),
+    ("stats", "StatsPage"),
+    ("settings", "SettingsPage"),
+    ("chat", "ChatPage"),
+)
+
+
+def build_page(module, name):
+    # Importing a page module on first use keeps its flows (and their SDKs)
+    # out of startup
+    return getattr(import_module(f".{module}", __package__), name)()
 
 class MainApp(QWidget):
     def __init__(self):
@@ -18,19 +33,12 @@ class MainApp(QWidget):
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         
-        self.stacked_widget = QStackedWidget()
-
-        self.menu_page = MenuPage()
-        self.decks_page = DecksPage()
-        self.stats_page = StatsPage()
-        self.settings_page = SettingsPage()
-        self.chat_page = ChatPage()
-
-        self.stacked_widget.addWidget(self.menu_page)
-        self.stacked_widget.addWidget(self.decks_page)
-        self.stacked_widget.addWidget(self.stats_page)
-        self.stacked_widget.addWidget(self.settings_page)
-        self.stacked_widget.addWidget(self.chat_page)
+        # Pages are built the first time they are shown
+        self.stacked_widget = LazyStackedWidget()
+        for module, name in PAGES:
+            self.stacked_widget.add_lazy_page(partial(build_page, module, name))
+        self.stacked_widget.setCurrentIndex(0)
+        self._painted = False
 
         layout.addWidget(self.stacked_widget)
         self.setLayout(layout)
@@ -56,6 +64,45 @@ class MainApp(QWidget):
                     else:
                         self.showMaximized()
 
+    @property
+    def menu_page(self):
+        return self.stacked_widget.page(0)
+
+    @property
+    def decks_page(self):
+        return self.stacked_widget.page(1)
+
+    @property
+    def stats_page(self):
+        return self.stacked_widget.page(2)
+
+    @property
+    def settings_page(self):
+        return self.stacked_widget.page(3)
+
+    @property
+    def chat_page(self):
+        return self.stacked_widget.page(4)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            # Runs once the first frame is on screen
+            QTimer.singleShot(0, self.on_first_paint)
+
+    def on_first_paint(self):
+        """Report startup timings and start deferred background work."""
+        startup_timer.mark("first paint")
+
+        from database.backup import backup_service
+        from database.database import db
+
+        print(startup_timer.report([("database", db.init_seconds)]))
+
+        # Snapshot the collection in the background once per interval
+        backup_service.backup_if_due()
+
     def closeEvent(self, event):
         """Save window size and position before closing."""
         # Save current window geometry to settings
@@ -1,17 +1,21 @@
 from PyQt5.QtWidgets import (
+    QCheckBox,
     QComboBox,
     QFileDialog,
     QFormLayout,
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QMessageBox,
     QPushButton,
     QWidget,
 )
 
 from ..template import GenericPage
 from ..theme import COLORS, FONT_FAMILY, DEFAULT_FONT_SIZE
+from database import services
 from settings.settings import settings
+from utils.profiling import app_profiler
 
 
 class SettingsPage(GenericPage):
@@ -185,6 +189,71 @@ class SettingsPage(GenericPage):
 
         form_layout.addRow(api_key_label, self.api_key_input)
 
+        # Profiling toggle and export
+        profiling_label = QLabel("Profiling:")
+        profiling_label.setStyleSheet(
+            f"""
+            QLabel {{
+                font-family: {FONT_FAMILY};
+                font-size: {DEFAULT_FONT_SIZE}px;
+                color: {COLORS['fg']};
+                font-weight: bold;
+            }}
+        """
+        )
+
+        self.profiling_checkbox = QCheckBox("Profile CPU and memory (after restart)")
+        self.profiling_checkbox.setChecked(settings.profiling)
+        self.profiling_checkbox.toggled.connect(self.update_profiling)
+        self.profiling_checkbox.setStyleSheet(
+            f"""
+            QCheckBox {{
+                font-family: {FONT_FAMILY};
+                font-size: {DEFAULT_FONT_SIZE}px;
+                color: {COLORS['fg']};
+            }}
+        """
+        )
+
+        self.sql_profiling_checkbox = QCheckBox("Profile SQL (after restart)")
+        self.sql_profiling_checkbox.setChecked(settings.sql_profiling)
+        self.sql_profiling_checkbox.toggled.connect(self.update_sql_profiling)
+        self.sql_profiling_checkbox.setStyleSheet(
+            self.profiling_checkbox.styleSheet()
+        )
+
+        export_profile_btn = QPushButton("Export profile")
+        export_profile_btn.setStyleSheet(
+            f"""
+            QPushButton {{
+                font-family: {FONT_FAMILY};
+                font-size: {DEFAULT_FONT_SIZE}px;
+                color: {COLORS['fg']};
+                background-color: {COLORS['bg_hard']};
+                border: 2px solid {COLORS['fg_faded']};
+                border-radius: 5px;
+                padding: 8px;
+                margin-left: 5px;
+            }}
+            QPushButton:hover {{
+                color: {COLORS['highlight']};
+                border-color: {COLORS['highlight']};
+                background-color: {COLORS['bg_soft']};
+            }}
+            QPushButton:pressed {{
+                background-color: {COLORS['fg_faded']};
+            }}
+        """
+        )
+        export_profile_btn.clicked.connect(self.export_profile)
+
+        profiling_layout = QHBoxLayout()
+        profiling_layout.addWidget(self.profiling_checkbox)
+        profiling_layout.addWidget(self.sql_profiling_checkbox)
+        profiling_layout.addWidget(export_profile_btn)
+
+        form_layout.addRow(profiling_label, profiling_layout)
+
         # Wrap form layout in container with margins
         form_widget = QWidget()
         form_widget.setLayout(form_layout)
@@ -211,8 +280,39 @@ class SettingsPage(GenericPage):
 
     def update_algorithm(self, algorithm: str) -> None:
         """Update the algorithm setting when the combo box changes."""
-        settings.algorithm = algorithm
+        services.set_default_algorithm(algorithm)
 
     def update_api_key(self, api_key: str) -> None:
         """Update the OpenAI API key setting when the input changes."""
         settings.openai_api_key = api_key
+
+    def update_profiling(self, enabled: bool) -> None:
+        """Update the profiling setting, applied at the next start."""
+        settings.profiling = enabled
+
+    def update_sql_profiling(self, enabled: bool) -> None:
+        """Update the SQL profiling setting, applied at the next start."""
+        settings.sql_profiling = enabled
+
+    def export_profile(self) -> None:
+        """Save the running profile and zip it to a file of the user's choice."""
+        if not app_profiler.running:
+            QMessageBox.information(
+                self,
+                "Profiling Off",
+                "Enable profiling and restart Quint to record a profile.",
+            )
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Profile", "quint-profile.zip", "Zip archives (*.zip)"
+        )
+        if not path:
+            return
+
+        try:
+            app_profiler.export(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export profile: {str(e)}")
+            return
+        QMessageBox.information(self, "Profile Exported", f"Profile saved to {path}")
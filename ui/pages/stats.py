@@ -1,7 +1,313 @@
+from types import SimpleNamespace
+
+from PyQt5.QtCore import QRectF, Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QDoubleSpinBox,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from database import services
+from database.profiler import profiled
+from scheduler.simulate import combine_forecasts, forecast_deck
+
 from ..template import GenericPage
+from ..theme import COLORS, DEFAULT_FONT_SIZE, FONT_FAMILY
+
+# Monte Carlo runs per forecast
+SIMULATIONS = 16
+
+
+class ForecastWorker(QThread):
+    """Worker thread running the workload simulation off the UI thread."""
+
+    forecast_ready = pyqtSignal(object)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, decks, days, request_retention):
+        super().__init__()
+        self.decks = decks
+        self.days = days
+        self.request_retention = request_retention
+
+    def run(self):
+        try:
+            forecasts = [
+                forecast_deck(
+                    deck,
+                    days=self.days,
+                    simulations=SIMULATIONS,
+                    request_retention=self.request_retention,
+                )
+                for deck in self.decks
+            ]
+            self.forecast_ready.emit(combine_forecasts(forecasts))
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+
+class ForecastChart(QWidget):
+    """Bar chart of forecast daily reviews with the 10-90% range as whiskers."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.forecast = None
+        self.setMinimumHeight(400)
+
+    def set_forecast(self, forecast):
+        self.forecast = forecast
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor(COLORS["bg_hard"]))
+
+        if not self.forecast or not self.forecast["days"]:
+            painter.setPen(QColor(COLORS["fg_dim"]))
+            painter.drawText(self.rect(), Qt.AlignCenter, "No forecast yet")
+            return
+
+        due = self.forecast["due"]
+        high = self.forecast["due_high"]
+        low = self.forecast["due_low"]
+        peak = max(float(high.max()), 1.0)
+
+        margin = 40
+        width = self.width() - 2 * margin
+        height = self.height() - 2 * margin
+        step = width / len(due)
+
+        painter.setFont(QFont(FONT_FAMILY, 12))
+        painter.setPen(QColor(COLORS["fg_dim"]))
+        painter.drawText(
+            QRectF(0, 0, self.width(), margin),
+            Qt.AlignCenter,
+            f"peak {int(round(peak))} reviews/day",
+        )
+
+        for day, value in enumerate(due):
+            x = margin + day * step
+            bar_height = height * value / peak
+            painter.fillRect(
+                QRectF(
+                    x + step * 0.15,
+                    margin + height - bar_height,
+                    step * 0.7,
+                    bar_height,
+                ),
+                QColor(COLORS["due_yellow"]),
+            )
+
+            painter.setPen(QColor(COLORS["fg_dim"]))
+            center = x + step / 2
+            painter.drawLine(
+                int(center),
+                int(margin + height - height * high[day] / peak),
+                int(center),
+                int(margin + height - height * low[day] / peak),
+            )
+
+        painter.end()
 
 
 class StatsPage(GenericPage):
     def __init__(self):
         super().__init__()
+        self.worker = None
+
+        container = QVBoxLayout()
+        container.setContentsMargins(20, 110, 20, 20)
+        container.setSpacing(20)
+
+        label_style = f"""
+            QLabel {{
+                font-family: {FONT_FAMILY};
+                font-size: {DEFAULT_FONT_SIZE}px;
+                color: {COLORS['fg']};
+                font-weight: bold;
+            }}
+        """
+        input_style = f"""
+            QComboBox, QSpinBox, QDoubleSpinBox {{
+                font-family: {FONT_FAMILY};
+                font-size: {DEFAULT_FONT_SIZE}px;
+                color: {COLORS['fg']};
+                background-color: {COLORS['bg_hard']};
+                border: 2px solid {COLORS['fg_faded']};
+                border-radius: 5px;
+                padding: 8px;
+            }}
+            QComboBox QAbstractItemView {{
+                background-color: {COLORS['bg_hard']};
+                color: {COLORS['fg']};
+                selection-background-color: {COLORS['highlight']};
+            }}
+        """
+
+        controls = QHBoxLayout()
+        controls.setSpacing(15)
+
+        deck_label = QLabel("Deck:")
+        deck_label.setStyleSheet(label_style)
+        self.deck_combo = QComboBox()
+        self.deck_combo.setStyleSheet(input_style)
+        self.deck_combo.currentIndexChanged.connect(self.on_deck_changed)
+
+        retention_label = QLabel("Retention:")
+        retention_label.setStyleSheet(label_style)
+        self.retention_input = QDoubleSpinBox()
+        self.retention_input.setRange(0.70, 0.99)
+        self.retention_input.setSingleStep(0.01)
+        self.retention_input.setValue(0.9)
+        self.retention_input.setStyleSheet(input_style)
+
+        days_label = QLabel("Days:")
+        days_label.setStyleSheet(label_style)
+        self.days_input = QSpinBox()
+        self.days_input.setRange(7, 365)
+        self.days_input.setValue(30)
+        self.days_input.setStyleSheet(input_style)
+
+        self.forecast_btn = QPushButton("Forecast")
+        self.forecast_btn.setStyleSheet(
+            f"""
+            QPushButton {{
+                font-family: {FONT_FAMILY};
+                font-size: {DEFAULT_FONT_SIZE}px;
+                color: {COLORS['highlight']};
+                background-color: transparent;
+                border: 2px solid {COLORS['highlight']};
+                border-radius: 20px;
+                padding: 8px 16px;
+            }}
+            QPushButton:hover {{
+                background-color: {COLORS['highlight']};
+                color: {COLORS['bg_soft']};
+            }}
+            QPushButton:disabled {{
+                color: {COLORS['fg_faded']};
+                border-color: {COLORS['fg_faded']};
+            }}
+        """
+        )
+        self.forecast_btn.clicked.connect(self.run_forecast)
+
+        for widget in (
+            deck_label,
+            self.deck_combo,
+            retention_label,
+            self.retention_input,
+            days_label,
+            self.days_input,
+            self.forecast_btn,
+        ):
+            controls.addWidget(widget)
+        controls.addStretch()
+        container.addLayout(controls)
+
+        self.chart = ForecastChart()
+        container.addWidget(self.chart)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setStyleSheet(
+            f"""
+            QLabel {{
+                font-family: {FONT_FAMILY};
+                font-size: {DEFAULT_FONT_SIZE - 8}px;
+                color: {COLORS['fg_dim']};
+            }}
+        """
+        )
+        container.addWidget(self.summary_label)
+
+        self.add_layout(container)
+        self.add_stretch()
+
+    def showEvent(self, event):
+        """Reload the deck list whenever the page is shown."""
+        super().showEvent(event)
+        self.load_decks()
+
+    @profiled("stats.load_decks")
+    def load_decks(self):
+        current = self.deck_combo.currentData()
+        self.deck_combo.blockSignals(True)
+        self.deck_combo.clear()
+        self.deck_combo.addItem("All decks", None)
+        for deck in services.get_all_decks():
+            self.deck_combo.addItem(deck.name, deck.id)
+        index = self.deck_combo.findData(current)
+        self.deck_combo.setCurrentIndex(max(index, 0))
+        self.deck_combo.blockSignals(False)
+        self.on_deck_changed()
+
+    def on_deck_changed(self):
+        """Start from the selected deck's own retention."""
+        deck_id = self.deck_combo.currentData()
+        # Decks keep their own retentions when forecast together
+        self.retention_input.setEnabled(deck_id is not None)
+        if deck_id is not None:
+            deck = services.get_deck_by_id(deck_id)
+            if deck:
+                self.retention_input.setValue(deck.request_retention or 0.9)
+
+    def run_forecast(self):
+        """Simulate the selected decks on a worker thread."""
+        if self.worker and self.worker.isRunning():
+            return
+
+        deck_id = self.deck_combo.currentData()
+        decks = (
+            [services.get_deck_by_id(deck_id)]
+            if deck_id is not None
+            else services.get_all_decks()
+        )
+
+        # Plain copies: ORM objects must not be read from the worker thread
+        snapshots = [
+            SimpleNamespace(
+                id=deck.id,
+                w=deck.w,
+                request_retention=deck.request_retention,
+                maximum_interval=deck.maximum_interval,
+                new_per_day=deck.new_per_day,
+            )
+            for deck in decks
+            if deck
+        ]
+        if not snapshots:
+            self.summary_label.setText("No decks to forecast.")
+            return
+
+        self.forecast_btn.setEnabled(False)
+        self.summary_label.setText("Simulating...")
+
+        # None simulates every deck at its stored retention
+        retention = self.retention_input.value() if deck_id is not None else None
+        self.worker = ForecastWorker(snapshots, self.days_input.value(), retention)
+        self.worker.forecast_ready.connect(self.show_forecast)
+        self.worker.error_occurred.connect(self.show_error)
+        self.worker.finished.connect(lambda: self.forecast_btn.setEnabled(True))
+        self.worker.start()
+
+    def show_forecast(self, forecast):
+        self.chart.set_forecast(forecast)
+        days = forecast["days"]
+        self.summary_label.setText(
+            f"{forecast['cards']} cards over {days} days: "
+            f"{forecast['due'].sum() / days:.0f} reviews/day on average "
+            f"({forecast['new'].sum() / days:.0f} new), "
+            f"~{forecast['llm_calls'].sum() / days:.0f} LLM calls/day. "
+            f"Simulated in {forecast['elapsed_s']:.1f}s."
+        )
 
+    def show_error(self, message):
+        self.summary_label.setText(f"Forecast failed: {message}")
@@ -0,0 +1,24 @@
+# Utility functions for the Quint application
+
+import os
+
+# Values that turn an environment flag off
+_FALSE_VALUES = ("", "0", "false", "no", "off")
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """
+    Read an on/off switch from the environment.
+
+    Args:
+        name: Name of the environment variable
+        default: Value used when the variable is not set
+
+    Returns:
+        False if the variable is empty, 0, false, no or off, True if it is
+        set to anything else, and default if it is not set
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in _FALSE_VALUES
@@ -0,0 +1,235 @@
+"""
+CPU and memory profiling of a running application.
+
+Enabled by the profiling setting (applied at the next start); QUINT_PROFILE
+overrides the setting for one run (see utils.helpers.env_flag). While
+enabled:
+
+    - cProfile runs in the threads wrapped with `app_profiler.thread(name)`:
+      the Qt event loop in main.py and every AsyncWorker run
+    - a sampler thread records the stack of every thread every
+      SAMPLE_INTERVAL seconds, including the time spent waiting
+    - tracemalloc traces allocations with TRACEMALLOC_FRAMES frames
+
+`save()` writes the profile into a new directory under DATA_DIR/profiles:
+
+    profile.pstats     cProfile statistics of all wrapped threads
+                       (python -m pstats profile.pstats)
+    profile.collapsed  sampled stacks in the collapsed format read by
+                       flamegraph.pl, speedscope and inferno
+    memory.snapshot    tracemalloc snapshot (tracemalloc.Snapshot.load)
+    memory.txt         traced and peak memory, and the lines holding the most
+                       memory (when saved after tracing stopped)
+
+It runs when the app exits, and `export(path)` runs it and zips the result
+for sharing.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import zipfile
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from settings.settings import settings
+from utils.helpers import env_flag
+
+ENV_VAR = "QUINT_PROFILE"
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Frames kept per traced allocation
+TRACEMALLOC_FRAMES = 10
+
+# Lines listed in memory.txt
+TOP_ALLOCATIONS = 30
+
+
+def profiling_enabled() -> bool:
+    """Whether the application is profiled this run."""
+    return env_flag(ENV_VAR, settings.profiling)
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+class AppProfiler:
+    """cProfile, stack sampling and tracemalloc for the whole application."""
+
+    def __init__(self):
+        self.started = None
+        self._lock = threading.Lock()
+        self._active = {}  # thread ident -> (name, cProfile.Profile)
+        self._finished = []  # pstats.Stats of threads that have ended
+        self._thread_names = {}  # thread ident -> name
+        self._samples = Counter()  # collapsed stack -> samples
+        self._sampler = None
+        self._stop = threading.Event()
+        self._snapshot = None  # taken when tracing stops
+        self._traced_memory = None  # (current, peak) bytes when tracing stops
+
+    @property
+    def running(self) -> bool:
+        return self.started is not None
+
+    def start(self):
+        """Start sampling and tracing allocations."""
+        if self.running:
+            return
+        self.started = time.time()
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._stop.clear()
+        self._sampler = threading.Thread(
+            target=self._sample, name="profile-sampler", daemon=True
+        )
+        self._sampler.start()
+        print(f"Profiling enabled, sampling every {SAMPLE_INTERVAL * 1000:.0f} ms")
+
+    def stop(self):
+        """Stop sampling and tracing; collected data is kept until saved."""
+        if not self.running:
+            return
+        self._stop.set()
+        self._sampler.join()
+        self._snapshot = tracemalloc.take_snapshot()
+        self._traced_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.started = None
+
+    def thread(self, name):
+        """
+        Context manager running cProfile in the current thread.
+
+        Returns a no-op context when profiling is not running.
+        """
+        if not self.running:
+            return nullcontext()
+        return self._profile_thread(name)
+
+    @contextmanager
+    def _profile_thread(self, name):
+        ident = threading.get_ident()
+        with self._lock:
+            self._thread_names[ident] = name
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+ runs one cProfile at a time; the sampler still
+            # covers this thread
+            print(f"cProfile not started in the {name} thread: {e}")
+            yield
+            return
+        with self._lock:
+            self._active[ident] = (name, profile)
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                del self._active[ident]
+                self._finished.append(pstats.Stats(profile))
+
+    def save(self) -> Path:
+        """
+        Write what has been collected so far.
+
+        Threads still running are included only if one is the calling
+        thread, whose profile keeps running afterwards.
+
+        Returns:
+            The directory the profile was written to
+        """
+        from database.utilities import DATA_DIR
+
+        directory = Path(DATA_DIR) / "profiles" / time.strftime("profile-%Y%m%d-%H%M%S")
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            stats = list(self._finished)
+            current = self._active.get(threading.get_ident())
+            samples = Counter(self._samples)
+        if current is not None:
+            # Taking the stats disables the profile, so saving is not profiled
+            stats.append(pstats.Stats(current[1]))
+        try:
+            self._write(directory, stats, samples)
+        finally:
+            if current is not None:
+                current[1].enable()
+
+        print(f"Profile written to {directory}")
+        return directory
+
+    def _write(self, directory, stats, samples):
+        if stats:
+            combined = pstats.Stats()
+            combined.add(*stats)
+            combined.dump_stats(directory / "profile.pstats")
+
+        with open(directory / "profile.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            snapshot = tracemalloc.take_snapshot()
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        elif self._snapshot is not None:
+            snapshot = self._snapshot
+            current_bytes, peak_bytes = self._traced_memory
+        else:
+            return
+
+        snapshot.dump(str(directory / "memory.snapshot"))
+        with open(directory / "memory.txt", "w", encoding="utf-8") as f:
+            f.write(
+                f"Traced {current_bytes / 2**20:.1f} MB, "
+                f"peak {peak_bytes / 2**20:.1f} MB\n\n"
+            )
+            # Grouping while tracing is slow enough to freeze the app, so a
+            # live export leaves it to be done from memory.snapshot
+            if not tracing:
+                for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+
+    def export(self, path) -> Path:
+        """Save the profile and zip it into `path` for sharing."""
+        directory = self.save()
+        path = Path(path)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for file in sorted(directory.iterdir()):
+                archive.write(file, f"{directory.name}/{file.name}")
+        return path
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(frame_label(frame))
+                    frame = frame.f_back
+                name = self._thread_names.get(ident) or names.get(ident, str(ident))
+                labels.append(name.replace(" ", "_"))
+                stacks.append(";".join(reversed(labels)))
+            with self._lock:
+                self._samples.update(stacks)
+
+
+# Global application profiler, started by main.py when profiling is enabled
+app_profiler = AppProfiler()
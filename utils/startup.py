@@ -0,0 +1,43 @@
+"""Timing of the application's startup phases."""
+
+import time
+
+
+class StartupTimer:
+    """Records how long each startup phase took since the previous one."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # (name, seconds)
+        self._last = self.started
+
+    def mark(self, name):
+        """End the current phase under the given name."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def report(self, extra=None) -> str:
+        """
+        One-line summary of the phases.
+
+        Args:
+            extra: Optional (name, seconds or None) pairs measured elsewhere,
+                reported after the phases; None reads as "not run"
+        """
+        parts = [f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases]
+        for name, seconds in extra or ():
+            parts.append(
+                f"{name} {seconds * 1000:.0f} ms"
+                if seconds is not None
+                else f"{name} not run"
+            )
+        return f"Startup {self.total * 1000:.0f} ms: " + ", ".join(parts)
+
+
+# Global startup timer, started when main.py imports it first
+startup_timer = StartupTimer()